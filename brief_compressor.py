@@ -0,0 +1,141 @@
+"""
+brief_compressor.py — Research Brief Compression
+=================================================
+Deterministic, local extractive summarisation of the research brief before
+it is sent to the writer models. Sentences are ranked for the details a
+cold-case script actually uses (dates, names, forensic specifics and
+contradictions) and packed into a token budget in their original order.
+The past-topics ban list is likewise cut down to a short relevant subset.
+"""
+
+import re
+
+CHARS_PER_TOKEN = 4.0
+
+FORENSIC_TERMS = {
+    "autopsy", "coroner", "forensic", "body", "corpse", "remains", "wound", "poison",
+    "blood", "fingerprint", "dna", "evidence", "witness", "detective", "police",
+    "investigator", "inquest", "pathologist", "suspect", "note", "code", "cipher",
+    "letter", "photograph", "footage", "recording", "missing", "vanished",
+    "disappeared", "identified", "unidentified", "cause of death", "scene", "clue",
+}
+
+CONTRADICTION_TERMS = {
+    "however", "but", "despite", "although", "contrary", "yet", "instead",
+    "claimed", "denied", "disputed", "contradict", "inconsistent", "never",
+    "no explanation", "unexplained", "mystery", "unknown", "impossible", "theory",
+}
+
+STOPWORDS = {
+    "the", "a", "an", "of", "and", "or", "in", "on", "at", "to", "for", "with",
+    "was", "were", "is", "are", "be", "by", "as", "that", "this", "it", "his",
+    "her", "their", "from", "had", "has", "have", "case", "who", "which",
+}
+
+YEAR_RE   = re.compile(r"\b(1[5-9]\d{2}|20[0-4]\d)\b")
+DATE_RE   = re.compile(r"\b(January|February|March|April|May|June|July|August|September|"
+                       r"October|November|December)\b")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+NAME_RE   = re.compile(r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b")
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def split_sentences(text: str) -> list[str]:
+    text = re.sub(r"\s+", " ", text or "").strip()
+    if not text:
+        return []
+    parts = re.split(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])", text)
+    return [p.strip() for p in parts if len(p.strip()) > 20]
+
+
+def _content_words(text: str) -> set[str]:
+    return {w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS and len(w) > 2}
+
+
+def score_sentence(sentence: str, index: int, focus: set[str]) -> float:
+    sl    = sentence.lower()
+    score = 0.0
+    score += 2.0 * len(YEAR_RE.findall(sentence))
+    score += 1.5 * len(DATE_RE.findall(sentence))
+    score += 0.5 * min(4, len(NUMBER_RE.findall(sentence)))
+    score += 1.0 * min(4, len(NAME_RE.findall(sentence)))
+    score += 1.5 * sum(1 for t in FORENSIC_TERMS if t in sl)
+    score += 2.0 * sum(1 for t in CONTRADICTION_TERMS if re.search(rf"\b{re.escape(t)}\b", sl))
+    if focus:
+        score += 1.0 * len(_content_words(sentence) & focus)
+
+    words = len(sentence.split())
+    if words < 6:
+        score -= 2.0
+    elif words > 45:
+        score -= 1.5
+    # Lead sentences of an article carry the who/what/where.
+    score += max(0.0, 2.0 - 0.25 * index)
+    return score
+
+
+def compress_text(text: str, token_budget: int, focus_terms: str = "") -> str:
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+    if estimate_tokens(" ".join(sentences)) <= token_budget:
+        return " ".join(sentences)
+
+    focus  = _content_words(focus_terms)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (-score_sentence(sentences[i], i, focus), i)
+    )
+
+    chosen, used, seen = [], 0, []
+    for i in ranked:
+        sent = sentences[i]
+        cost = estimate_tokens(sent)
+        if used + cost > token_budget:
+            continue
+        words = _content_words(sent)
+        # Skip near-duplicates of something already selected.
+        if any(len(words & w) / max(1, len(words | w)) > 0.6 for w in seen):
+            continue
+        chosen.append(i)
+        seen.append(words)
+        used += cost
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def compress_lines(lines: list[str], token_budget: int, focus_terms: str = "") -> list[str]:
+    """Same ranking for short line-oriented sources (e.g. RSS headlines)."""
+    focus  = _content_words(focus_terms)
+    clean  = [l.strip() for l in lines if l and l.strip()]
+    ranked = sorted(range(len(clean)), key=lambda i: (-score_sentence(clean[i], i, focus), i))
+    chosen, used = [], 0
+    for i in ranked:
+        cost = estimate_tokens(clean[i])
+        if used + cost <= token_budget:
+            chosen.append(i)
+            used += cost
+    return [clean[i] for i in sorted(chosen)]
+
+
+def select_relevant_topics(past_topics: str, focus_terms: str = "",
+                           recent: int = 8, related: int = 8) -> str:
+    """Most recent topics plus the ones that share vocabulary with the focus."""
+    lines = [l.strip() for l in (past_topics or "").splitlines() if l.strip()]
+    if not lines:
+        return ""
+    picked = lines[-recent:] if recent else []
+    focus  = _content_words(focus_terms)
+    if focus:
+        overlap = sorted(
+            ((len(_content_words(l) & focus), -i, l) for i, l in enumerate(lines[:-recent or None])),
+            reverse=True
+        )
+        picked = [l for n, _, l in overlap[:related] if n > 0] + picked
+    out = []
+    for l in picked:
+        if l not in out:
+            out.append(l)
+    return "\n".join(out)
@@ -0,0 +1,344 @@
+"""
+encoder.py — Direct ffmpeg Pipe Encoder
+========================================
+Streams raw RGB frames from a composited clip straight into one ffmpeg
+process over stdin instead of MoviePy's write_videofile plumbing. A
+producer thread renders frame N+1 while frame N is being written (double
+buffering), so compositing and x264 run side by side rather than taking
+turns. The pre-mixed soundtrack is rendered once to 16-bit PCM and fed
+through a second pipe, so no temporary audio file is written.
+
+Rate control, preset, threads and GOP length come from an encode profile;
+keyframes are forced on the edit's cut times so every shot starts on an
+IDR frame.
+
+Render layers are cached as MEZZANINE_PROFILE encodes, which the final
+render decodes again instead of recomputing them.
+
+A span whose pixels never change is encoded by encode_still from a single
+frame that ffmpeg loops.
+
+Segments encoded with the same profile can be joined with concat_segments,
+which stream-copies the video through ffmpeg's concat demuxer and muxes the
+soundtrack in once.
+
+Both encode_clip and concat_segments can also write RENDITIONS in the same
+ffmpeg run: the decoded frames are split inside ffmpeg into a size-capped
+upload for Meta and a tiny animated WebP, so the master is never decoded
+or encoded a second time. Should that run fail, encode_renditions can
+write them afterwards from the finished master instead.
+"""
+
+import os
+import queue
+import threading
+import subprocess
+
+import numpy as np
+
+FFMPEG_BINARY = os.environ.get("FFMPEG_BINARY", "ffmpeg")
+AUDIO_FPS     = 44100
+FRAME_BUFFERS = 2            # frames produced ahead of the encoder
+
+# threads=0 means one per core. `size` scales inside ffmpeg; `parallax`, `publish` and
+# `layer_cache` are read by the renderer (preview renders skip depth parallax, are never
+# uploaded, and reuse cached render layers across iterations).
+ENCODE_PROFILES = {
+    "youtube": {"crf": 20, "maxrate": "8M", "bufsize": "16M", "preset": "fast",
+                "threads": 0, "gop_secs": 2.0, "audio_bitrate": "192k", "fps": 24},
+    "preview": {"crf": 30, "maxrate": "1M", "bufsize": "2M", "preset": "ultrafast",
+                "threads": 0, "gop_secs": 2.0, "audio_bitrate": "96k", "fps": 12,
+                "size": (360, 640), "parallax": False, "publish": False, "layer_cache": True},
+}
+
+# Near-lossless intermediate for cached render layers (see layer_cache.py); decoded again
+# by the final render, so it trades size for speed and keeps short GOPs for seeking.
+MEZZANINE_PROFILE = {"crf": 14, "maxrate": "40M", "bufsize": "80M", "preset": "veryfast",
+                     "threads": 0, "gop_secs": 1.0, "audio_bitrate": "192k"}
+
+
+# Extra outputs split off the master's frame stream (see rendition_paths). Meta gets a
+# lower bitrate, capped so the file fits the temporary hosts Instagram pulls from (100 MB);
+# the WebP is a silent loop of the opening seconds.
+RENDITIONS = {
+    "meta": {"suffix": "_meta.mp4", "crf": 23, "maxrate": "4M", "bufsize": "8M", "preset": "fast",
+             "threads": 0, "gop_secs": 2.0, "audio_bitrate": "128k", "max_mb": 95},
+    "webp": {"suffix": "_preview.webp", "fps": 8, "width": 180, "secs": 3.0, "quality": 60},
+}
+
+
+class EncodeError(Exception):
+    """ffmpeg exited with an error or closed its input early."""
+
+
+def _settings(profile: str | dict) -> dict:
+    return ENCODE_PROFILES[profile] if isinstance(profile, str) else profile
+
+
+def _audio_input(audio_fd: int | None) -> list[str]:
+    if audio_fd is None:
+        return []
+    return ["-f", "s16le", "-ar", str(AUDIO_FPS), "-ac", "2", "-i", f"pipe:{audio_fd}"]
+
+
+def _audio_output(audio_fd: int | None, profile: dict) -> list[str]:
+    if audio_fd is None:
+        return []
+    return ["-map", "1:a", "-c:a", "aac", "-b:a", profile["audio_bitrate"], "-shortest"]
+
+
+def _video_codec_args(profile: dict, fps: float, key_times=()) -> list[str]:
+    # Identical for every piece of a render, so the pieces can be stream-copied together.
+    threads = profile["threads"] or os.cpu_count() or 2
+    args = [
+        "-c:v", "libx264", "-pix_fmt", "yuv420p",
+        "-preset", profile["preset"], "-crf", str(profile["crf"]),
+        "-maxrate", profile["maxrate"], "-bufsize", profile["bufsize"],
+        "-threads", str(threads),
+        "-g", str(max(1, round(profile["gop_secs"] * fps))),
+    ]
+    if profile.get("size"):
+        args += ["-vf", "scale={}:{}".format(*profile["size"])]
+    key_times = sorted(t for t in key_times if t > 0)
+    if key_times:
+        args += ["-force_key_frames", ",".join(f"{t:.3f}" for t in key_times)]
+    return args
+
+
+def _bits(rate: str) -> int:
+    scale = {"k": 1_000, "M": 1_000_000}.get(rate[-1:], 1)
+    return int(float(rate.rstrip("kM")) * scale)
+
+
+def _size_capped(settings: dict, duration: float | None) -> dict:
+    """Lowers maxrate so `duration` seconds stay under the rendition's max_mb."""
+    if not settings.get("max_mb") or not duration:
+        return settings
+    budget = settings["max_mb"] * 8_000_000 * 0.95 / duration - _bits(settings["audio_bitrate"])
+    rate   = max(200_000, min(_bits(settings["maxrate"]), int(budget)))
+    return {**settings, "maxrate": str(rate), "bufsize": str(2 * rate)}
+
+
+def rendition_paths(output_file: str, names=tuple(RENDITIONS)) -> dict[str, str]:
+    """Where each rendition of `output_file` is written: final_video.mp4 -> final_video_meta.mp4, ..."""
+    prefix = os.path.splitext(output_file)[0]
+    return {name: prefix + RENDITIONS[name]["suffix"] for name in names}
+
+
+def _rendition_args(renditions: dict | None, fps: float, duration: float | None,
+                    audio_fd: int | None, key_times=()) -> tuple[list[str], list[str]]:
+    """(-filter_complex args, output args) that split input 0's video into each rendition."""
+    if not renditions:
+        return [], []
+    names   = list(renditions)
+    graph   = ["[0:v]split={}{}".format(len(names), "".join(f"[r{k}]" for k in range(len(names))))]
+    outputs = []
+    for k, name in enumerate(names):
+        spec = RENDITIONS[name]
+        if "quality" in spec:       # animated WebP
+            graph.append(f"[r{k}]trim=duration={spec['secs']},fps={spec['fps']},scale={spec['width']}:-2[o{k}]")
+            outputs += ["-map", f"[o{k}]", "-c:v", "libwebp", "-quality", str(spec["quality"]),
+                        "-loop", "0", "-an", renditions[name]]
+        else:
+            graph.append(f"[r{k}]null[o{k}]")
+            outputs += ["-map", f"[o{k}]", *_video_codec_args(_size_capped(spec, duration), fps, key_times),
+                        *_audio_output(audio_fd, spec), "-movflags", "+faststart", renditions[name]]
+    return ["-filter_complex", ";".join(graph)], outputs
+
+
+def _ffmpeg_args(width: int, height: int, fps: float, output_file: str, profile: dict,
+                 audio_fd: int | None, key_times, renditions: dict | None = None,
+                 duration: float | None = None) -> list[str]:
+    graph, extra = _rendition_args(renditions, fps, duration, audio_fd, key_times)
+    return [
+        FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", f"{fps}",
+        "-i", "pipe:0",
+        *_audio_input(audio_fd),
+        *graph,
+        "-map", "0:v",
+        *_video_codec_args(profile, fps, key_times),
+        *_audio_output(audio_fd, profile),
+        "-movflags", "+faststart", output_file,
+        *extra,
+    ]
+
+
+def render_pcm(audio_clip, fps: int = AUDIO_FPS) -> bytes:
+    """The clip's full soundtrack as interleaved stereo s16le."""
+    pcm = audio_clip.to_soundarray(fps=fps, quantize=True, nbytes=2)
+    if pcm.ndim == 1:
+        pcm = np.column_stack([pcm, pcm])
+    return np.ascontiguousarray(pcm, dtype=np.int16).tobytes()
+
+
+def frame_count(duration: float, fps: float) -> int:
+    return int(round(duration * fps))
+
+
+def _produce_frames(clip, fps: float, frames: queue.Queue, errors: list) -> None:
+    try:
+        # Frames sit on an exact i/fps grid, so segments cut on that grid add up frame-for-frame.
+        for i in range(frame_count(clip.duration, fps)):
+            frame = clip.get_frame(i / fps)
+            frames.put(np.ascontiguousarray(frame[:, :, :3], dtype=np.uint8).tobytes())
+    except Exception as e:
+        errors.append(e)
+    finally:
+        frames.put(None)
+
+
+def _write_audio(fd: int, pcm: bytes) -> None:
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pcm)
+    except (BrokenPipeError, OSError):
+        pass      # ffmpeg stopped reading; its exit status reports why
+
+
+def _spawn(args_for, pcm: bytes | None, stdin=None):
+    """Starts ffmpeg with the PCM soundtrack on its own pipe; returns (proc, helper threads)."""
+    audio_r = audio_w = None
+    if pcm:
+        audio_r, audio_w = os.pipe()
+    proc = subprocess.Popen(args_for(audio_r), stdin=stdin, stderr=subprocess.PIPE,
+                            pass_fds=(audio_r,) if audio_r is not None else ())
+    stderr  = []
+    threads = [threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)]
+    if audio_r is not None:
+        os.close(audio_r)
+        threads.append(threading.Thread(target=_write_audio, args=(audio_w, pcm), daemon=True))
+    for t in threads:
+        t.start()
+    return proc, threads, stderr
+
+
+def _wait(proc, threads: list, stderr: list, broken: bool = False) -> None:
+    code = proc.wait()
+    for t in threads:
+        t.join()
+    if code != 0 or broken:
+        msg = b"".join(stderr).decode("utf-8", "replace").strip()
+        raise EncodeError(f"ffmpeg exited with {code}: {msg[-800:]}")
+
+
+def encode_clip(clip, output_file: str, fps: float = 24, profile: str | dict = "youtube",
+                key_times=(), pcm: bytes | None = None, renditions: dict | None = None) -> str:
+    """Encodes a MoviePy clip (video + optional audio) to H.264/AAC MP4.
+
+    `pcm` supplies an already-rendered soundtrack instead of mixing down clip.audio.
+    `renditions` maps RENDITIONS names to extra output paths written in the same pass.
+    """
+    settings = _settings(profile)
+    width, height = clip.size
+    if pcm is None and clip.audio is not None:
+        pcm = render_pcm(clip.audio)
+
+    proc, threads, stderr = _spawn(
+        lambda audio_fd: _ffmpeg_args(width, height, fps, output_file, settings, audio_fd, key_times,
+                                      renditions, clip.duration),
+        pcm, stdin=subprocess.PIPE,
+    )
+    frames = queue.Queue(maxsize=FRAME_BUFFERS)
+    errors = []
+    producer = threading.Thread(target=_produce_frames, args=(clip, fps, frames, errors), daemon=True)
+    producer.start()
+
+    broken = False
+    while (buf := frames.get()) is not None:
+        if broken:
+            continue      # drain so the producer can exit
+        try:
+            proc.stdin.write(buf)
+        except BrokenPipeError:
+            broken = True
+    try:
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass
+    producer.join()
+    if errors:
+        proc.wait()
+        raise errors[0]
+    _wait(proc, threads, stderr, broken)
+    return output_file
+
+
+def encode_still(frame: np.ndarray, duration: float, output_file: str, fps: float = 24,
+                 profile: str | dict = "youtube") -> str:
+    """Encodes one frame held for `duration`; ffmpeg loops the image, no frames are produced in Python."""
+    settings = _settings(profile)
+    height, width = frame.shape[:2]
+    still = output_file + ".ppm"
+    with open(still, "wb") as f:
+        f.write(b"P6 %d %d 255\n" % (width, height))
+        f.write(np.ascontiguousarray(frame[:, :, :3], dtype=np.uint8).tobytes())
+    args = [
+        FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "image2", "-loop", "1", "-framerate", f"{fps}", "-i", still,
+        "-frames:v", str(frame_count(duration, fps)),
+        *_video_codec_args(settings, fps),
+        "-an", "-movflags", "+faststart", output_file,
+    ]
+    try:
+        _wait(*_spawn(lambda audio_fd: args, None))
+    finally:
+        os.remove(still)
+    return output_file
+
+
+def concat_segments(segment_files: list[str], output_file: str, pcm: bytes | None = None,
+                    profile: str | dict = "youtube", renditions: dict | None = None) -> str:
+    """Joins same-profile segments without re-encoding and muxes in the soundtrack.
+
+    Any `renditions` are encoded from the same single decode of the joined segments.
+    """
+    settings  = _settings(profile)
+    duration  = len(pcm) / (AUDIO_FPS * 4) if pcm else None
+    list_file = output_file + ".concat.txt"
+    with open(list_file, "w", encoding="utf-8") as f:
+        for path in segment_files:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    def _args(audio_fd):
+        graph, extra = _rendition_args(renditions, settings.get("fps", 24), duration, audio_fd)
+        return [
+            FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_file,
+            *_audio_input(audio_fd),
+            *graph,
+            "-map", "0:v", "-c:v", "copy",
+            *_audio_output(audio_fd, settings),
+            "-movflags", "+faststart", output_file,
+            *extra,
+        ]
+
+    try:
+        _wait(*_spawn(_args, pcm))
+    finally:
+        os.remove(list_file)
+    return output_file
+
+
+def encode_renditions(master: str, renditions: dict, fps: float = 24, pcm: bytes | None = None,
+                      key_times=()) -> dict:
+    """Writes `renditions` from a finished master in a second pass (one decode of the master).
+
+    The fallback for when the single-pass encode could not write them; `pcm` is the master's
+    soundtrack, fed again so the Meta upload is encoded with its own audio settings.
+    """
+    duration = len(pcm) / (AUDIO_FPS * 4) if pcm else None
+
+    def _args(audio_fd):
+        graph, extra = _rendition_args(renditions, fps, duration, audio_fd, key_times)
+        return [
+            FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+            "-i", master,
+            *_audio_input(audio_fd),
+            *graph,
+            *extra,
+        ]
+
+    _wait(*_spawn(_args, pcm))
+    return renditions
@@ -0,0 +1,100 @@
+"""
+frame_bank.py — Pre-Decoded Frame Buffers
+==========================================
+Stock overlay footage (texture flashes, atmosphere) arrives as HD clips of
+arbitrary size and frame rate. Reading it through VideoFileClip means an
+ffmpeg reader per use plus a resize/crop chain evaluated on every output
+frame. Instead each source is decoded once, at fetch time, by a single
+ffmpeg pass that scales, crops and resamples it to exactly the output
+geometry, and the frames are stored raw (rgb24) next to the run. Layers
+then read them back as slices of a read-only memmap, which render worker
+processes share through the page cache.
+
+A looping overlay (the atmosphere) is stored with its opacity already
+multiplied in and indexed modulo its length, so each output frame costs
+one integer blend instead of a decode, resize, crop and alpha composite.
+Its tail is crossfaded into its head so the wrap-around has no jump.
+"""
+
+import os
+import subprocess
+
+import numpy as np
+
+from encoder import FFMPEG_BINARY
+
+FRAME_EXT = ".rgb"
+
+
+def decode_frames(src: str, dest: str, width: int, height: int, fps: float,
+                  max_secs: float | None = None, gain: float = 1.0,
+                  src_size: tuple[int, int] | None = None) -> int:
+    """Decodes `src` into raw rgb24 frames at exactly width x height and fps; returns the frame count.
+
+    gain < 1 scales every pixel on the way in, e.g. an overlay's opacity premultiplied once.
+    With `src_size`, `src` is itself a frame file of that size at `fps` (rescaling a ring).
+    """
+    vf = (f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+          f"crop={width}:{height},fps={fps}")
+    if gain != 1.0:
+        vf += f",lutrgb=r=val*{gain}:g=val*{gain}:b=val*{gain}"
+    args = [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error"]
+    if src_size:
+        args += ["-f", "rawvideo", "-pix_fmt", "rgb24", "-video_size", "{}x{}".format(*src_size),
+                 "-framerate", f"{fps}"]
+    args += ["-i", src]
+    if max_secs:
+        args += ["-t", f"{max_secs}"]
+    args += ["-an", "-vf", vf, "-f", "rawvideo", "-pix_fmt", "rgb24", dest]
+    subprocess.run(args, check=True, capture_output=True)
+    count = os.path.getsize(dest) // (width * height * 3)
+    if not count:
+        os.remove(dest)
+        raise ValueError(f"no frames decoded from {src}")
+    return count
+
+
+def open_frames(path: str, width: int, height: int) -> np.memmap:
+    """The frames written by decode_frames as a read-only (n, height, width, 3) uint8 array."""
+    count = os.path.getsize(path) // (width * height * 3)
+    return np.memmap(path, dtype=np.uint8, mode="r", shape=(count, height, width, 3))
+
+
+def crossfade_loop(path: str, width: int, height: int, seam: int) -> int:
+    """Turns decoded frames into a ring without a visible jump; returns the new frame count.
+
+    The last `seam` frames are faded into the first `seam` and then dropped, so
+    the frame after the ring's end (its start again) continues the motion of
+    the frame before it. Needs at least 2 * seam frames; fewer are left as is.
+    """
+    frame_bytes = width * height * 3
+    count = os.path.getsize(path) // frame_bytes
+    if seam <= 0 or count < 2 * seam:
+        return count
+    frames = np.memmap(path, dtype=np.uint8, mode="r+", shape=(count, height, width, 3))
+    ring = count - seam
+    for i in range(seam):
+        w = (i + 0.5) / seam
+        frames[i] = (frames[i] * w + frames[ring + i] * (1.0 - w) + 0.5).astype(np.uint8)
+    frames.flush()
+    del frames
+    os.truncate(path, ring * frame_bytes)
+    return ring
+
+
+def blend_premultiplied(base: np.ndarray, layer: np.ndarray, opacity: float) -> np.ndarray:
+    """base * (1 - opacity) + layer, for a layer decoded with gain=opacity."""
+    keep = int(round((1.0 - opacity) * 256))
+    return ((base.astype(np.uint16) * keep >> 8) + layer).astype(np.uint8)
+
+
+def fade_ramp(count: int, fps: float, fade_in: float, fade_out: float) -> np.ndarray:
+    """Per-frame brightness for a fade from and to black, as MoviePy's fadein/fadeout compute it."""
+    t = np.arange(count) / fps
+    end = count / fps
+    ramp = np.ones(count, dtype=np.float32)
+    if fade_in > 0:
+        ramp = np.minimum(ramp, t / fade_in)
+    if fade_out > 0:
+        ramp = np.minimum(ramp, (end - t) / fade_out)
+    return np.clip(ramp, 0.0, 1.0)
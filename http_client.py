@@ -0,0 +1,155 @@
+"""
+http_client.py — Shared HTTP Layer
+===================================
+One pooled, keep-alive session per host for every fetcher in the pipeline
+(Wikipedia, Google News, archive.org, Pexels, Cloudflare, OpenRouter,
+Pixabay, Meta Graph, ...), with a uniform connect/read timeout policy,
+jittered exponential backoff that honours Retry-After, and per-host
+latency metrics.
+
+GET requests are retried by default; POST requests only when the caller
+opts in, because most of ours are either non-idempotent uploads or LLM
+calls whose failover is handled by the model cascade.
+"""
+
+import time
+import random
+import threading
+import email.utils
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT  = 5.0
+READ_TIMEOUT     = 30.0
+POOL_MAXSIZE     = 16
+DEFAULT_RETRIES  = {"GET": 2, "HEAD": 2}
+RETRY_STATUSES   = {429, 500, 502, 503, 504}
+BACKOFF_BASE     = 1.0
+BACKOFF_CAP      = 30.0
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+_metrics: dict[str, dict] = {}
+_metrics_lock = threading.Lock()
+
+
+def _host_of(url: str) -> str:
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+def get_session(url: str) -> requests.Session:
+    host = _host_of(url)
+    with _sessions_lock:
+        sess = _sessions.get(host)
+        if sess is None:
+            sess = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            sess.mount("https://", adapter)
+            sess.mount("http://", adapter)
+            _sessions[host] = sess
+        return sess
+
+
+def _retry_after_secs(rsp: requests.Response) -> float | None:
+    value = rsp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(0.0, when.timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def _backoff_secs(attempt: int) -> float:
+    # Full jitter: uniform(0, base * 2^attempt), capped.
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _record(host: str, latency: float, ok: bool) -> None:
+    with _metrics_lock:
+        m = _metrics.setdefault(host, {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0})
+        m["calls"] += 1
+        m["total"] += latency
+        m["max"]    = max(m["max"], latency)
+        if not ok:
+            m["errors"] += 1
+
+
+def request(method: str, url: str, retries: int | None = None, timeout=None, **kwargs) -> requests.Response:
+    method  = method.upper()
+    host    = _host_of(url)
+    retries = DEFAULT_RETRIES.get(method, 0) if retries is None else retries
+    if "files" in kwargs:
+        retries = 0     # file handles cannot be replayed safely
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    elif isinstance(timeout, (int, float)):
+        timeout = (min(CONNECT_TIMEOUT, float(timeout)), float(timeout))
+
+    sess = get_session(url)
+    attempt = 0
+    while True:
+        started = time.time()
+        try:
+            rsp = sess.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            _record(host, time.time() - started, ok=False)
+            if attempt >= retries:
+                raise
+            time.sleep(_backoff_secs(attempt))
+            attempt += 1
+            continue
+
+        _record(host, time.time() - started, ok=rsp.status_code < 400)
+        if rsp.status_code in RETRY_STATUSES and attempt < retries:
+            wait = _retry_after_secs(rsp)
+            wait = min(BACKOFF_CAP, wait) if wait is not None else _backoff_secs(attempt)
+            rsp.close()
+            time.sleep(wait)
+            attempt += 1
+            continue
+        return rsp
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def warm(urls) -> int:
+    """Opens a pooled keep-alive connection (DNS + TLS) to each host; returns how many answered."""
+    warmed = 0
+    for url in urls:
+        try:
+            get_session(url).head(url, timeout=(CONNECT_TIMEOUT, CONNECT_TIMEOUT), allow_redirects=False)
+            warmed += 1
+        except requests.RequestException:
+            pass
+    return warmed
+
+
+def metrics() -> dict:
+    with _metrics_lock:
+        return {h: dict(m) for h, m in _metrics.items()}
+
+
+def print_metrics() -> None:
+    snap = metrics()
+    if not snap:
+        return
+    print("🌐 HTTP latency by host:")
+    for host, m in sorted(snap.items(), key=lambda kv: -kv[1]["total"]):
+        avg = m["total"] / max(1, m["calls"])
+        print(f"   {host:<40} calls={m['calls']:<4} err={m['errors']:<3} "
+              f"avg={avg:6.2f}s max={m['max']:6.2f}s")
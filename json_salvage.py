@@ -0,0 +1,324 @@
+"""
+json_salvage.py — Tolerant JSON Extraction
+===========================================
+Free models wrap JSON in prose, leave trailing commas, swap in smart quotes
+or stop mid-array when they hit a token limit. Instead of discarding those
+answers and paying for another 30–70 s model call, this module:
+
+  1. finds the outermost JSON object (or array) inside fences / prose,
+  2. repairs smart-quote delimiters, trailing commas and Python literals,
+  3. closes truncated strings, arrays and objects at the last complete element,
+  4. validates the result against a small schema for the script / visuals shapes.
+"""
+
+import re
+import json
+
+SMART_DOUBLE = "“”„‟″"
+SMART_SINGLE = "‘’‚‛′"
+
+
+# ═══════════════════════════════════════════════════════════
+#  EXTRACTION
+# ═══════════════════════════════════════════════════════════
+def _strip_fences(text: str) -> str:
+    return re.sub(r"```(?:json|JSON)?", "", text or "").strip()
+
+
+def _outermost_span(text: str) -> str | None:
+    """Returns text from the first '{' / '[' to its matching close (or to EOF if truncated)."""
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    depth, in_str, esc = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+# ═══════════════════════════════════════════════════════════
+#  REPAIR
+# ═══════════════════════════════════════════════════════════
+def _normalize_quotes(text: str) -> str:
+    """Smart double quotes become '"' when they act as delimiters, and stay as content otherwise."""
+    out, in_str, esc = [], False, False
+    n = len(text)
+    for i, ch in enumerate(text):
+        if ch in SMART_SINGLE:
+            out.append("'")
+            continue
+        if in_str:
+            if esc:
+                esc = False
+                out.append(ch)
+                continue
+            if ch == "\\":
+                esc = True
+                out.append(ch)
+                continue
+            if ch == '"' or ch in SMART_DOUBLE:
+                j = i + 1
+                while j < n and text[j] in " \t\r\n":
+                    j += 1
+                closes = j >= n or text[j] in ":,}]"
+                if ch == '"' or closes:
+                    in_str = False
+                    out.append('"')
+                else:
+                    out.append('\\"')
+                continue
+            if ch == "\n":
+                out.append("\\n")
+                continue
+            out.append(ch)
+        else:
+            if ch == '"' or ch in SMART_DOUBLE:
+                in_str = True
+                out.append('"')
+            else:
+                out.append(ch)
+    return "".join(out)
+
+
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def _fix_literals(text: str) -> str:
+    """Drops trailing commas and swaps Python literals for JSON ones, outside strings only."""
+    out, in_str, esc = [], False, False
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+            out.append(ch)
+            i += 1
+            continue
+        if ch == '"':
+            in_str = True
+        elif ch == ",":
+            j = i + 1
+            while j < n and text[j] in " \t\r\n":
+                j += 1
+            if j < n and text[j] in "}]":
+                i += 1
+                continue
+        elif ch.isalpha() and not (i and (text[i - 1].isalnum() or text[i - 1] == "_")):
+            m = re.match(r"[A-Za-z_]\w*", text[i:])
+            word = m.group(0)
+            out.append(_PY_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> list[str]:
+    """Candidate completions of a truncated document, most complete first.
+
+    A document cut off inside a string loses that whole element rather than
+    keeping a partial word.
+    """
+    stack, in_str, esc = [], False, False
+    cuts = []     # (position, stack snapshot) at element boundaries
+    for i, ch in enumerate(text):
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            cuts.append((i + 1, list(stack)))
+        elif ch == ",":
+            cuts.append((i, list(stack)))
+
+    candidates = []
+    if not in_str:
+        candidates.append(text + "".join(reversed(stack)))
+    for pos, snap in reversed(cuts[-40:]):
+        candidates.append(text[:pos] + "".join(reversed(snap)))
+    return candidates
+
+
+def salvage_json(text: str):
+    """Best-effort parse of an LLM answer. Returns a dict/list, or None."""
+    if not text:
+        return None
+    cleaned = _strip_fences(text)
+    try:
+        return json.loads(cleaned)
+    except Exception:
+        pass
+
+    span = _outermost_span(cleaned)
+    if span is None:
+        return None
+    for candidate in (span, _fix_literals(span), _fix_literals(_normalize_quotes(span))):
+        try:
+            return json.loads(candidate)
+        except Exception:
+            continue
+
+    repaired = _fix_literals(_normalize_quotes(span))
+    for candidate in _close_truncated(repaired):
+        try:
+            return json.loads(_fix_literals(candidate))
+        except Exception:
+            continue
+    return None
+
+
+# ═══════════════════════════════════════════════════════════
+#  SCHEMA VALIDATION
+# ═══════════════════════════════════════════════════════════
+SCRIPT_SCHEMA = {
+    "type": "object",
+    "required": ["lines"],
+    "properties": {
+        "lines": {
+            "type": "array",
+            "min_items": 3,
+            "items": {
+                "type": "object",
+                "required": ["clean_text"],
+                "properties": {"clean_text": {"type": "string", "min_length": 3}},
+            },
+        },
+    },
+}
+
+VISUALS_SCHEMA = {
+    "type": "object",
+    "wrap_list_as": "visuals",
+    "required": ["visuals"],
+    "properties": {
+        "visuals": {"type": "array", "min_items": 1, "items": {"type": "object"}},
+    },
+}
+
+_TYPES = {"object": dict, "array": list, "string": str}
+
+
+def validate(data, schema: dict, path: str = "$", partial: bool = False) -> list[str]:
+    """Schema errors for data. partial=True only reports errors a longer stream cannot fix."""
+    errors = []
+    expected = _TYPES.get(schema.get("type"))
+    if expected and not isinstance(data, expected):
+        return [f"{path}: expected {schema['type']}"]
+    if isinstance(data, dict):
+        if not partial:
+            for key in schema.get("required", []):
+                if key not in data:
+                    errors.append(f"{path}.{key}: missing")
+        for key, sub in schema.get("properties", {}).items():
+            if key in data:
+                errors += validate(data[key], sub, f"{path}.{key}", partial)
+    elif isinstance(data, list):
+        if not partial and len(data) < schema.get("min_items", 0):
+            errors.append(f"{path}: needs at least {schema['min_items']} items")
+        if "items" in schema:
+            for i, item in enumerate(data):
+                errors += validate(item, schema["items"], f"{path}[{i}]", partial)
+    elif isinstance(data, str):
+        if not partial and len(data.strip()) < schema.get("min_length", 0):
+            errors.append(f"{path}: too short")
+    return errors
+
+
+def _coerce_script(data):
+    # Drop line objects that cannot be voiced; backfill clean_text from acting_text.
+    if isinstance(data, dict) and isinstance(data.get("lines"), list):
+        lines = []
+        for line in data["lines"]:
+            if not isinstance(line, dict):
+                continue
+            if not str(line.get("clean_text") or "").strip() and line.get("acting_text"):
+                line["clean_text"] = re.sub(r"<[^>]+>", "", str(line["acting_text"])).strip()
+            if str(line.get("clean_text") or "").strip():
+                lines.append(line)
+        data["lines"] = lines
+    return data
+
+
+def load_validated(text: str, schema: dict):
+    """Salvages and validates; raises ValueError with the schema errors on failure."""
+    data = salvage_json(text)
+    if data is None:
+        raise ValueError("no JSON object found")
+    if isinstance(data, list) and schema.get("wrap_list_as"):
+        data = {schema["wrap_list_as"]: data}
+    if schema is SCRIPT_SCHEMA:
+        data = _coerce_script(data)
+    errors = validate(data, schema)
+    if errors:
+        raise ValueError("; ".join(errors[:5]))
+    return data
+
+
+# ═══════════════════════════════════════════════════════════
+#  STREAMING VIABILITY (EARLY ABORT)
+# ═══════════════════════════════════════════════════════════
+PROSE_ALLOWANCE   = 400     # chars of chatter tolerated before the JSON must start
+UNPARSED_ALLOWANCE = 1500   # chars of JSON that may still fail to close into a document
+REQUIRED_BY       = 1200    # chars by which top-level required keys must have appeared
+
+
+def viable_prefix(text: str, schema: dict) -> bool:
+    """False as soon as a partial answer can no longer become a schema-valid document."""
+    cleaned = _strip_fences(text)
+    starts  = [i for i in (cleaned.find("{"), cleaned.find("[")) if i != -1]
+    if not starts:
+        return len(cleaned) < PROSE_ALLOWANCE
+    if min(starts) > PROSE_ALLOWANCE:
+        return False
+
+    span = _outermost_span(cleaned)
+    data = None
+    for candidate in _close_truncated(_fix_literals(_normalize_quotes(span)))[:3]:
+        try:
+            data = json.loads(_fix_literals(candidate))
+            break
+        except Exception:
+            continue
+    if data is None:
+        return len(span) < UNPARSED_ALLOWANCE
+
+    if isinstance(data, list) and schema.get("wrap_list_as"):
+        data = {schema["wrap_list_as"]: data}
+    if validate(data, schema, partial=True):
+        return False
+    if isinstance(data, dict) and len(span) > REQUIRED_BY:
+        return all(key in data for key in schema.get("required", []))
+    return True
@@ -0,0 +1,121 @@
+"""
+layer_cache.py — Content-Addressed Render Layers
+=================================================
+The final video is composited from three intermediate layers, each cached
+under a hash of everything that goes into it:
+
+  • base     — graded shot track (mezzanine encode; the atmosphere is
+               blended over it at composite time from its own frame ring),
+  • overlay  — texture flashes and the pause-bait, stored as a short
+               mezzanine of just their active intervals plus an index,
+  • audio    — the mixed soundtrack as 16-bit PCM.
+
+Subtitles and the watermark are always drawn fresh on top. A re-render
+that only changes captions, music or the watermark therefore decodes the
+cached base instead of recomputing parallax frames, and an A/B variant of
+the same story pays only for the layers whose inputs differ.
+
+Keys cover parameters and the content of input files, so a refetched
+asset with the same name still invalidates its layer.
+
+Building the layers costs an extra mezzanine encode, which only pays off
+when the same story is rendered again. The cache is therefore off for
+one-shot production renders and on for iteration: the preview profile
+turns it on, and LAYER_CACHE=on enables it for every render.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+from workspace import WORKSPACE_ROOT
+
+LAYER_CACHE_DIR     = os.environ.get("LAYER_CACHE_DIR", os.path.join(WORKSPACE_ROOT, "_layers"))
+LAYER_CACHE_ENABLED = os.environ.get("LAYER_CACHE", "off").lower() in ("1", "on", "true", "yes")
+LAYER_MAX_AGE       = 3 * 24 * 3600
+LAYER_VERSION       = 1       # bump when the way a layer is composed changes
+
+_digests: dict[tuple, str] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: str | None) -> str:
+    """sha256 of a file's content, memoised per (path, size, mtime)."""
+    if not path or not os.path.exists(path):
+        return "-"
+    st  = os.stat(path)
+    sig = (path, st.st_size, st.st_mtime_ns)
+    with _digests_lock:
+        if sig in _digests:
+            return _digests[sig]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    with _digests_lock:
+        _digests[sig] = h.hexdigest()
+    return _digests[sig]
+
+
+def layer_key(kind: str, params: dict, files=()) -> str:
+    h = hashlib.sha256(json.dumps(
+        {"kind": kind, "version": LAYER_VERSION, "params": params}, sort_keys=True, default=str
+    ).encode("utf-8"))
+    for path in files:
+        h.update(file_digest(path).encode("ascii"))
+    return f"{kind}-{h.hexdigest()[:24]}"
+
+
+def layer_path(key: str, ext: str) -> str:
+    return os.path.join(LAYER_CACHE_DIR, key + ext)
+
+
+def lookup(key: str, ext: str) -> str | None:
+    """Path of a cached layer, or None. A hit refreshes its age for pruning."""
+    path = layer_path(key, ext)
+    if not os.path.exists(path):
+        return None
+    os.utime(path)
+    return path
+
+
+def staging_path(key: str, ext: str) -> str:
+    """Where to write a layer before commit(); keeps the extension so ffmpeg picks the muxer."""
+    os.makedirs(LAYER_CACHE_DIR, exist_ok=True)
+    return os.path.join(LAYER_CACHE_DIR, f"{key}.tmp{os.getpid()}{ext}")
+
+
+def commit(staged: str, key: str, ext: str) -> str:
+    path = layer_path(key, ext)
+    os.replace(staged, path)
+    return path
+
+
+def read_index(key: str) -> dict | None:
+    path = lookup(key, ".json")
+    if not path:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_index(key: str, index: dict) -> None:
+    staged = staging_path(key, ".json")
+    with open(staged, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    commit(staged, key, ".json")
+
+
+def prune_layers(max_age: float = LAYER_MAX_AGE) -> None:
+    if not os.path.isdir(LAYER_CACHE_DIR):
+        return
+    cutoff = time.time() - max_age
+    for name in os.listdir(LAYER_CACHE_DIR):
+        path = os.path.join(LAYER_CACHE_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,119 @@
+"""
+lazy_imports.py — Deferred Heavy Imports
+=========================================
+transformers, faster_whisper, moviepy, cv2, the Google clients and the
+TTS engine take several seconds to import between them. main.py binds
+them through these proxies instead, so `import main` (a thumbnail, a
+title-scorer experiment, a single stage, a stage worker process) only
+pays for a dependency when it is first used.
+
+    cv2 = lazy_module("cv2")                                 # module proxy
+    WhisperModel = lazy_attr("faster_whisper", "WhisperModel")   # name proxy
+"""
+
+import sys
+import json
+import time
+import importlib
+import threading
+import subprocess
+
+IMPORT_BUDGET_SECS = 1.0      # `import main` must stay under this in a fresh interpreter
+
+# Imports main.py must not trigger on its own; each one is loaded lazily at first use.
+HEAVY_MODULES = (
+    "transformers", "torch", "faster_whisper", "moviepy", "cv2",
+    "googleapiclient", "google.genai", "google.oauth2", "pydub", "neural_voice",
+)
+
+_LOCK = threading.RLock()
+
+
+class LazyModule:
+    """Stands in for a module; imports it on first attribute access."""
+
+    def __init__(self, name: str, on_load=None):
+        self._name    = name
+        self._on_load = on_load
+        self._module  = None
+
+    def _load(self):
+        if self._module is None:
+            with _LOCK:
+                if self._module is None:
+                    module = importlib.import_module(self._name)
+                    if self._on_load:
+                        self._on_load(module)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str):
+        module = self._load()
+        try:
+            return getattr(module, attr)
+        except AttributeError:
+            # `PIL.ImageDraw` style access to a submodule that was never imported.
+            return importlib.import_module(f"{self._name}.{attr}")
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+class LazyAttr:
+    """Stands in for `from module import name`; resolves on first call or attribute access."""
+
+    def __init__(self, module: str, attr: str):
+        self._module = LazyModule(module) if isinstance(module, str) else module
+        self._attr   = attr
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = getattr(self._module, self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str):
+        return getattr(self._resolve(), attr)
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module._name}.{self._attr}>"
+
+
+def lazy_module(name: str, on_load=None) -> LazyModule:
+    return LazyModule(name, on_load)
+
+
+def lazy_attr(module, attr: str) -> LazyAttr:
+    return LazyAttr(module, attr)
+
+
+def check_import_budget(module: str = "main", budget: float = IMPORT_BUDGET_SECS) -> bool:
+    """Imports `module` in a fresh interpreter and reports its import time and any heavy modules it pulled in."""
+    probe = (
+        "import sys, time, json\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - t\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(f"❌ import {module} failed:\n{proc.stderr.strip()}")
+        return False
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    ok = report["elapsed"] <= budget and not report["heavy"]
+    icon = "✅" if ok else "❌"
+    print(f"{icon} import {module}: {report['elapsed']:.3f}s (budget {budget:.1f}s, "
+          f"interpreter total {time.perf_counter() - started:.2f}s)")
+    if report["heavy"]:
+        print(f"❌ Eagerly imported: {', '.join(report['heavy'])}")
+    return ok
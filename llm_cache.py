@@ -0,0 +1,163 @@
+"""
+llm_cache.py — LLM Response Cache
+==================================
+Disk-backed response cache for every remote LLM call made by the pipeline.
+Entries are keyed by (provider, model, system prompt, prompt, temperature),
+zlib-compressed into a single SQLite file, expire after a TTL, and the
+database is trimmed back under a size cap as it grows.
+
+Re-running a failed upload or render with byte-identical prompts therefore
+skips every model call that already succeeded for that script.
+"""
+
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+CACHE_DB_PATH     = os.environ.get("LLM_CACHE_PATH", "llm_cache.db")
+CACHE_ENABLED     = os.environ.get("LLM_CACHE", "on").lower() not in ("0", "off", "false", "no")
+CACHE_TTL_SECS    = int(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))   # 7 days
+CACHE_MAX_BYTES   = int(os.environ.get("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 5000))
+TRIM_EVERY_PUTS   = 25
+
+
+def make_key(provider: str, model: str, system: str, prompt: str, temperature) -> str:
+    temp = "default" if temperature is None else f"{float(temperature):.3f}"
+    raw  = "\x1f".join([provider or "", model or "", system or "", prompt or "", temp])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: str = CACHE_DB_PATH, ttl: int = CACHE_TTL_SECS,
+                 max_bytes: int = CACHE_MAX_BYTES, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path        = path
+        self.ttl         = ttl
+        self.max_bytes   = max_bytes
+        self.max_entries = max_entries
+        self._lock       = threading.Lock()
+        self._puts       = 0
+        self.hits        = 0
+        self.misses      = 0
+
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key        TEXT PRIMARY KEY,
+                provider   TEXT NOT NULL,
+                model      TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_hit   REAL NOT NULL,
+                size       INTEGER NOT NULL,
+                value      BLOB NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_hit ON responses(last_hit)")
+        self._db.commit()
+        self._purge_expired()
+
+    # ----------------------------------------------------------
+    # LOOKUP
+    # ----------------------------------------------------------
+    def get(self, provider: str, model: str, system: str, prompt: str,
+            temperature=None, max_age: int | None = None) -> str | None:
+        return self.get_any([(provider, model)], system, prompt, temperature, max_age)
+
+    def get_any(self, candidates: list[tuple], system: str, prompt: str,
+                temperature=None, max_age: int | None = None) -> str | None:
+        """Returns the first cached answer among (provider, model[, temperature]) candidates."""
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        now = time.time()
+        with self._lock:
+            for cand in candidates:
+                provider, model = cand[0], cand[1]
+                temp = cand[2] if len(cand) > 2 else temperature
+                key  = make_key(provider, model, system, prompt, temp)
+                row  = self._db.execute(
+                    "SELECT created_at, value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if not row or now - row[0] > ttl:
+                    continue
+                self._db.execute("UPDATE responses SET last_hit = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                self.hits += 1
+                print(f"🗃️  LLM cache hit → {provider}/{model}")
+                return zlib.decompress(row[1]).decode("utf-8")
+            self.misses += 1
+        return None
+
+    # ----------------------------------------------------------
+    # STORE
+    # ----------------------------------------------------------
+    def put(self, provider: str, model: str, system: str, prompt: str,
+            temperature, value: str) -> None:
+        if not value:
+            return
+        key  = make_key(provider, model, system, prompt, temperature)
+        blob = zlib.compress(value.encode("utf-8"), 6)
+        now  = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, provider, model, created_at, last_hit, size, value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, now, now, len(blob), blob)
+            )
+            self._db.commit()
+            self._puts += 1
+            if self._puts % TRIM_EVERY_PUTS == 0:
+                self._trim_locked()
+
+    # ----------------------------------------------------------
+    # HOUSEKEEPING (TTL + SIZE LIMITS)
+    # ----------------------------------------------------------
+    def _purge_expired(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+            self._db.commit()
+            self._trim_locked()
+
+    def _trim_locked(self) -> None:
+        count, total = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Least-recently-hit entries go first until both limits hold again.
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY last_hit ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+
+_CACHE: LLMCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache | None:
+    global _CACHE
+    if not CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            try:
+                _CACHE = LLMCache()
+            except Exception as e:
+                print(f"⚠️  LLM cache unavailable: {e}")
+                return None
+        return _CACHE
@@ -14,35 +14,69 @@ Upgrades vs v3.7:
   10. Cut-Triggered Micro-Foley — Injects subtle whooshes/clicks precisely on visual cuts.
 """
 
-import os, random, time, json, glob, math, base64, urllib.parse, re
+from __future__ import annotations
+
+import os, random, time, json, math, base64, urllib.parse, re, threading, argparse, functools, sys
+import multiprocessing
+import concurrent.futures as cf
 import xml.etree.ElementTree as ET
 
 import numpy as np
-import cv2
 import PIL.Image
 import PIL.ImageDraw
 import PIL.ImageFilter
 import PIL.ImageFont
 
-from transformers import pipeline as hf_pipeline
-from google import genai
-from google.genai import types
-from moviepy.editor import (
-    ImageClip, VideoClip, VideoFileClip, ColorClip, TextClip,
-    AudioFileClip, CompositeVideoClip, CompositeAudioClip,
-    concatenate_videoclips, concatenate_audioclips
-)
-from moviepy.video.fx.all import colorx, fadein, fadeout, loop
-from moviepy.audio.fx.all import audio_loop
-from faster_whisper import WhisperModel
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-
-import requests
-
-from neural_voice import VoiceEngine, VOICE_MAP
-import meta_upload
+# Heavy dependencies load on first use (see lazy_imports.py) so `import main` stays fast.
+from lazy_imports import lazy_module, lazy_attr, check_import_budget
+
+cv2          = lazy_module("cv2")
+genai        = lazy_module("google.genai")
+types        = lazy_module("google.genai.types")
+meta_upload  = lazy_module("meta_upload")
+_moviepy     = lazy_module("moviepy.editor")
+_video_fx    = lazy_module("moviepy.video.fx.all")
+
+hf_pipeline  = lazy_attr("transformers", "pipeline")
+WhisperModel = lazy_attr("faster_whisper", "WhisperModel")
+Credentials  = lazy_attr("google.oauth2.credentials", "Credentials")
+build        = lazy_attr("googleapiclient.discovery", "build")
+MediaFileUpload = lazy_attr("googleapiclient.http", "MediaFileUpload")
+VoiceEngine  = lazy_attr("neural_voice", "VoiceEngine")
+VOICE_MAP    = lazy_attr("neural_voice", "VOICE_MAP")
+
+ImageClip          = lazy_attr(_moviepy, "ImageClip")
+VideoClip          = lazy_attr(_moviepy, "VideoClip")
+VideoFileClip      = lazy_attr(_moviepy, "VideoFileClip")
+ColorClip          = lazy_attr(_moviepy, "ColorClip")
+TextClip           = lazy_attr(_moviepy, "TextClip")
+AudioFileClip      = lazy_attr(_moviepy, "AudioFileClip")
+CompositeVideoClip = lazy_attr(_moviepy, "CompositeVideoClip")
+CompositeAudioClip = lazy_attr(_moviepy, "CompositeAudioClip")
+concatenate_videoclips = lazy_attr(_moviepy, "concatenate_videoclips")
+concatenate_audioclips = lazy_attr(_moviepy, "concatenate_audioclips")
+colorx       = lazy_attr(_video_fx, "colorx")
+fadein       = lazy_attr(_video_fx, "fadein")
+fadeout      = lazy_attr(_video_fx, "fadeout")
+audio_loop   = lazy_attr("moviepy.audio.fx.all", "audio_loop")
+AudioArrayClip = lazy_attr("moviepy.audio.AudioClip", "AudioArrayClip")
+
+import http_client
+
+from llm_cache import get_llm_cache
+from model_scoreboard import get_scoreboard, load_cached_catalogue, save_catalogue
+from research_corpus import get_research_corpus
+from brief_compressor import compress_text, compress_lines, select_relevant_topics, estimate_tokens
+from topic_index import build_topic_index, TopicIndex
+from run_store import get_run_store, new_run_id
+from stage_graph import StageGraph, StageError
+from workspace import RunWorkspace, prune_workspaces, list_queued_workspaces
+from encoder import (ENCODE_PROFILES, MEZZANINE_PROFILE, encode_clip, encode_still, concat_segments, render_pcm,
+                     frame_count, rendition_paths, encode_renditions, EncodeError)
+from frame_bank import FRAME_EXT, decode_frames, open_frames, fade_ramp, blend_premultiplied, crossfade_loop
+from layer_cache import (LAYER_CACHE_ENABLED, layer_key, layer_path, lookup, staging_path, commit,
+                         read_index, write_index, prune_layers)
+from json_salvage import load_validated, salvage_json, viable_prefix, SCRIPT_SCHEMA, VISUALS_SCHEMA
 
 # ─────────────────────────────────────────────────────────
 #  FIX: Pillow >= 10 removed ANTIALIAS
@@ -68,9 +102,34 @@ GOOGLE_CSE_ID     = os.environ.get("GOOGLE_CSE_ID")
 # ═══════════════════════════════════════════════════════════
 CHANNEL_HANDLE      = "@TheGlitchArchive"
 TOPICS_FILE         = "topics.txt"
+CHANNEL_MEMORY_FILE = "channel_memory.json"   # legacy run memory, imported into the run history store
+RUN_ID              = new_run_id()
 VIDEO_WIDTH         = 720
 VIDEO_HEIGHT        = 1280
 CROSSFADE_DUR       = 0.4        # seconds for cross-dissolve overlap
+PAN_SCALE           = 1.08       # preview pan: image enlargement that gives the window room to travel
+FLAT_IMAGE_STD      = 2.0        # luma std-dev under which a shot image counts as a flat placeholder
+SFX_FPS             = 44100      # sample rate of the in-memory SFX bank
+PROPOSAL_CACHE_TTL  = 6 * 3600   # same-day retries reuse the case; the next slot gets a fresh one
+BRIEF_TOKEN_BUDGET  = int(os.environ.get("BRIEF_TOKEN_BUDGET", 700))   # research brief sent to writers
+BATCH_IN_FLIGHT     = int(os.environ.get("BATCH_IN_FLIGHT", 2))         # videos being prepared at once in --batch
+MAX_CONCURRENT_RENDERS = int(os.environ.get("MAX_CONCURRENT_RENDERS", 1))
+RENDER_PROFILE      = os.environ.get("RENDER_PROFILE", "youtube")            # encoder.ENCODE_PROFILES key
+RENDER_WORKERS      = int(os.environ.get("RENDER_WORKERS", os.cpu_count() or 1))   # segment-parallel render processes
+VIDEO_FPS           = 24
+MIN_SEGMENT_SECS    = 6.0        # shorter segments cost more in per-process setup than they save
+STILL_MIN_SECS      = 0.5        # static stretches shorter than this are not worth a separate encode
+MAX_PROPOSAL_TRIES  = 4          # re-asks allowed when a proposal matches an already-covered case
+
+# ─────────────────────────────────────────────────────────
+#  HEDGED LLM REQUESTS
+# ─────────────────────────────────────────────────────────
+OPENROUTER_CHAT_URL = "https://openrouter.ai/api/v1/chat/completions"
+LLM_HEDGE_ENABLED   = os.environ.get("LLM_HEDGE", "on").lower() not in ("0", "off", "false", "no")
+LLM_HEDGE_DELAY     = float(os.environ.get("LLM_HEDGE_DELAY", 8.0))   # seconds before racing the next model
+LLM_STREAM_ENABLED  = os.environ.get("LLM_STREAM", "on").lower() not in ("0", "off", "false", "no")
+STREAM_CHECK_EVERY  = 200        # new characters between incremental validator runs
+STREAM_MAX_CHARS    = 24000      # a rambling model is cut off here
 
 # ─────────────────────────────────────────────────────────
 #  ERA-MATCHED VISUAL TEXTURES
@@ -153,14 +212,93 @@ VIDEO_FORMATS = [
 # ═══════════════════════════════════════════════════════════
 #  ANTI-BAN & MEMORY
 # ═══════════════════════════════════════════════════════════
-def anti_ban_sleep():
+def anti_ban_sleep(warm_up=None):
+    """Jittered start on Actions. `warm_up` runs inside the window; the sleep never ends early.
+
+    HTTP pools are warmed after the sleep: servers drop idle keep-alive connections long
+    before a 5–10 minute window is over.
+    """
     if os.environ.get("GITHUB_ACTIONS") == "true":
         secs = random.randint(300, 600)
         print(f"🕵️  Anti-Ban Sleep: {secs // 60} min {secs % 60} s")
-        time.sleep(secs)
+        deadline = time.time() + secs
+        if warm_up:
+            warm_up()
+        time.sleep(max(0.0, deadline - time.time()))
+        if warm_up:
+            print(f"🔥 Warmed {http_client.warm(WARM_UP_HOSTS)}/{len(WARM_UP_HOSTS)} HTTP pools")
+
+
+_HISTORY_READY = False
+_HISTORY_LOCK  = threading.Lock()
+_RUN_CONTEXT   = threading.local()
+
+
+def current_run_id() -> str:
+    """The run whose stage is executing on this thread; batch videos share one process."""
+    return getattr(_RUN_CONTEXT, "run_id", None) or RUN_ID
+
+
+def in_run(run_id: str, fn):
+    """Wraps fn so that whatever it records while running is attributed to run_id."""
+    @functools.wraps(fn)
+    def _call(*args, **kwargs):
+        previous = getattr(_RUN_CONTEXT, "run_id", None)
+        _RUN_CONTEXT.run_id = run_id
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _RUN_CONTEXT.run_id = previous
+    return _call
+
+
+def get_run_history():
+    """Run history store; imports the legacy JSON/txt memory the first time it is opened."""
+    global _HISTORY_READY
+    store = get_run_store()
+    if not store:
+        return store
+    with _HISTORY_LOCK:
+        if not _HISTORY_READY:
+            _HISTORY_READY = True
+            store.import_legacy(CHANNEL_MEMORY_FILE, TOPICS_FILE)
+            store.prune_telemetry()
+            get_scoreboard().listeners.append(
+                lambda model, ok, latency, status: store.record_provider_outcome(
+                    model, ok, latency, status, run_id=current_run_id()
+                )
+            )
+    return store
+
+
+_CLAIMED_CASES = TopicIndex()
+_CLAIM_LOCK     = threading.Lock()
+
+
+def claim_case(name: str) -> tuple[str, float] | None:
+    """Reserves a case for this process (batch videos are proposed concurrently).
+    Returns the clashing claim if another video already took it."""
+    with _CLAIM_LOCK:
+        dup = _CLAIMED_CASES.find_near_duplicate(name)
+        if not dup:
+            _CLAIMED_CASES.add(name)
+        return dup
+
+
+def queued_cases() -> list[str]:
+    """Case names of produced videos still waiting in the publish queue."""
+    names = []
+    for ws in list_queued_workspaces():
+        done, value = ws.load("script")
+        if done:
+            names.append(value[0].get("case_name", ""))
+    return names
 
 
 def get_past_topics() -> str:
+    store = get_run_history()
+    if store:
+        return "\n".join(store.recent_topics(100))
     if not os.path.exists(TOPICS_FILE):
         return ""
     with open(TOPICS_FILE, "r", encoding="utf-8") as f:
@@ -170,6 +308,10 @@ def get_past_topics() -> str:
 
 def save_new_topic(case_name: str):
     try:
+        store = get_run_history()
+        if store:
+            store.record_topic(case_name)
+        # topics.txt stays the human-readable log the workflow commits.
         with open(TOPICS_FILE, "a", encoding="utf-8") as f:
             f.write(f"{case_name}\n")
         print(f"💾 Saved '{case_name}' to memory bank.")
@@ -180,7 +322,6 @@ def save_new_topic(case_name: str):
 # ═══════════════════════════════════════════════════════════
 #  GLOBAL SOTA INTELLIGENCE
 # ═══════════════════════════════════════════════════════════
-CHANNEL_MEMORY_FILE = "channel_memory.json"
 
 def _clean_text_snippet(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "").strip())
@@ -326,27 +467,29 @@ def build_retention_profile(script_data: dict, case_name: str = "") -> dict:
     return script_data
 
 
-def load_channel_memory() -> list[dict]:
-    if not os.path.exists(CHANNEL_MEMORY_FILE):
-        return []
-    try:
-        with open(CHANNEL_MEMORY_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data if isinstance(data, list) else []
-    except Exception:
-        return []
-
-
 def record_run_memory(entry: dict) -> None:
+    entry = {"run_id": RUN_ID, **entry}
     try:
-        memory = load_channel_memory()
-        memory.append(entry)
-        memory = memory[-200:]
+        store = get_run_history()
+        if store:
+            store.record_run(entry)
+            print("💾 Saved run memory.")
+            return
+    except Exception as e:
+        print(f"⚠️  Run history store failed ({e}) — falling back to {CHANNEL_MEMORY_FILE}")
+    # Legacy JSON memory: the topic index still reads it, so duplicate-case checks keep working.
+    try:
+        memory = []
+        if os.path.exists(CHANNEL_MEMORY_FILE):
+            with open(CHANNEL_MEMORY_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            memory = data if isinstance(data, list) else []
+        memory = (memory + [entry])[-200:]
         with open(CHANNEL_MEMORY_FILE, "w", encoding="utf-8") as f:
             json.dump(memory, f, indent=2, ensure_ascii=False)
-        print("💾 Saved run memory.")
+        print(f"💾 Saved run memory to {CHANNEL_MEMORY_FILE}.")
     except Exception as e:
-        print(f"⚠️  Could not save run memory: {e}")
+        print(f"❌ Could not save run memory: {e}")
 
 
 def get_top_free_openrouter_models(limit: int = 3) -> list[str]:
@@ -366,75 +509,314 @@ def get_top_free_openrouter_models(limit: int = 3) -> list[str]:
     }
     if not OPENROUTER_KEY:
         return defaults
+
+    def prior(mid):
+        ml = mid.lower()
+        for k, v in REWARD.items():
+            if k in ml:
+                return v / 100.0
+        s = 50
+        if "instruct" in ml: s += 20
+        if "llama-3"  in ml: s += 15
+        if "qwen"     in ml: s += 15
+        if "mistral"  in ml: s += 10
+        return s / 100.0
+
     try:
-        r = requests.get("https://openrouter.ai/api/v1/models", timeout=15)
-        if r.status_code != 200:
-            return defaults
-        all_models = r.json().get("data", [])
-        free_ids = [
-            m["id"] for m in all_models
-            if (m.get("pricing", {}).get("prompt") == "0"
-                and m.get("pricing", {}).get("completion") == "0")
-            or ":free" in m["id"]
-        ]
-        if not free_ids:
-            return defaults
-
-        def score(mid):
-            ml = mid.lower()
-            for k, v in REWARD.items():
-                if k in ml:
-                    return v
-            s = 50
-            if "instruct" in ml: s += 20
-            if "llama-3"  in ml: s += 15
-            if "qwen"     in ml: s += 15
-            if "mistral"  in ml: s += 10
-            return s
-
-        best = sorted(free_ids, key=score, reverse=True)[:limit]
+        free_ids = load_cached_catalogue()
+        if free_ids:
+            print("🗃️  OpenRouter catalogue served from cache.")
+        else:
+            r = http_client.get("https://openrouter.ai/api/v1/models", timeout=15)
+            if r.status_code != 200:
+                return get_scoreboard().rank(defaults, prior=prior)
+            all_models = r.json().get("data", [])
+            free_ids = [
+                m["id"] for m in all_models
+                if (m.get("pricing", {}).get("prompt") == "0"
+                    and m.get("pricing", {}).get("completion") == "0")
+                or ":free" in m["id"]
+            ]
+            if not free_ids:
+                return defaults
+            save_catalogue(free_ids)
+
+        best = get_scoreboard().rank(free_ids, prior=prior, limit=limit)
         print(f"🌟 SOTA Cascade: {best}")
         return best
     except Exception:
         return defaults
 
 
-def ask_llm(system_instruction: str, prompt: str, sota_models: list[str]) -> str:
-    full_prompt = prompt + "\n\nCRITICAL: Return ONLY the exact requested content. No preamble, no markdown."
+class StreamAborted(Exception):
+    pass
+
+
+def _plain_answer_viable(text: str) -> bool:
+    head = text.lstrip()[:80].lower()
+    if head.startswith(("sure", "certainly", "of course", "here is", "here's", "here are",
+                        "as an ai", "i'm sorry", "i cannot", "i can't", "# ", "## ", "**")):
+        return False
+    return len(text) < STREAM_MAX_CHARS
+
+
+def _json_answer_viable(schema: dict):
+    return lambda text: len(text) < STREAM_MAX_CHARS and viable_prefix(text, schema)
+
 
-    if OPENROUTER_KEY:
-        headers = {
-            "Authorization": f"Bearer {OPENROUTER_KEY}",
-            "Content-Type": "application/json",
-        }
+def _stream_guard(chunks, stream_check=None, cancel: threading.Event | None = None,
+                  deadline: float | None = None) -> str | None:
+    """Accumulates text chunks, re-validating the partial answer as it grows."""
+    parts, size, checked = [], 0, 0
+    for piece in chunks:
+        if cancel is not None and cancel.is_set():
+            return None
+        if deadline is not None and time.time() > deadline:
+            raise TimeoutError("stream deadline exceeded")
+        if not piece:
+            continue
+        parts.append(piece)
+        size += len(piece)
+        if stream_check and size - checked >= STREAM_CHECK_EVERY:
+            checked = size
+            if not stream_check("".join(parts)):
+                raise StreamAborted(f"partial answer failed validation after {size} chars")
+    return "".join(parts).strip()
+
+
+def _sse_deltas(r):
+    r.encoding = "utf-8"
+    for line in r.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue                          # keep-alives and ": OPENROUTER PROCESSING"
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            event = json.loads(data)
+        except Exception:
+            continue
+        if event.get("error"):
+            raise RuntimeError(f"stream error: {event['error']}")
+        choice = (event.get("choices") or [{}])[0]
+        yield (choice.get("delta") or {}).get("content") or ""
+
+
+def _openrouter_complete(
+    model: str,
+    messages: list[dict],
+    timeout: float,
+    json_mode: bool = False,
+    cancel: threading.Event | None = None,
+    stream_check=None
+) -> str | None:
+    headers = {
+        "Authorization": f"Bearer {OPENROUTER_KEY}",
+        "Content-Type": "application/json",
+    }
+    payload = {"model": model, "messages": messages}
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    if LLM_STREAM_ENABLED:
+        payload["stream"] = True
+
+    board    = get_scoreboard()
+    started  = time.time()
+    deadline = started + timeout
+    try:
+        r = http_client.post(
+            OPENROUTER_CHAT_URL, headers=headers, json=payload,
+            timeout=(10, timeout), stream=True
+        )
+    except Exception:
+        board.record_call(model, ok=False, latency=time.time() - started)
+        raise
+    try:
+        if r.status_code != 200:
+            board.record_call(model, ok=False, latency=time.time() - started, status=r.status_code)
+            return None
+        if LLM_STREAM_ENABLED:
+            content = _stream_guard(_sse_deltas(r), stream_check, cancel, deadline)
+            if content is None:
+                return None
+        else:
+            # Read the body in chunks so a losing hedge can be abandoned mid-transfer.
+            body = bytearray()
+            for chunk in r.iter_content(chunk_size=4096):
+                if cancel is not None and cancel.is_set():
+                    return None
+                if time.time() > deadline:
+                    board.record_call(model, ok=False, latency=time.time() - started)
+                    return None
+                body.extend(chunk)
+            content = json.loads(body.decode("utf-8"))["choices"][0]["message"]["content"].strip()
+        board.record_call(model, ok=bool(content), latency=time.time() - started)
+        return content
+    except StreamAborted as e:
+        print(f"✂️  Aborted {model}: {e}")
+        board.record_call(model, ok=False, latency=time.time() - started)
+        if json_mode:
+            board.record_json(model, False)
+        return None
+    except Exception:
+        if cancel is None or not cancel.is_set():
+            board.record_call(model, ok=False, latency=time.time() - started)
+        raise
+    finally:
+        r.close()
+
+
+def _gemini_generate(
+    client,
+    model: str,
+    contents: str,
+    config,
+    json_mode: bool = False,
+    stream_check=None
+) -> str:
+    board   = get_scoreboard()
+    started = time.time()
+    try:
+        if LLM_STREAM_ENABLED:
+            stream = client.models.generate_content_stream(model=model, contents=contents, config=config)
+            text = _stream_guard((chunk.text or "" for chunk in stream), stream_check) or ""
+        else:
+            text = client.models.generate_content(model=model, contents=contents, config=config).text or ""
+    except Exception as e:
+        if isinstance(e, StreamAborted):
+            print(f"✂️  Aborted {model}: {e}")
+        board.record_call(model, ok=False, latency=time.time() - started,
+                          status=429 if "429" in str(e) else None)
+        if json_mode and isinstance(e, StreamAborted):
+            board.record_json(model, False)
+        raise
+    board.record_call(model, ok=bool(text), latency=time.time() - started)
+    if json_mode:
+        try:
+            json.loads(text.replace("```json", "").replace("```", "").strip())
+            board.record_json(model, True)
+        except Exception:
+            board.record_json(model, False)
+    return text
+
+
+def openrouter_cascade(
+    messages: list[dict],
+    sota_models: list[str],
+    timeout: float,
+    validate=None,
+    json_mode: bool = False,
+    hedge_delay: float | None = None,
+    stream_check=None
+) -> tuple[str, str] | None:
+    """Returns (model, content) for the first answer that passes validate.
+
+    stream_check(partial_text) is run while tokens arrive; returning False
+    aborts that model immediately and fails over to the next one.
+    """
+    if not OPENROUTER_KEY or not sota_models:
+        return None
+    validate = validate or (lambda text: bool(text))
+
+    board = get_scoreboard()
+
+    def _accept(model: str, content: str | None) -> bool:
+        ok = bool(content) and validate(content)
+        if content and json_mode:
+            board.record_json(model, ok)
+        return ok
+
+    if not LLM_HEDGE_ENABLED:
         for model in sota_models:
-            payload = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user",   "content": full_prompt},
-                ],
-            }
             try:
-                r = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers, json=payload, timeout=45
-                )
-                if r.status_code == 200:
-                    return r.json()["choices"][0]["message"]["content"].strip()
+                content = _openrouter_complete(model, messages, timeout, json_mode,
+                                               stream_check=stream_check)
+                if _accept(model, content):
+                    return model, content
                 time.sleep(4)
             except Exception:
                 time.sleep(4)
+        return None
+
+    delay   = LLM_HEDGE_DELAY if hedge_delay is None else hedge_delay
+    cancel  = threading.Event()
+    pending = list(sota_models)
+    running = {}
+    pool    = cf.ThreadPoolExecutor(max_workers=len(sota_models), thread_name_prefix="hedge")
+
+    def _launch():
+        model = pending.pop(0)
+        fut = pool.submit(_openrouter_complete, model, messages, timeout, json_mode,
+                          cancel, stream_check)
+        running[fut] = model
+
+    try:
+        _launch()
+        while running:
+            done, _ = cf.wait(list(running), timeout=delay if pending else None,
+                              return_when=cf.FIRST_COMPLETED)
+            if not done:
+                # Primary is slow: hedge with the next model in the cascade.
+                print(f"⏱️  Hedging → {pending[0]}")
+                _launch()
+                continue
+            for fut in done:
+                model = running.pop(fut)
+                try:
+                    content = fut.result()
+                except Exception:
+                    content = None
+                if _accept(model, content):
+                    return model, content
+                if pending:
+                    _launch()
+        return None
+    finally:
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def ask_llm(
+    system_instruction: str,
+    prompt: str,
+    sota_models: list[str],
+    use_cache: bool = True,
+    cache_ttl: int | None = None,
+    stream_check=_plain_answer_viable
+) -> str:
+    full_prompt = prompt + "\n\nCRITICAL: Return ONLY the exact requested content. No preamble, no markdown."
+
+    cache = get_llm_cache() if use_cache else None
+    if cache:
+        candidates = ([("openrouter", m) for m in sota_models] if OPENROUTER_KEY else [])
+        candidates.append(("gemini", "models/gemini-2.5-flash", 0.7))
+        hit = cache.get_any(candidates, system_instruction, full_prompt, max_age=cache_ttl)
+        if hit:
+            return hit
+
+    won = openrouter_cascade(
+        [
+            {"role": "system", "content": system_instruction},
+            {"role": "user",   "content": full_prompt},
+        ],
+        sota_models, timeout=45, stream_check=stream_check
+    )
+    if won:
+        model, answer = won
+        if cache:
+            cache.put("openrouter", model, system_instruction, full_prompt, None, answer)
+        return answer
 
     try:
         client = genai.Client(api_key=GEMINI_KEY)
         cfg = types.GenerateContentConfig(
             system_instruction=system_instruction, temperature=0.7
         )
-        rsp = client.models.generate_content(
-            model="models/gemini-2.5-flash", contents=full_prompt, config=cfg
-        )
-        return rsp.text.strip()
+        # Last resort: never abort it early, there is nothing left to fail over to.
+        answer = _gemini_generate(client, "models/gemini-2.5-flash", full_prompt, cfg).strip()
+        if cache:
+            cache.put("gemini", "models/gemini-2.5-flash", system_instruction, full_prompt, 0.7, answer)
+        return answer
     except Exception:
         return ""
 
@@ -442,32 +824,45 @@ def ask_llm(system_instruction: str, prompt: str, sota_models: list[str]) -> str
 # ═══════════════════════════════════════════════════════════
 #  LIVE RESEARCH ENGINE
 # ═══════════════════════════════════════════════════════════
-def scrape_wikipedia(case_name: str) -> str:
+def scrape_wikipedia(case_name: str, max_chars: int = 4000) -> str:
     print(f"📚 Wikipedia → {case_name}")
     ua = {"User-Agent": "GlitchArchiveBot/2.0 (educational documentary)"}
+    corpus = get_research_corpus()
     try:
-        sr = requests.get(
-            "https://en.wikipedia.org/w/api.php",
-            params={"action": "query", "format": "json",
-                    "list": "search", "srsearch": case_name, "srlimit": 1},
-            headers=ua, timeout=10
-        )
-        results = sr.json().get("query", {}).get("search", [])
-        if not results:
+        title = corpus.get("wiki_title", case_name) if corpus else None
+        if title is None:
+            sr = http_client.get(
+                "https://en.wikipedia.org/w/api.php",
+                params={"action": "query", "format": "json",
+                        "list": "search", "srsearch": case_name, "srlimit": 1},
+                headers=ua, timeout=10
+            )
+            results = sr.json().get("query", {}).get("search", []) if sr.status_code == 200 else []
+            title = results[0]["title"] if results else ""
+            # Only a real hit is cached; a miss or an error body is retried by the next run.
+            if corpus and title:
+                corpus.put("wiki_title", case_name, title)
+        if not title:
             return ""
-        title = results[0]["title"]
 
-        er = requests.get(
+        extract = corpus.get("wiki_extract", title) if corpus else None
+        if extract is not None:
+            print(f"🗃️  Wikipedia extract served from corpus → {title}")
+            return extract[:max_chars]
+
+        er = http_client.get(
             "https://en.wikipedia.org/w/api.php",
             params={"action": "query", "format": "json", "prop": "extracts",
                     "titles": title, "exintro": False, "explaintext": True,
                     "exsectionformat": "plain"},
             headers=ua, timeout=15
         )
-        pages = er.json().get("query", {}).get("pages", {})
+        pages = er.json().get("query", {}).get("pages", {}) if er.status_code == 200 else {}
         for _, page in pages.items():
             extract = page.get("extract", "")
-            return extract[:4000]
+            if corpus and extract:
+                corpus.put("wiki_extract", title, extract)
+            return extract[:max_chars]
     except Exception as e:
         print(f"⚠️  Wikipedia failed: {e}")
     return ""
@@ -475,10 +870,15 @@ def scrape_wikipedia(case_name: str) -> str:
 
 def scrape_google_news_rss(case_name: str) -> str:
     print(f"📰 Google News RSS → {case_name}")
+    corpus = get_research_corpus()
+    cached = corpus.get("news", case_name) if corpus else None
+    if cached is not None:
+        print("🗃️  News digest served from corpus.")
+        return cached
     try:
         q   = urllib.parse.quote(case_name)
         url = f"https://news.google.com/rss/search?q={q}&hl=en-US&gl=US&ceid=US:en"
-        r   = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        r   = http_client.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
         root  = ET.fromstring(r.content)
         items = root.findall(".//item")[:6]
         lines = []
@@ -492,7 +892,11 @@ def scrape_google_news_rss(case_name: str) -> str:
                          .replace("<b>", "").replace("</b>", "")
                          .replace("&nbsp;", " ").replace("&amp;", "&"))
                 lines.append(clean[:220])
-        return "\n".join(lines[:10])
+        digest = "\n".join(lines[:10])
+        # An empty feed is usually a transient block or a bad query; let the next run retry it.
+        if corpus and digest:
+            corpus.put("news", case_name, digest)
+        return digest
     except Exception as e:
         print(f"⚠️  Google News RSS failed: {e}")
     return ""
@@ -517,27 +921,64 @@ def propose_case_and_research(
 ) -> tuple[str, str, str]:
     print(f"🔬 Phase 0 Research Engine → niche: '{niche}'")
 
-    avoid = (f"CRITICAL — Do NOT suggest any case from this list:\n{past_topics}\n"
-             if past_topics else "")
-
-    proposal = ask_llm(
-        "You are a veteran true crime research specialist.",
-        f"""Suggest ONE highly specific, obscure, and 100% real historical case in the category: "{niche}".
+    # The local index enforces uniqueness, so the prompt only needs a short hint list.
+    history     = get_run_history()
+    covered     = []
+    if history:
+        covered = history.all_topics()
+        for run in history.find_runs():
+            covered += [run.get("case_name", ""), run.get("title", "")]
+    covered    += queued_cases()
+    topic_index = build_topic_index(TOPICS_FILE, CHANNEL_MEMORY_FILE, extra=covered)
+    hint_topics = select_relevant_topics(past_topics, niche, recent=15, related=10)
+    rejected    = []
+    proposal    = ""
+
+    for attempt in range(MAX_PROPOSAL_TRIES):
+        avoid_list = "\n".join(x for x in [hint_topics] + rejected if x)
+        avoid = (f"CRITICAL — Do NOT suggest any case from this list:\n{avoid_list}\n"
+                 if avoid_list else "")
+
+        proposal = ask_llm(
+            "You are a veteran true crime research specialist.",
+            f"""Suggest ONE highly specific, obscure, and 100% real historical case in the category: "{niche}".
 {avoid}
 Requirements:
 - Must be a real, documented event with a verifiable Wikipedia article
 - Must be genuinely unusual, eerie, or deeply puzzling
 - Reply with ONLY the exact case name (e.g. "The Tamam Shud Case")""",
-        sota_models
-    ).strip().strip('"').strip("'")
+            sota_models,
+            use_cache=(attempt == 0),
+            cache_ttl=PROPOSAL_CACHE_TTL
+        ).strip().strip('"').strip("'")
 
-    if not proposal or len(proposal) > 90:
+        if not proposal or len(proposal) > 90:
+            proposal = ""
+            continue
+        dup = topic_index.find_near_duplicate(proposal) or claim_case(proposal)
+        if not dup:
+            break
+        print(f"♻️  '{proposal}' already covered as '{dup[0]}' (sim {dup[1]}) — re-asking...")
+        rejected.append(proposal)
+        proposal = ""
+
+    if not proposal:
         proposal = f"obscure unsolved {niche} case"
     print(f"🕵️  Selected Case: {proposal}")
 
-    wiki_text = scrape_wikipedia(proposal)
-    news_text = scrape_google_news_rss(proposal)
-    era       = detect_era(wiki_text + " " + news_text)
+    with cf.ThreadPoolExecutor(max_workers=2, thread_name_prefix="research") as pool:
+        wiki_job  = pool.submit(scrape_wikipedia, proposal, 12000)
+        news_job  = pool.submit(scrape_google_news_rss, proposal)
+        wiki_full = wiki_job.result()
+        news_full = news_job.result()
+    era       = detect_era(wiki_full[:4000] + " " + news_full)
+
+    # The compressor sees the whole article and keeps the densest sentences.
+    focus     = f"{proposal} {niche}"
+    wiki_text = compress_text(wiki_full, int(BRIEF_TOKEN_BUDGET * 0.75), focus)
+    news_text = "\n".join(compress_lines(news_full.splitlines(), int(BRIEF_TOKEN_BUDGET * 0.25), focus))
+    print(f"🗜️  Research brief: ~{estimate_tokens(wiki_full + news_full)} → "
+          f"~{estimate_tokens(wiki_text + news_text)} tokens")
 
     brief = f"CASE NAME: {proposal}\n\n"
     if wiki_text:
@@ -575,6 +1016,7 @@ def generate_viral_script(sota_models: list[str]) -> dict | None:
     case_name, research_brief, era = propose_case_and_research(
         niche, past_topics, sota_models
     )
+    banned_topics = select_relevant_topics(past_topics, f"{case_name} {niche}")
 
     template = """{
   "case_name": "The Tamam Shud Case",
@@ -619,7 +1061,7 @@ RESEARCH BRIEF — THIS IS YOUR ONLY SOURCE:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 BANNED CASES (do NOT write about these):
-{past_topics if past_topics else "(none yet)"}
+{banned_topics if banned_topics else "(none yet)"}
 
 ━━━━ PSYCHOLOGICAL PACING RULES ━━━━
 LINE 1  — PATTERN INTERRUPT: Start directly inside a visceral physical observation or forensic anomaly. No intro.
@@ -658,45 +1100,40 @@ Return ONLY valid JSON exactly matching this format:
         temperature=0.92, top_p=0.95, response_mime_type="application/json"
     )
 
+    # Creative drafts are never served from the LLM cache; a resumed run restores the
+    # finished script from its workspace checkpoint instead.
     script_data = None
-
     try:
-        rsp = client.models.generate_content(
-            model="models/gemini-2.5-pro", contents=stage1_prompt, config=json_config
-        )
-        script_data = json.loads(rsp.text)
+        raw = _gemini_generate(client, "models/gemini-2.5-pro", stage1_prompt, json_config,
+                               json_mode=True, stream_check=_json_answer_viable(SCRIPT_SCHEMA))
+        script_data = load_validated(raw, SCRIPT_SCHEMA)
         print("✅ Stage 1: Gemini 2.5 Pro")
     except Exception as e:
         print(f"⚠️  Gemini Pro failed: {e}")
 
-    if not script_data and OPENROUTER_KEY:
-        headers = {"Authorization": f"Bearer {OPENROUTER_KEY}", "Content-Type": "application/json"}
-        for model in sota_models:
-            payload = {
-                "model": model,
-                "messages": [{"role": "user", "content": stage1_prompt}],
-                "response_format": {"type": "json_object"},
-            }
+    if not script_data:
+        def _valid_script(raw: str) -> bool:
             try:
-                r = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers, json=payload, timeout=70
-                )
-                if r.status_code == 200:
-                    raw = (r.json()["choices"][0]["message"]["content"]
-                           .replace("```json", "").replace("```", "").strip())
-                    script_data = json.loads(raw)
-                    print(f"✅ Stage 1: {model}")
-                    break
-            except Exception:
-                time.sleep(5)
+                load_validated(raw, SCRIPT_SCHEMA)
+                return True
+            except ValueError:
+                return False
+
+        won = openrouter_cascade(
+            [{"role": "user", "content": stage1_prompt}],
+            sota_models, timeout=70, validate=_valid_script, json_mode=True,
+            stream_check=_json_answer_viable(SCRIPT_SCHEMA)
+        )
+        if won:
+            model, raw = won
+            script_data = load_validated(raw, SCRIPT_SCHEMA)
+            print(f"✅ Stage 1: {model}")
 
     if not script_data:
         try:
-            rsp = client.models.generate_content(
-                model="models/gemini-2.5-flash", contents=stage1_prompt, config=json_config
-            )
-            script_data = json.loads(rsp.text)
+            raw = _gemini_generate(client, "models/gemini-2.5-flash", stage1_prompt, json_config,
+                                   json_mode=True)
+            script_data = load_validated(raw, SCRIPT_SCHEMA)
             print("✅ Stage 1: Gemini 2.5 Flash (fallback)")
         except Exception as e:
             print(f"❌ All writers failed: {e}")
@@ -725,7 +1162,8 @@ Return ONLY a numbered list of revised clean_text lines:
 2. [revised line]
 ...
 """
-        revised = ask_llm("You are an elite documentary script editor.", refine_prompt, sota_models)
+        revised = ask_llm("You are an elite documentary script editor.", refine_prompt, sota_models,
+                          use_cache=False)
         if revised:
             revised_lines = [
                 ln.strip() for ln in revised.split("\n")
@@ -815,44 +1253,54 @@ Return ONLY valid JSON with EXACTLY {required_images} items:
         )
         return item
 
-    if OPENROUTER_KEY:
-        headers = {"Authorization": f"Bearer {OPENROUTER_KEY}", "Content-Type": "application/json"}
-        for model in sota_models:
-            payload = {
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "response_format": {"type": "json_object"},
-            }
+    def _finalize(raw: str) -> list[dict]:
+        visuals = load_validated(raw, VISUALS_SCHEMA)["visuals"]
+        visuals = [_normalize_visual(v, i) for i, v in enumerate(visuals)]
+        while len(visuals) < required_images:
+            visuals.append(_normalize_visual({}, len(visuals)))
+        return visuals[:required_images]
+
+    cache = get_llm_cache()
+    if cache:
+        candidates = ([("openrouter", m, None) for m in sota_models] if OPENROUTER_KEY else [])
+        candidates.append(("gemini", "models/gemini-2.5-flash", 0.7))
+        hit = cache.get_any(candidates, "", prompt)
+        if hit:
             try:
-                r = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers, json=payload, timeout=60
-                )
-                if r.status_code == 200:
-                    raw = (r.json()["choices"][0]["message"]["content"]
-                           .replace("```json", "").replace("```", "").strip())
-                    visuals = json.loads(raw).get("visuals", [])
-                    visuals = [_normalize_visual(v, i) for i, v in enumerate(visuals)]
-                    while len(visuals) < required_images:
-                        visuals.append(_normalize_visual({}, len(visuals)))
-                    return visuals[:required_images]
+                return _finalize(hit)
             except Exception:
-                time.sleep(4)
+                pass
+
+    def _valid_visuals(raw: str) -> bool:
+        try:
+            load_validated(raw, VISUALS_SCHEMA)
+            return True
+        except ValueError:
+            return False
+
+    won = openrouter_cascade(
+        [{"role": "user", "content": prompt}],
+        sota_models, timeout=60, validate=_valid_visuals, json_mode=True,
+        stream_check=_json_answer_viable(VISUALS_SCHEMA)
+    )
+    if won:
+        model, raw = won
+        if cache:
+            cache.put("openrouter", model, "", prompt, None,
+                      json.dumps(load_validated(raw, VISUALS_SCHEMA), ensure_ascii=False))
+        return _finalize(raw)
 
     try:
         client = genai.Client(api_key=GEMINI_KEY)
         cfg = types.GenerateContentConfig(
             temperature=0.7, response_mime_type="application/json"
         )
-        rsp = client.models.generate_content(
-            model="models/gemini-2.5-flash", contents=prompt, config=cfg
-        )
-        visuals = (json.loads(rsp.text.replace("```json", "").replace("```", "").strip())
-                   .get("visuals", []))
-        visuals = [_normalize_visual(v, i) for i, v in enumerate(visuals)]
-        while len(visuals) < required_images:
-            visuals.append(_normalize_visual({}, len(visuals)))
-        return visuals[:required_images]
+        raw = _gemini_generate(client, "models/gemini-2.5-flash", prompt, cfg, json_mode=True)
+        visuals = _finalize(raw)
+        if cache:
+            cache.put("gemini", "models/gemini-2.5-flash", "", prompt, 0.7,
+                      json.dumps(load_validated(raw, VISUALS_SCHEMA), ensure_ascii=False))
+        return visuals
     except Exception as e:
         print(f"❌ Visual prompt generation failed: {e}")
 
@@ -868,7 +1316,7 @@ def fetch_archive_image(query: str, filename: str) -> bool:
     ua    = {"User-Agent": "GhostBot/2.0 (Educational Documentary)"}
 
     try:
-        r = requests.get(
+        r = http_client.get(
             "https://en.wikipedia.org/w/api.php",
             params={"action": "query", "format": "json", "prop": "pageimages",
                     "generator": "search", "gsrsearch": clean,
@@ -878,7 +1326,7 @@ def fetch_archive_image(query: str, filename: str) -> bool:
         pages = r.json().get("query", {}).get("pages", {})
         for _, page in pages.items():
             if "thumbnail" in page:
-                data = requests.get(page["thumbnail"]["source"], headers=ua, timeout=15).content
+                data = http_client.get(page["thumbnail"]["source"], headers=ua, timeout=15).content
                 with open(filename, "wb") as f: f.write(data)
                 if os.path.getsize(filename) > 1000: return True
     except Exception: pass
@@ -888,17 +1336,17 @@ def fetch_archive_image(query: str, filename: str) -> bool:
             params = {"q": f"{clean} evidence photo", "cx": GOOGLE_CSE_ID,
                       "key": SEARCH_API_KEY, "searchType": "image",
                       "num": 1, "safe": "active"}
-            items = requests.get(
-                "https://www.googleapis.com/customsearch/v1", params=params
+            items = http_client.get(
+                "https://www.googleapis.com/customsearch/v1", params=params, timeout=15
             ).json().get("items", [])
             if items:
-                data = requests.get(items[0]["link"], headers=ua, timeout=15).content
+                data = http_client.get(items[0]["link"], headers=ua, timeout=15).content
                 with open(filename, "wb") as f: f.write(data)
                 if os.path.getsize(filename) > 1000: return True
         except Exception: pass
 
     try:
-        docs = requests.get(
+        docs = http_client.get(
             "https://archive.org/advancedsearch.php",
             params={"q": f'"{clean}" AND mediatype:image',
                     "fl": "identifier", "rows": 3, "output": "json"},
@@ -907,7 +1355,7 @@ def fetch_archive_image(query: str, filename: str) -> bool:
         for doc in docs:
             iid = doc.get("identifier")
             if iid:
-                data = requests.get(
+                data = http_client.get(
                     f"https://archive.org/download/{iid}/{iid}.jpg",
                     headers=ua, timeout=15
                 ).content
@@ -925,7 +1373,7 @@ def fetch_cloudflare_image(prompt: str, filename: str) -> bool:
            f"/ai/run/@cf/black-forest-labs/flux-1-schnell")
     headers = {"Authorization": f"Bearer {CF_API_TOKEN}", "Content-Type": "application/json"}
     try:
-        r = requests.post(url, headers=headers, json={"prompt": prompt}, timeout=50)
+        r = http_client.post(url, headers=headers, json={"prompt": prompt}, timeout=50)
         if r.status_code == 200:
             ct = r.headers.get("Content-Type", "")
             if "application/json" in ct:
@@ -945,7 +1393,7 @@ def fetch_pexels_image(prompt: str, filename: str) -> bool:
     if not PEXELS_KEY: return False
     query = " ".join(prompt.split()[:5])
     try:
-        r = requests.get(
+        r = http_client.get(
             "https://api.pexels.com/v1/search",
             headers={"Authorization": PEXELS_KEY},
             params={"query": query, "per_page": 1, "orientation": "portrait"},
@@ -954,7 +1402,7 @@ def fetch_pexels_image(prompt: str, filename: str) -> bool:
         if r.status_code == 200:
             photos = r.json().get("photos", [])
             if photos:
-                data = requests.get(photos[0]["src"]["large2x"], timeout=20).content
+                data = http_client.get(photos[0]["src"]["large2x"], timeout=20).content
                 with open(filename, "wb") as f: f.write(data)
                 if os.path.getsize(filename) > 1000: return True
     except Exception: pass
@@ -1044,17 +1492,33 @@ def apply_diegetic_matting(filename: str) -> bool:
 # ═══════════════════════════════════════════════════════════
 #  EASED PARALLAX ENGINE
 # ═══════════════════════════════════════════════════════════
+_MODEL_LOCK      = threading.Lock()
+_DEPTH_LOCK      = threading.Lock()
+_DEPTH_ESTIMATOR = None
+
+
+def get_depth_estimator():
+    """Depth model, loaded once per process and shared by every video in a batch."""
+    global _DEPTH_ESTIMATOR
+    with _MODEL_LOCK:
+        if _DEPTH_ESTIMATOR is None:
+            _DEPTH_ESTIMATOR = hf_pipeline(
+                task="depth-estimation",
+                model="depth-anything/Depth-Anything-V2-Small-hf",
+                device="cpu"
+            )
+        return _DEPTH_ESTIMATOR
+
+
 def generate_depth_map(image_path: str) -> str | None:
     print(f"🧠 Depth Map → {os.path.basename(image_path)}")
     try:
-        estimator  = hf_pipeline(
-            task="depth-estimation",
-            model="depth-anything/Depth-Anything-V2-Small-hf",
-            device="cpu"
-        )
+        estimator  = get_depth_estimator()
         img        = PIL.Image.open(image_path).convert("RGB")
         depth_path = image_path.replace(".jpg", "_depth.jpg")
-        estimator(img)["depth"].save(depth_path)
+        with _DEPTH_LOCK:
+            depth  = estimator(img)["depth"]
+        depth.save(depth_path)
         return depth_path
     except Exception as e:
         print(f"⚠️  Depth map failed: {e}")
@@ -1072,7 +1536,7 @@ def apply_parallax_effect(
     depth_array: np.ndarray,
     direction: str = "left"
 ) -> np.ndarray:
-    max_shift   = 28.0
+    max_shift   = 28.0 * img_array.shape[1] / VIDEO_WIDTH
     progress    = t / max(duration, 0.1)
     eased       = _ease_in_out(min(max(progress, 0.0), 1.0))
 
@@ -1098,11 +1562,13 @@ def apply_parallax_effect(
     )
 
 
-def get_image_clip(asset_type: str, search_query: str, ai_prompt: str, duration: float, index: int):
-    fname = f"temp_img_{index}.jpg"
+def prepare_shot_image(asset_type: str, search_query: str, ai_prompt: str, index: int,
+                       workdir: str = ".") -> str | None:
+    """Fetches, verifies, mattes and crops one shot to the frame. Returns the cropped image path."""
+    fname = os.path.join(workdir, f"temp_img_{index}.jpg")
     ok = False
     
-    print(f"🎬 [Shot {index}] Type: {asset_type} | Target: {search_query[:30] if asset_type != 'ai' else ai_prompt[:30]} | Dur: {duration:.2f}s")
+    print(f"🎬 [Shot {index}] Type: {asset_type} | Target: {search_query[:30] if asset_type != 'ai' else ai_prompt[:30]}")
 
     if asset_type == "archive":
         ok = fetch_archive_image(search_query, fname)
@@ -1115,11 +1581,14 @@ def get_image_clip(asset_type: str, search_query: str, ai_prompt: str, duration:
         if not ok: ok = fetch_pexels_image(search_query, fname)
         if not ok: ok = fetch_archive_image(search_query, fname)
 
-    if not ok: ok = fetch_placeholder_image(fname)
+    placeholder = not ok
+    if placeholder: fetch_placeholder_image(fname)
 
     if not verify_and_convert_image(fname):
-        fetch_placeholder_image(fname)
-    apply_diegetic_matting(fname)
+        placeholder = fetch_placeholder_image(fname)
+    if not placeholder:
+        # A matted blank card adds nothing, and leaving it flat lets it render as a still.
+        apply_diegetic_matting(fname)
 
     try:
         base = (ImageClip(fname)
@@ -1130,14 +1599,59 @@ def get_image_clip(asset_type: str, search_query: str, ai_prompt: str, duration:
             x_center=base.w / 2, y_center=base.h / 2,
             width=VIDEO_WIDTH, height=VIDEO_HEIGHT
         )
-
-        cropped_path = f"temp_cropped_{index}.jpg"
+        cropped_path = os.path.join(workdir, f"temp_cropped_{index}.jpg")
         base.save_frame(cropped_path, t=0)
-        depth_path = generate_depth_map(cropped_path)
+        return cropped_path
+    except Exception as e:
+        print(f"⚠️  Shot {index} preparation failed: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _image_is_flat(path: str) -> bool:
+    with PIL.Image.open(path) as img:
+        small = np.asarray(img.convert("L").resize((64, 112)), dtype=np.float32)
+    return float(small.std()) < FLAT_IMAGE_STD
+
+
+def shot_is_static(cropped_path: str | None) -> bool:
+    """True when build_shot_clip produces a still: the fallback colour card or a flat placeholder."""
+    if not cropped_path or not os.path.exists(cropped_path):
+        return True
+    try:
+        return _image_is_flat(cropped_path)
+    except Exception:
+        return False
+
+
+def _shot_source(cropped_path: str, size: tuple[int, int]):
+    """The prepared shot for ImageClip: its path at full size, else an array scaled to `size`."""
+    if tuple(size) == (VIDEO_WIDTH, VIDEO_HEIGHT):
+        return cropped_path
+    with PIL.Image.open(cropped_path) as img:
+        return np.asarray(img.convert("RGB").resize(tuple(size), PIL.Image.BILINEAR))
 
-        if depth_path and os.path.exists(depth_path):
+
+def build_shot_clip(cropped_path: str | None, depth_path: str | None, duration: float, index: int,
+                    size: tuple[int, int] = (VIDEO_WIDTH, VIDEO_HEIGHT)):
+    """Animated clip for a prepared shot: depth parallax when a depth map exists, slow zoom otherwise.
+
+    Frames are built at `size`; shots are prepared at full size and scaled down once here.
+    """
+    width, height = size
+    try:
+        if not cropped_path or not os.path.exists(cropped_path):
+            raise FileNotFoundError("no prepared image")
+
+        if shot_is_static(cropped_path):
+            # Nothing to move in a flat frame; a still lets the renderer skip it (see static_spans).
+            clip = ImageClip(_shot_source(cropped_path, size)).set_duration(duration)
+        elif depth_path and os.path.exists(depth_path):
             img_arr   = cv2.cvtColor(cv2.imread(cropped_path), cv2.COLOR_BGR2RGB)
             depth_arr = cv2.imread(depth_path, cv2.IMREAD_GRAYSCALE)
+            if img_arr.shape[:2] != (height, width):
+                img_arr   = cv2.resize(img_arr, (width, height), interpolation=cv2.INTER_AREA)
+                depth_arr = cv2.resize(depth_arr, (width, height), interpolation=cv2.INTER_AREA)
             cam_dir   = "left" if index % 2 == 0 else "right"
 
             clip = VideoClip(
@@ -1152,9 +1666,9 @@ def get_image_clip(asset_type: str, search_query: str, ai_prompt: str, duration:
                 eased = _ease_in_out(min(max(p, 0.0), 1.0))
                 return (1 + 0.06 * eased) if index % 2 == 0 else (1.06 - 0.06 * eased)
 
-            clip = base.resize(zoom_func).crop(
-                x_center=VIDEO_WIDTH / 2, y_center=VIDEO_HEIGHT / 2,
-                width=VIDEO_WIDTH, height=VIDEO_HEIGHT
+            clip = ImageClip(_shot_source(cropped_path, size)).set_duration(duration).resize(zoom_func).crop(
+                x_center=width / 2, y_center=height / 2,
+                width=width, height=height
             )
 
         safe_fade = min(CROSSFADE_DUR, max(0.1, duration / 3.0))
@@ -1163,19 +1677,45 @@ def get_image_clip(asset_type: str, search_query: str, ai_prompt: str, duration:
 
     except Exception as e:
         print(f"⚠️  Clip {index} failed: {e}")
-        return ColorClip(size=(VIDEO_WIDTH, VIDEO_HEIGHT), color=(20, 20, 35), duration=duration)
+        return ColorClip(size=(width, height), color=(20, 20, 35), duration=duration)
+
+
+def build_pan_clip(cropped_path: str, duration: float, index: int,
+                   size: tuple[int, int] = (VIDEO_WIDTH, VIDEO_HEIGHT)):
+    """Preview stand-in for parallax/zoom: a window sliding across a once-enlarged image.
+
+    Each frame is an array slice, so it costs next to nothing; fades match build_shot_clip.
+    """
+    width, height = size
+    try:
+        with PIL.Image.open(cropped_path) as img:
+            big = np.asarray(img.convert("RGB").resize(
+                (int(width * PAN_SCALE), int(height * PAN_SCALE)), PIL.Image.BILINEAR))
+    except Exception as e:
+        print(f"⚠️  Clip {index} failed: {e}")
+        return ColorClip(size=(width, height), color=(20, 20, 35), duration=duration)
+    travel = big.shape[1] - width
+    y0     = (big.shape[0] - height) // 2
+
+    def make_frame(t):
+        p  = _ease_in_out(min(max(t / max(duration, 0.1), 0.0), 1.0))
+        x0 = int(travel * (p if index % 2 == 0 else 1.0 - p))
+        return big[y0:y0 + height, x0:x0 + width]
+
+    safe_fade = min(CROSSFADE_DUR, max(0.1, duration / 3.0))
+    return VideoClip(make_frame=make_frame, duration=duration).fx(fadein, safe_fade).fx(fadeout, safe_fade)
 
 
 # ═══════════════════════════════════════════════════════════
 #  ATMOSPHERICS & MUSIC 
 # ═══════════════════════════════════════════════════════════
-def fetch_atmospheric_b_roll(duration: float, filename: str = "temp_atmosphere.mp4") -> bool:
+def fetch_atmospheric_b_roll(filename: str = "temp_atmosphere.mp4") -> bool:
     print("🌫️  Fetching Atmospheric B-Roll (Pexels Video)...")
     if not PEXELS_KEY: return False
     queries = ["dust particles black background", "film grain overlay dark",
                "rain drops dark glass", "smoke dark background", "fog night dark"]
     try:
-        r = requests.get(
+        r = http_client.get(
             "https://api.pexels.com/videos/search",
             headers={"Authorization": PEXELS_KEY},
             params={"query": random.choice(queries), "per_page": 3, "orientation": "portrait"},
@@ -1189,18 +1729,36 @@ def fetch_atmospheric_b_roll(duration: float, filename: str = "temp_atmosphere.m
                          or video.get("video_files", [])
                 if files:
                     with open(filename, "wb") as f:
-                        f.write(requests.get(files[0]["link"], timeout=45).content)
+                        f.write(http_client.get(files[0]["link"], timeout=45).content)
                     return True
     except Exception: pass
     return False
 
 
+def fetch_atmosphere(workdir: str = ".") -> str | None:
+    """Atmosphere overlay decoded once into a loopable, opacity-premultiplied frame ring."""
+    fname = os.path.join(workdir, "temp_atmosphere.mp4")
+    if not fetch_atmospheric_b_roll(fname):
+        return None
+    frames_path = os.path.join(workdir, f"temp_atmosphere{FRAME_EXT}")
+    try:
+        decode_frames(fname, frames_path, VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS,
+                      max_secs=ATMOSPHERE_RING_SECS + ATMOSPHERE_SEAM_SECS, gain=ATMOSPHERE_OPACITY)
+        crossfade_loop(frames_path, VIDEO_WIDTH, VIDEO_HEIGHT, int(ATMOSPHERE_SEAM_SECS * VIDEO_FPS))
+        return frames_path
+    except Exception as e:
+        print(f"⚠️  Atmosphere decode error: {e}")
+        return None
+    finally:
+        os.remove(fname)
+
+
 def fetch_texture_flash_video(index: int, filename: str) -> bool:
     print(f"🎞️  Fetching Texture Flash {index} (Pexels)...")
     if not PEXELS_KEY: return False
     queries = ["scratching texture", "film burn", "flickering film", "distortion glitch", "macro noise"]
     try:
-        r = requests.get(
+        r = http_client.get(
             "https://api.pexels.com/videos/search",
             headers={"Authorization": PEXELS_KEY},
             params={"query": random.choice(queries), "per_page": 5, "orientation": "portrait"},
@@ -1214,7 +1772,7 @@ def fetch_texture_flash_video(index: int, filename: str) -> bool:
                          or video.get("video_files", [])
                 if files:
                     with open(filename, "wb") as f:
-                        f.write(requests.get(files[0]["link"], timeout=45).content)
+                        f.write(http_client.get(files[0]["link"], timeout=45).content)
                     return True
     except Exception: pass
     return False
@@ -1239,7 +1797,7 @@ SCRIPT: {script_text}""",
     if not vibe or len(vibe) > 50:
         vibe = "dark suspense ambient"
     try:
-        r = requests.get(
+        r = http_client.get(
             "https://pixabay.com/api/audio/",
             params={"key": PIXABAY_KEY, "q": vibe, "per_page": 3},
             timeout=15
@@ -1248,7 +1806,7 @@ SCRIPT: {script_text}""",
             hits = r.json().get("hits", [])
             if hits and hits[0].get("audio"):
                 with open(filename, "wb") as f:
-                    f.write(requests.get(hits[0]["audio"], timeout=30).content)
+                    f.write(http_client.get(hits[0]["audio"], timeout=30).content)
                 return True
     except Exception: pass
     return False
@@ -1257,6 +1815,38 @@ SCRIPT: {script_text}""",
 # ═══════════════════════════════════════════════════════════
 #  SFX + CINEMATIC STINGERS
 # ═══════════════════════════════════════════════════════════
+_SFX_BANK_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=64)
+def _decode_sfx(path: str) -> tuple:
+    clip = AudioFileClip(path)
+    try:
+        return clip.to_soundarray(fps=SFX_FPS), SFX_FPS
+    finally:
+        clip.close()
+
+
+def load_sfx(path: str):
+    """SFX decoded once per process into an in-memory clip that any video can reuse."""
+    with _SFX_BANK_LOCK:
+        array, fps = _decode_sfx(path)
+    return AudioArrayClip(array, fps=fps)
+
+
+def warm_sfx_bank() -> int:
+    """Decodes every SFX file the pipeline can pick so no video pays for it mid-compose."""
+    names = set(SFX_KEYWORD_MAP.values()) | set(STINGER_MAP.values()) | set(MICRO_SFX_POOL)
+    decoded = 0
+    for name in sorted(names):
+        path = os.path.join("sfx", name)
+        if os.path.exists(path):
+            with _SFX_BANK_LOCK:
+                _decode_sfx(path)
+            decoded += 1
+    return decoded
+
+
 def add_sfx(audio_clip, text: str):
     text_l = text.lower()
     for kw, sfx_file in SFX_KEYWORD_MAP.items():
@@ -1264,7 +1854,7 @@ def add_sfx(audio_clip, text: str):
             path = os.path.join("sfx", sfx_file)
             if os.path.exists(path):
                 try:
-                    sfx = AudioFileClip(path).volumex(0.60)
+                    sfx = load_sfx(path).volumex(0.60)
                     return CompositeAudioClip(
                         [audio_clip, sfx.subclip(0, min(sfx.duration, audio_clip.duration))]
                     )
@@ -1280,7 +1870,7 @@ def add_stinger_sfx(audio_clip, text: str):
             if os.path.exists(path):
                 print(f"🔊 SUCCESS: Applied SFX -> {path}")
                 try:
-                    stinger = (AudioFileClip(path)
+                    stinger = (load_sfx(path)
                                .volumex(0.85)
                                .set_start(min(0.3, max(0.0, audio_clip.duration - 0.6))))
                     return CompositeAudioClip([audio_clip, stinger])
@@ -1291,6 +1881,7 @@ def add_stinger_sfx(audio_clip, text: str):
 # ═══════════════════════════════════════════════════════════
 #  NETFLIX KARAOKE SUBTITLE SYSTEM (KINETIC OPTICAL GLOW)
 # ═══════════════════════════════════════════════════════════
+@functools.lru_cache(maxsize=32)
 def get_subtitle_font(size: int = 60):
     candidates = [
         "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
@@ -1406,14 +1997,27 @@ def _pil_rgba_to_moviepy(pil_image: PIL.Image.Image, duration: float):
     return clip.set_mask(mask)
 
 
-def add_dynamic_subtitles(video_clip, audio_path: str):
-    print("📝 Generating karaoke subtitles...")
+_WHISPER_LOCK  = threading.Lock()
+_WHISPER_MODEL = None
+
+
+def get_whisper_model():
+    """Whisper alignment model, loaded once per process."""
+    global _WHISPER_MODEL
+    with _MODEL_LOCK:
+        if _WHISPER_MODEL is None:
+            _WHISPER_MODEL = WhisperModel("tiny", device="cpu", compute_type="int8")
+        return _WHISPER_MODEL
 
-    try:
-        model = WhisperModel("tiny", device="cpu", compute_type="int8")
-        segments, _ = model.transcribe(audio_path, word_timestamps=True)
 
-        all_words = []
+def transcribe_words(audio_path: str) -> list[dict]:
+    """Word-level timestamps for the voice track (upper-cased words with start/end)."""
+    print("👂 Aligning words with Whisper...")
+    model = get_whisper_model()
+
+    all_words = []
+    with _WHISPER_LOCK:
+        segments, _ = model.transcribe(audio_path, word_timestamps=True)
         for seg in segments:
             if seg.words:
                 for word in seg.words:
@@ -1424,6 +2028,14 @@ def add_dynamic_subtitles(video_clip, audio_path: str):
                             "start": word.start,
                             "end": word.end,
                         })
+    return all_words
+
+
+def add_dynamic_subtitles(video_clip, audio_path: str, words: list[dict] | None = None):
+    print("📝 Generating karaoke subtitles...")
+
+    try:
+        all_words = words if words is not None else transcribe_words(audio_path)
 
         if not all_words:
             return video_clip
@@ -1451,6 +2063,11 @@ def add_dynamic_subtitles(video_clip, audio_path: str):
             for active_idx, word_info in enumerate(phrase_words):
                 dur = max(word_info["end"] - word_info["start"], 0.05)
                 pil_frame = make_karaoke_frame(phrase_words, active_idx, VIDEO_WIDTH)
+                if video_clip.w != VIDEO_WIDTH:
+                    # Laid out at full size; scaled once per word, not per output frame.
+                    pil_frame = pil_frame.resize(
+                        (video_clip.w, round(pil_frame.height * video_clip.w / VIDEO_WIDTH)),
+                        PIL.Image.LANCZOS)
                 word_clip = (
                     _pil_rgba_to_moviepy(pil_frame, dur)
                     .set_start(word_info["start"])
@@ -1465,34 +2082,29 @@ def add_dynamic_subtitles(video_clip, audio_path: str):
     except Exception as e:
         print(f"⚠️  Karaoke subtitles failed ({e}) — using basic fallback...")
         try:
-            model = WhisperModel("tiny", device="cpu", compute_type="int8")
-            segments, _ = model.transcribe(audio_path, word_timestamps=True)
+            if words is None:
+                words = transcribe_words(audio_path)
             sub_clips = []
-            for seg in segments:
-                if seg.words:
-                    for word in seg.words:
-                        clean = word.word.strip().upper()
-                        if not clean:
-                            continue
-                        try:
-                            tc = (
-                                TextClip(
-                                    clean,
-                                    fontsize=70,
-                                    color="yellow",
-                                    stroke_color="black",
-                                    stroke_width=4,
-                                    font="Impact",
-                                    method="caption",
-                                    size=(video_clip.w * 0.9, None),
-                                )
-                                .set_start(word.start)
-                                .set_end(word.end)
-                                .set_position(("center", video_clip.h * 0.70))
-                            )
-                            sub_clips.append(tc)
-                        except Exception:
-                            pass
+            for word in words:
+                try:
+                    tc = (
+                        TextClip(
+                            word["word"],
+                            fontsize=round(70 * video_clip.w / VIDEO_WIDTH),
+                            color="yellow",
+                            stroke_color="black",
+                            stroke_width=4,
+                            font="Impact",
+                            method="caption",
+                            size=(video_clip.w * 0.9, None),
+                        )
+                        .set_start(word["start"])
+                        .set_end(word["end"])
+                        .set_position(("center", video_clip.h * 0.70))
+                    )
+                    sub_clips.append(tc)
+                except Exception:
+                    pass
             return CompositeVideoClip([video_clip] + sub_clips) if sub_clips else video_clip
         except Exception:
             return video_clip
@@ -1594,15 +2206,17 @@ def upload_to_youtube(
 # ═══════════════════════════════════════════════════════════
 #  THE MARKETER
 # ═══════════════════════════════════════════════════════════
-def generate_youtube_metadata(
-    script_text: str,
-    sota_models: list[str],
-    case_name: str = ""
-) -> dict:
-    sys = "You are an elite YouTube Shorts SEO Strategist. Output ONLY the exact data requested."
+SEO_SYSTEM = "You are an elite YouTube Shorts SEO Strategist. Output ONLY the exact data requested."
+
+FALLBACK_TAGS = [
+    "mystery", "shorts", "creepy", "unsolved", "truecrime",
+    "coldcase", "horror", "scary", "paranormal", "history"
+]
+
 
+def _request_title_candidates(script_text: str, sota_models: list[str]) -> list[str]:
     title_pack = ask_llm(
-        sys,
+        SEO_SYSTEM,
         f"""Write EXACTLY 3 different YouTube Shorts title candidates.
 Rules:
 - Each title must be under 50 characters.
@@ -1614,13 +2228,14 @@ Rules:
 - Separate the 3 titles with || only.
 Script: {script_text}""",
         sota_models,
+        use_cache=False,
     )
+    return [t.strip().strip('"').strip("'") for t in title_pack.split("||")] if title_pack else []
 
-    candidates = [t.strip().strip('"').strip("'") for t in title_pack.split("||")] if title_pack else []
-    title = _pick_best_title(candidates, case_name=case_name) or "They found WHAT?"
 
-    description = ask_llm(
-        sys,
+def _request_description(title: str, sota_models: list[str]) -> str:
+    return ask_llm(
+        SEO_SYSTEM,
         f"""Write a 3-sentence YouTube Shorts description for title: '{title}'.
 Requirements:
 1. First sentence should deepen intrigue without giving away the answer.
@@ -1628,28 +2243,22 @@ Requirements:
 3. Final sentence MUST be a provocative question.
 No hashtags.""",
         sota_models,
+        use_cache=False,
     ) or "An unsolved mystery that will leave you speechless."
 
+
+def _request_tags(title: str, sota_models: list[str]) -> list[str]:
     tags_raw = ask_llm(
-        sys,
+        SEO_SYSTEM,
         f"Title: '{title}'. Give exactly 10 highly-searched SEO tags, comma-separated. No hashtags.",
         sota_models,
     )
-    tags = (
+    return (
         [t.strip().replace("#", "") for t in tags_raw.split(",") if t.strip()]
         if tags_raw
-        else [
-            "mystery", "shorts", "creepy", "unsolved", "truecrime",
-            "coldcase", "horror", "scary", "paranormal", "history"
-        ]
+        else list(FALLBACK_TAGS)
     )
 
-    return {
-        "title": f"{title} #shorts #mystery",
-        "description": description,
-        "tags": tags,
-    }
-
 
 def generate_platform_captions(
     yt_metadata: dict,
@@ -1674,31 +2283,142 @@ REQUIREMENTS:
 2. Open with a "What would you do if…" question.
 3. Exactly 3 hashtags."""
 
-    return (ask_llm(f"You are an elite {platform} Social Media Manager.", p, sota_models)
+    return (ask_llm(f"You are an elite {platform} Social Media Manager.", p, sota_models, use_cache=False)
             or f"{yt_metadata['title']}\n\nWhat do you think happened? 👇\n\n#Mystery")
 
 
-# ═══════════════════════════════════════════════════════════
-#  MASTER ORCHESTRATION
-# ═══════════════════════════════════════════════════════════
-def main_pipeline() -> tuple:
-    anti_ban_sleep()
+# ─────────────────────────────────────────────────────────
+#  SINGLE-CALL METADATA BUNDLE
+# ─────────────────────────────────────────────────────────
+MARKETING_BUNDLE_SCHEMA = {
+    "type": "object",
+    "required": ["titles"],
+    "properties": {"titles": {"type": "array"}},
+}
 
-    try:
-        voice_engine = VoiceEngine()
-    except Exception as e:
-        print(f"❌ VoiceEngine init failed: {e}")
-        return None, None, None, None, None
 
-    sota_models = get_top_free_openrouter_models()
+def _validate_marketing_bundle(bundle: dict) -> dict:
+    """Returns the fields that passed validation, cleaned."""
+    valid = {}
+
+    titles = bundle.get("titles")
+    if isinstance(titles, list):
+        titles = [_clean_text_snippet(str(t)).strip('"').strip("'") for t in titles]
+        titles = [t for t in titles if 8 <= len(t) <= 60]
+        if len(titles) >= 2:
+            valid["titles"] = titles
+
+    desc = _clean_text_snippet(str(bundle.get("description") or ""))
+    if 40 <= len(desc) <= 1000 and "#" not in desc:
+        valid["description"] = desc
 
-    fmt = random.choices(VIDEO_FORMATS, weights=[20, 60, 20], k=1)[0]
-    print(f"📐 Format: {fmt['description']}")
+    tags = bundle.get("tags")
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    if isinstance(tags, list):
+        tags = [str(t).strip().replace("#", "") for t in tags if str(t).strip()]
+        if 5 <= len(tags) <= 20:
+            valid["tags"] = tags
 
-    script = generate_viral_script(sota_models)
-    if not script:
-        return None, None, None, None, None
+    for field in ("facebook_caption", "instagram_caption"):
+        cap = str(bundle.get(field) or "").strip()
+        if 20 <= len(cap) <= 2200 and "#" in cap:
+            valid[field] = cap
 
+    return valid
+
+
+def generate_marketing_bundle(
+    script_text: str,
+    sota_models: list[str],
+    case_name: str = ""
+) -> dict:
+    template = """{
+  "titles": ["title one", "title two", "title three", "title four", "title five"],
+  "description": "Three sentences. The last one is a provocative question.",
+  "tags": ["tag1", "tag2", "tag3", "tag4", "tag5", "tag6", "tag7", "tag8", "tag9", "tag10"],
+  "facebook_caption": "What would you do if... (conversational, exactly 3 hashtags)",
+  "instagram_caption": "Scroll-stopping hook... (debate CTA, exactly 6 hashtags)"
+}"""
+    raw = ask_llm(
+        SEO_SYSTEM,
+        f"""Produce the complete publishing package for this YouTube Short in ONE JSON object.
+
+SCRIPT: {script_text}
+
+FIELD RULES:
+- titles: EXACTLY 5 different title candidates, each under 50 characters, each a curiosity gap.
+  Do NOT reveal the twist, ending, or full case name. Vary from safest to most emotionally charged.
+- description: 3 sentences. First deepens intrigue without the answer, second reinforces the
+  investigative / documentary tone, final one MUST be a provocative question. No hashtags.
+- tags: exactly 10 highly-searched SEO tags. No hashtags.
+- facebook_caption: conversational, slightly unnerving Facebook Reels caption. Open with a
+  "What would you do if…" question. Exactly 3 hashtags.
+- instagram_caption: viral Instagram Reels caption. First line is an aggressive scroll-stopping
+  hook, tease the scariest detail without summarising, end with a debate-driving CTA.
+  Exactly 6 trending true-crime/mystery hashtags.
+
+Return ONLY valid JSON exactly matching this format:
+{template}""",
+        sota_models,
+        use_cache=False,
+        stream_check=_json_answer_viable(MARKETING_BUNDLE_SCHEMA),
+    )
+
+    parsed = salvage_json(raw)
+    bundle = _validate_marketing_bundle(parsed if isinstance(parsed, dict) else {})
+    missing = [f for f in ("titles", "description", "tags", "facebook_caption", "instagram_caption")
+               if f not in bundle]
+    if missing:
+        print(f"🩹 Metadata bundle: re-requesting {missing}")
+    else:
+        print("✅ Metadata bundle: all fields valid in one call")
+
+    # Titles are always ranked locally, never trusted in model order.
+    candidates = bundle.get("titles") or _request_title_candidates(script_text, sota_models)
+    title = _pick_best_title(candidates, case_name=case_name) or "They found WHAT?"
+
+    yt_metadata = {
+        "title": f"{title} #shorts #mystery",
+        "description": bundle.get("description") or _request_description(title, sota_models),
+        "tags": bundle.get("tags") or _request_tags(title, sota_models),
+    }
+    return {
+        "youtube":   yt_metadata,
+        "facebook":  bundle.get("facebook_caption")
+                     or generate_platform_captions(yt_metadata, "Facebook", sota_models),
+        "instagram": bundle.get("instagram_caption")
+                     or generate_platform_captions(yt_metadata, "Instagram", sota_models),
+    }
+
+
+def build_marketing_package(
+    script_text: str,
+    sota_models: list[str],
+    case_name: str = ""
+) -> dict:
+    print("📣 Marketing: writing metadata and captions in the background...")
+    return generate_marketing_bundle(script_text, sota_models, case_name=case_name)
+
+
+# ═══════════════════════════════════════════════════════════
+#  MASTER ORCHESTRATION
+# ═══════════════════════════════════════════════════════════
+SHOT_PREP_WORKERS = 3            # concurrent shot downloads / generations
+FLASH_COUNT       = 2            # stock texture flashes fetched per video
+FLASH_DUR         = 0.5
+FLASH_SOURCE_SECS = 2.0          # decoded per flash; each cut shows a FLASH_DUR slice of it
+# The ring is raw rgb24 on disk (memmapped): ~2.8 MB per 720x1280 frame, so 12 s at 24 fps is
+# ~800 MB per run workspace, shared by render workers through the page cache.
+ATMOSPHERE_RING_SECS = 12.0      # atmosphere frames kept; the overlay loops over them
+ATMOSPHERE_SEAM_SECS = 1.0       # extra frames decoded and crossfaded into the ring's start
+ATMOSPHERE_OPACITY   = 0.22
+COMPOSE_INPUTS    = ("voice", "audio_mix", "shot_images", "depth", "atmosphere",
+                     "flash", "pause_bait", "subtitles", "music")
+
+
+def prepare_script(script: dict, fmt: dict) -> tuple[dict, str]:
+    """Applies the format limits and splits long lines. Returns (script, full script text)."""
     if len(script.get("lines", [])) > fmt["max_lines"]:
         script["lines"] = script["lines"][:fmt["max_lines"]]
 
@@ -1706,10 +2426,6 @@ def main_pipeline() -> tuple:
     script["format_description"] = fmt["description"]
     script["retention_profile"] = script.get("retention_profile", {})
 
-    era       = script.get("era", "unknown")
-    case_name = script.get("case_name", "Unknown Case")
-    base_voice = script.get("recommended_voice_model", "Charon")
-
     # ══ PHASE 1.5: DYNAMIC SCRIPT SPLITTING (PACING FIX) ══
     print("✂️  Dynamically splitting script to ensure fast camera cuts...")
     expanded_lines = []
@@ -1727,13 +2443,20 @@ def main_pipeline() -> tuple:
         else:
             expanded_lines.append(line)
     script["lines"] = expanded_lines
+    full_script_txt = "".join(l.get("clean_text", "") + " " for l in script["lines"])
+    return script, full_script_txt
 
+
+def synthesize_voice_lines(voice_engine, script: dict, workdir: str = ".") -> dict:
+    """TTS for every line. Returns the voiced wav files, their script line indices, stingers and tape-stop times."""
     # ══ PHASE 2: MULTI-VOICE AUDIO ASSEMBLY ══
-    audio_clips     = []
-    stinger_clips   = []
+    base_voice      = script.get("recommended_voice_model", "Charon")
+    wavs            = []
+    durations       = []
+    line_indices    = []
+    stingers        = []
     tape_stop_times = []
     current_time    = 0.0
-    full_script_txt = ""
 
     for i, line in enumerate(script["lines"]):
         clean_text  = line.get("clean_text",  "")
@@ -1746,53 +2469,61 @@ def main_pipeline() -> tuple:
 
         voice_name  = VOICE_MAP.get(speaker, base_voice)
 
-        full_script_txt += clean_text + " "
-
-        wav = voice_engine.generate_acting_line(acting_text, clean_text, style, i, voice_name)
+        wav = voice_engine.generate_acting_line(acting_text, clean_text, style, i, voice_name, out_dir=workdir)
         if wav:
             try:
                 clip = AudioFileClip(wav)
                 
                 # SAFETY CHECK: Prevent empty/corrupt audio clips from breaking math
                 if clip.duration > 0.1:
-                    clip = add_sfx(clip, clean_text)
-                    
                     text_l = clean_text.lower()
                     for kw, sfx_file in STINGER_MAP.items():
                         if kw in text_l:
                             path = os.path.join("sfx", sfx_file)
                             if os.path.exists(path):
-                                try:
-                                    stinger_start = current_time + min(0.3, max(0.0, clip.duration - 0.6))
-                                    stinger = (AudioFileClip(path)
-                                               .volumex(0.38)
-                                               .set_start(stinger_start))
-                                    stinger_clips.append(stinger)
-                                except Exception: pass
+                                stinger_start = current_time + min(0.3, max(0.0, clip.duration - 0.6))
+                                stingers.append([path, stinger_start])
                             break 
 
-                    audio_clips.append(clip)
+                    wavs.append(wav)
+                    durations.append(clip.duration)
+                    line_indices.append(i)
                     current_time += clip.duration
                 else:
                     print(f"⚠️  Skipping audio {i}: Clip duration too short ({clip.duration}s)")
+                clip.close()
             except Exception as e:
                 print(f"⚠️  Failed to load audio clip {i}: {e}")
 
-    if not audio_clips:
-        print("❌ All audio generation failed. Aborting to prevent dead air.")
-        return None, None, None, None, None
+    if not wavs:
+        raise RuntimeError("all audio generation failed — aborting to prevent dead air")
 
-    # ══ PHASE 3: VISUAL PIPELINE (DYNAMIC BEAT-MATCHED PACING) ══
-    required_images = len(audio_clips)
-    visual_dirs     = generate_cinematographer_prompts(
-        full_script_txt, required_images, sota_models, era=era
-    )
-    first_image_path = "temp_img_0.jpg"
+    return {
+        "wavs":       wavs,
+        "durations":  durations,
+        "lines":      line_indices,
+        "stingers":   stingers,
+        "tape_stops": tape_stop_times,
+    }
+
+
+def mix_voice_track(voice: dict, script: dict, path: str = "temp_master_voice.wav") -> dict:
+    """Mixes the voiced lines with line SFX, stingers and micro-foley into one track. Returns its path and cut times."""
+    audio_clips = []
+    for wav, line_idx in zip(voice["wavs"], voice["lines"]):
+        clean_text = script["lines"][line_idx].get("clean_text", "")
+        audio_clips.append(add_sfx(AudioFileClip(wav), clean_text))
+
+    stinger_clips = []
+    for sfx_path, start in voice["stingers"]:
+        try:
+            stinger_clips.append(load_sfx(sfx_path).volumex(0.38).set_start(start))
+        except Exception: pass
 
     cut_times = []
     acc_time = 0.0
-    for i in range(len(audio_clips) - 1):
-        acc_time += audio_clips[i].duration
+    for dur in voice["durations"][:-1]:
+        acc_time += dur
         cut_times.append(acc_time)
 
     # 🔊 GENERATE MICRO-FOLEY TRANSITIONS (UPGRADE 8)
@@ -1800,11 +2531,11 @@ def main_pipeline() -> tuple:
     for ct in cut_times:
         if random.random() > 0.3: # 70% chance to play a transition sound
             sfx_file = random.choice(MICRO_SFX_POOL)
-            path = os.path.join("sfx", sfx_file)
-            if os.path.exists(path):
+            sfx_path = os.path.join("sfx", sfx_file)
+            if os.path.exists(sfx_path):
                 try:
                     # Place slightly before the cut to lead into the visual change
-                    t_clip = AudioFileClip(path).volumex(0.4).set_start(max(0, ct - 0.15))
+                    t_clip = load_sfx(sfx_path).volumex(0.4).set_start(max(0, ct - 0.15))
                     transition_sfx_clips.append(t_clip)
                 except Exception: pass
 
@@ -1815,215 +2546,901 @@ def main_pipeline() -> tuple:
     if all_sfx_overlays:
         master_voice = CompositeAudioClip([master_voice] + all_sfx_overlays)
 
-    # Fetch 2 stock transition flashes
+    master_voice.write_audiofile(path, fps=44100, logger=None)
+    return {"path": path, "cut_times": cut_times, "duration": master_voice.duration}
+
+
+def fetch_flash_pool(count: int = FLASH_COUNT, workdir: str = ".") -> list[str]:
+    """Fetches texture flashes and decodes each once into output-sized frames (see frame_bank.py)."""
     flash_pool = []
-    for i in range(2):
-        fname = f"temp_flash_{i}.mp4"
-        if fetch_texture_flash_video(i, fname):
-            flash_pool.append(fname)
+    for i in range(count):
+        fname = os.path.join(workdir, f"temp_flash_{i}.mp4")
+        if not fetch_texture_flash_video(i, fname):
+            continue
+        frames_path = os.path.join(workdir, f"temp_flash_{i}{FRAME_EXT}")
+        try:
+            decode_frames(fname, frames_path, VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS, max_secs=FLASH_SOURCE_SECS)
+            flash_pool.append(frames_path)
+        except Exception as e:
+            print(f"⚠️ Flash {i} decode error: {e}")
+        finally:
+            os.remove(fname)
+    return flash_pool
+
+
+def build_flash_clip(frames, start_frame: int, ramp):
+    """A FLASH_DUR slice of a decoded flash, faded from and to black by a precomputed ramp."""
+    count = len(ramp)
+
+    def make_frame(t):
+        i = min(int(t * VIDEO_FPS + 1e-6), count - 1)
+        frame = frames[(start_frame + i) % len(frames)]
+        return frame if ramp[i] >= 1.0 else (frame * ramp[i]).astype(np.uint8)
+
+    return VideoClip(make_frame=make_frame, duration=count / VIDEO_FPS)
 
+
+def fetch_pause_bait(case_name: str, filename: str = "temp_pause_bait.jpg") -> str | None:
     # 📌 GENERATE PAUSE-BAIT MICRO-CLUE IMAGE
-    pause_bait_file = "temp_pause_bait.jpg"
     pause_bait_prompt = (
         f"Top-down macro extreme close up of classified police document regarding {case_name}, "
         "dense tiny handwritten redacted text, official rubber stamps, yellowed paper, high details"
     )
-    has_pause_bait = fetch_cloudflare_image(pause_bait_prompt, pause_bait_file)
+    return filename if fetch_cloudflare_image(pause_bait_prompt, filename) else None
+
+
+def prepare_shot_images(visual_dirs: list[dict], workdir: str = ".") -> list[str | None]:
+    """Downloads/generates every shot concurrently. Index i is the shot for script line i."""
+    with cf.ThreadPoolExecutor(max_workers=SHOT_PREP_WORKERS, thread_name_prefix="shot") as pool:
+        futures = [
+            pool.submit(prepare_shot_image, v.get("asset_type", "ai"),
+                        v.get("search_query", ""), v.get("ai_prompt", ""), i, workdir)
+            for i, v in enumerate(visual_dirs)
+        ]
+        return [f.result() for f in futures]
+
+
+def estimate_shot_depths(shot_paths: list[str | None]) -> list[str | None]:
+    """Depth maps for the prepared shots, using the shared estimator."""
+    try:
+        get_depth_estimator()
+    except Exception as e:
+        print(f"⚠️  Depth model unavailable ({e}) — shots fall back to zoom.")
+        return [None] * len(shot_paths)
+    return [generate_depth_map(p) if p and not shot_is_static(p) else None for p in shot_paths]
+
+
+def timeline_of(r: dict, seed: str, profile: str = RENDER_PROFILE) -> dict:
+    """The JSON-serializable inputs compose_video needs; any process can rebuild the same timeline from it."""
+    timeline = {k: r[k] for k in COMPOSE_INPUTS}
+    parallax = ENCODE_PROFILES[profile].get("parallax", True)
+    if timeline["depth"] is None or not parallax:
+        timeline["depth"] = [None] * len(timeline["shot_images"])
+    timeline["cheap_motion"] = not parallax     # preview: a sliced pan instead of parallax or zoom
+    timeline["seed"] = seed
+    timeline["fps"]  = ENCODE_PROFILES[profile]["fps"]
+    # Frames are composed at the size the profile encodes, not built full size and scaled by ffmpeg.
+    timeline["size"] = list(ENCODE_PROFILES[profile].get("size") or (VIDEO_WIDTH, VIDEO_HEIGHT))
+    # Layers are only worth building when the story will be rendered again (see layer_cache.py).
+    timeline["layer_cache"] = LAYER_CACHE_ENABLED or ENCODE_PROFILES[profile].get("layer_cache", False)
+    return timeline
+
+
+def frame_size(r: dict) -> tuple[int, int]:
+    return tuple(r.get("size") or (VIDEO_WIDTH, VIDEO_HEIGHT))
+
+
+def frames_at(path: str, size: tuple[int, int]) -> np.memmap:
+    """A frame ring decoded at full size (flash, atmosphere), opened at `size`.
+
+    Smaller sizes are rescaled once into a sibling file; stage checkpoints keep
+    pointing at the full-size ring, so a later full render still finds it.
+    """
+    width, height = size
+    if (width, height) != (VIDEO_WIDTH, VIDEO_HEIGHT):
+        scaled = f"{os.path.splitext(path)[0]}.{width}x{height}{FRAME_EXT}"
+        if not os.path.exists(scaled):
+            staged = f"{scaled}.{os.getpid()}.tmp"
+            decode_frames(path, staged, width, height, VIDEO_FPS, src_size=(VIDEO_WIDTH, VIDEO_HEIGHT))
+            os.replace(staged, scaled)
+        path = scaled
+    return open_frames(path, width, height)
+
+
+def build_base_layer(r: dict, duration: float):
+    """The graded shot track — the expensive, rarely-changing layer (the atmosphere goes on top)."""
+    # ══ PHASE 3: VISUAL PIPELINE (DYNAMIC BEAT-MATCHED PACING) ══
+    durations    = r["voice"]["durations"]
+    shots        = r["shot_images"]
+    depths       = r["depth"]
+    size         = frame_size(r)
+    num_shots    = len(durations)
 
     visual_clips = []
-    num_shots = len(visual_dirs)
+    for n, line_idx in enumerate(r["voice"]["lines"]):
+        base_dur = durations[n]
+        clip_dur = base_dur + CROSSFADE_DUR if n < num_shots - 1 else base_dur
+        
+        if n == num_shots - 1:
+            accumulated_visual_dur = sum(durations[:n])
+            clip_dur = max(clip_dur, duration - accumulated_visual_dur)
 
-    for i, v in enumerate(visual_dirs):
-        if i < len(audio_clips):
-            base_dur = audio_clips[i].duration
+        if r.get("cheap_motion") and not shot_is_static(shots[line_idx]):
+            visual_clips.append(build_pan_clip(shots[line_idx], clip_dur, line_idx, size))
         else:
-            base_dur = master_voice.duration / num_shots
-        
-        clip_dur = base_dur + CROSSFADE_DUR if i < num_shots - 1 else base_dur
-        
-        if i == num_shots - 1:
-            accumulated_visual_dur = sum(c.duration for c in audio_clips[:i])
-            clip_dur = max(clip_dur, master_voice.duration - accumulated_visual_dur)
-
-        clip = get_image_clip(
-            v.get("asset_type", "ai"),
-            v.get("search_query", ""),
-            v.get("ai_prompt", ""),
-            clip_dur,
-            i
+            visual_clips.append(build_shot_clip(shots[line_idx], depths[line_idx], clip_dur, line_idx, size))
+
+    base = (
+        concatenate_videoclips(
+            visual_clips, method="compose", padding=-CROSSFADE_DUR
         )
-        visual_clips.append(clip)
+        .set_duration(duration)
+        .fx(colorx, 0.85) 
+    )
+    return base
 
+
+def apply_atmosphere(video, r: dict):
+    """Blends the looping atmosphere ring over the base layer.
+
+    It is a layer of its own, read straight from its frame ring, so the cached base
+    layer under it keeps its static stretches (see static_spans).
+    """
+    if not r["atmosphere"]:
+        return video
     try:
-        final_video = (
-            concatenate_videoclips(
-                visual_clips, method="compose", padding=-CROSSFADE_DUR
-            )
-            .set_duration(master_voice.duration)
-            .fx(colorx, 0.85) 
+        atm = frames_at(r["atmosphere"], frame_size(r))
+        return video.fl(
+            lambda gf, t: blend_premultiplied(gf(t), atm[int(t * VIDEO_FPS + 1e-6) % len(atm)],
+                                              ATMOSPHERE_OPACITY)
         )
+    except Exception as e:
+        print(f"⚠️  Atmospheric overlay: {e}")
+        return video
 
-        if fetch_atmospheric_b_roll(master_voice.duration):
-            try:
-                atm = (VideoFileClip("temp_atmosphere.mp4").without_audio()
-                       .fx(loop, duration=master_voice.duration)
-                       .resize(height=VIDEO_HEIGHT))
-                if atm.w < VIDEO_WIDTH:
-                    atm = atm.resize(width=VIDEO_WIDTH)
-                atm = (atm
-                       .crop(x_center=atm.w/2, y_center=atm.h/2,
-                             width=VIDEO_WIDTH, height=VIDEO_HEIGHT)
-                       .set_opacity(0.22))
-                final_video = CompositeVideoClip([final_video, atm])
-            except Exception as e:
-                print(f"⚠️  Atmospheric overlay: {e}")
 
-        flash_clips = []
-        if flash_pool:
-            FLASH_DUR = 0.5
-            for ct in cut_times:
-                src = random.choice(flash_pool)
-                try:
-                    src_clip = VideoFileClip(src).without_audio()
-                    if src_clip.duration > FLASH_DUR + 0.2:
-                        start_t = random.uniform(0, src_clip.duration - FLASH_DUR)
-                        f_clip = src_clip.subclip(start_t, start_t + FLASH_DUR)
-                    else:
-                        f_clip = src_clip.fx(loop, duration=FLASH_DUR).subclip(0, FLASH_DUR)
-                    
-                    if f_clip.h != VIDEO_HEIGHT or f_clip.w != VIDEO_WIDTH:
-                        f_clip = f_clip.resize(height=VIDEO_HEIGHT)
-                        if f_clip.w < VIDEO_WIDTH:
-                            f_clip = f_clip.resize(width=VIDEO_WIDTH)
-                        f_clip = f_clip.crop(
-                            x_center=f_clip.w/2, y_center=f_clip.h/2,
-                            width=VIDEO_WIDTH, height=VIDEO_HEIGHT
-                        )
-                    
-                    f_clip = (f_clip
-                              .set_start(max(0, ct - FLASH_DUR/2))
-                              .set_duration(FLASH_DUR)
-                              .fx(fadein, 0.05).fx(fadeout, 0.05))
-                    
-                    flash_clips.append(f_clip)
-                except Exception as e:
-                    print(f"⚠️ Flash processing error: {e}")
-        
-        if flash_clips:
-            final_video = CompositeVideoClip([final_video] + flash_clips)
+def build_overlay_clips(r: dict) -> list:
+    """Texture flashes at the cuts and the pause-bait: opaque full-frame clips, each with its start set."""
+    rng       = random.Random(r.get("seed"))
+    cut_times = r["audio_mix"]["cut_times"]
 
-        # 📌 INJECT 0.35s PAUSE-BAIT MICRO-CLUE
-        if has_pause_bait and os.path.exists(pause_bait_file) and cut_times:
-            try:
-                # Target the middle cut time for maximum curiosity impact
-                target_cut = cut_times[len(cut_times) // 2]
-                pb_clip = (ImageClip(pause_bait_file)
-                           .resize(height=VIDEO_HEIGHT))
-                if pb_clip.w < VIDEO_WIDTH:
-                    pb_clip = pb_clip.resize(width=VIDEO_WIDTH)
-                pb_clip = (pb_clip.crop(x_center=pb_clip.w/2, y_center=pb_clip.h/2,
-                                       width=VIDEO_WIDTH, height=VIDEO_HEIGHT)
-                           .set_start(target_cut)
-                           .set_duration(0.35))
-                final_video = CompositeVideoClip([final_video, pb_clip])
-                print("🎯 Pause-Bait micro-clue injected successfully!")
-            except Exception as e:
-                print(f"⚠️ Pause-bait injection error: {e}")
+    overlays   = []
+    flash_pool = []
+    for path in r["flash"] or []:
+        try:
+            flash_pool.append(frames_at(path, frame_size(r)))
+        except Exception as e:
+            print(f"⚠️ Flash processing error: {e}")
+    if flash_pool:
+        flash_frames = frame_count(FLASH_DUR, VIDEO_FPS)
+        ramp = fade_ramp(flash_frames, VIDEO_FPS, 0.05, 0.05)
+        for ct in cut_times:
+            frames = rng.choice(flash_pool)
+            start  = rng.randrange(max(1, len(frames) - flash_frames + 1))
+            overlays.append(build_flash_clip(frames, start, ramp).set_start(max(0, ct - FLASH_DUR/2)))
+
+    # 📌 INJECT 0.35s PAUSE-BAIT MICRO-CLUE
+    pause_bait_file = r["pause_bait"]
+    if pause_bait_file and os.path.exists(pause_bait_file) and cut_times:
+        try:
+            # Target the middle cut time for maximum curiosity impact
+            target_cut = cut_times[len(cut_times) // 2]
+            width, height = frame_size(r)
+            pb_clip = (ImageClip(pause_bait_file)
+                       .resize(height=height))
+            if pb_clip.w < width:
+                pb_clip = pb_clip.resize(width=width)
+            pb_clip = (pb_clip.crop(x_center=pb_clip.w/2, y_center=pb_clip.h/2,
+                                   width=width, height=height)
+                       .set_start(target_cut)
+                       .set_duration(0.35))
+            overlays.append(pb_clip)
+            print("🎯 Pause-Bait micro-clue injected successfully!")
+        except Exception as e:
+            print(f"⚠️ Pause-bait injection error: {e}")
+    return overlays
 
-        final_video = final_video.set_audio(master_voice)
 
-    except Exception as e:
-        print(f"❌ Video assembly failed: {e}")
-        return None, None, None, None, None
+def overlay_intervals(overlays: list, duration: float, fps: float) -> list[tuple[float, float]]:
+    """Merged [start, end) spans covered by overlays, snapped to the frames a render samples in them."""
+    spans = []
+    for clip in sorted(overlays, key=lambda c: c.start):
+        a = math.ceil(clip.start * fps - 1e-6) / fps
+        b = math.ceil(min(clip.end, duration) * fps - 1e-6) / fps
+        if b <= a:
+            continue
+        if spans and a <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], b))
+        else:
+            spans.append((a, b))
+    return spans
 
-    temp_voice_track = "temp_master_voice.wav"
-    master_voice.write_audiofile(temp_voice_track, fps=24000, logger=None)
-    final_video = add_dynamic_subtitles(final_video, temp_voice_track)
 
+def build_soundtrack(r: dict, master_voice):
+    """The mastered voice with the ducked music bed under it."""
+    if not r["music"]:
+        return master_voice
     try:
-        wm = (TextClip(CHANNEL_HANDLE, fontsize=28, color="white",
+        bg = audio_loop(
+            AudioFileClip(r["music"]),
+            duration=master_voice.duration
+        )
+        tape_stop_times = r["voice"]["tape_stops"]
+        
+        def duck_volume(t):
+            t_arr = np.asarray(t)
+            vol = np.ones_like(t_arr, dtype=float) * 0.25
+            for st in tape_stop_times:
+                mask = (t_arr >= max(0, st - 0.8)) & (t_arr <= st + 0.15)
+                vol[mask] = 0.0
+            return vol if np.ndim(t_arr) > 0 else float(vol)
+
+        bg = bg.volumex(duck_volume)
+        return CompositeAudioClip([master_voice, bg])
+    except Exception as e: 
+        print(f"⚠️  BG Music overlay failed: {e}")
+        return master_voice
+
+
+def add_top_layers(video, r: dict):
+    """Subtitles and the watermark; cheap, so they are always drawn fresh over the cached layers."""
+    video = add_dynamic_subtitles(video, r["audio_mix"]["path"], r["subtitles"])
+    scale = video.w / VIDEO_WIDTH
+    try:
+        wm = (TextClip(CHANNEL_HANDLE, fontsize=round(28 * scale), color="white",
                        font="Impact", stroke_color="black", stroke_width=1)
               .set_opacity(0.35)
-              .set_position(("center", 140))
-              .set_duration(final_video.duration))
-        final_video = CompositeVideoClip([final_video, wm])
+              .set_position(("center", round(140 * scale)))
+              .set_duration(video.duration))
+        video = CompositeVideoClip([video, wm])
     except Exception: pass
+    return video
 
-    if fetch_pixabay_audio(full_script_txt, sota_models):
-        try:
-            bg = audio_loop(
-                AudioFileClip("temp_bg_music.mp3"),
-                duration=final_video.duration
-            )
-            
-            def duck_volume(t):
-                t_arr = np.asarray(t)
-                vol = np.ones_like(t_arr, dtype=float) * 0.25
-                for st in tape_stop_times:
-                    mask = (t_arr >= max(0, st - 0.8)) & (t_arr <= st + 0.15)
-                    vol[mask] = 0.0
-                return vol if np.ndim(t_arr) > 0 else float(vol)
-
-            bg = bg.volumex(duck_volume)
-            
-            final_video = final_video.set_audio(
-                CompositeAudioClip([final_video.audio, bg])
-            )
-        except Exception as e: 
-            print(f"⚠️  BG Music overlay failed: {e}")
 
-    # ══ RENDER ══
-    output_file = "final_video.mp4"
-    try:
-        final_video.write_videofile(
-            output_file, codec="libx264", audio_codec="aac",
-            fps=24, preset="fast", threads=2, logger=None
-        )
-    except Exception as e:
-        print(f"❌ Render failed: {e}")
-        return None, None, None, None, None
+def base_layer_key(r: dict) -> str:
+    return layer_key("base", {
+        "lines": r["voice"]["lines"], "durations": r["voice"]["durations"],
+        "duration": r["audio_mix"]["duration"], "cheap_motion": r.get("cheap_motion", False),
+        "fps": r.get("fps", VIDEO_FPS), "crossfade": CROSSFADE_DUR, "pan_scale": PAN_SCALE,
+        "size": frame_size(r),
+    }, [*r["shot_images"], *r["depth"]])
 
-    thumbnail_path = None
-    if os.path.exists(first_image_path):
-        thumbnail_path = generate_thumbnail(case_name, first_image_path)
 
+def overlay_layer_key(r: dict) -> str:
+    return layer_key("overlay", {
+        "cut_times": r["audio_mix"]["cut_times"], "duration": r["audio_mix"]["duration"],
+        "seed": r.get("seed"), "flashes": len(r["flash"] or []), "flash_dur": FLASH_DUR,
+        "fps": r.get("fps", VIDEO_FPS), "size": frame_size(r),
+    }, [*(r["flash"] or []), r["pause_bait"]])
+
+
+def audio_layer_key(r: dict) -> str:
+    return layer_key("audio", {
+        "tape_stops": r["voice"]["tape_stops"], "duration": r["audio_mix"]["duration"],
+    }, [r["audio_mix"]["path"], r["music"]])
+
+
+def cached_overlay_clips(r: dict) -> list | None:
+    """The overlays as slices of their cached mezzanine, or None when that layer is not cached."""
+    key   = overlay_layer_key(r)
+    index = read_index(key)
+    if index is None:
+        return None
+    if not index["intervals"]:
+        return []
+    track = VideoFileClip(layer_path(key, ".mp4"), audio=False)
+    clips, offset = [], 0.0
+    for a, b in index["intervals"]:
+        clips.append(track.subclip(offset, offset + (b - a)).set_start(a))
+        offset += b - a
+    return clips
+
+
+def compose_video(r: dict):
+    """Assembles the final timeline from the finished stage results (see timeline_of).
+
+    Base and overlay layers come from the layer cache when a previous render left them
+    there (see layer_cache.py); otherwise they are composed from the stage results.
+    """
+    master_voice = AudioFileClip(r["audio_mix"]["path"])
+    duration     = master_voice.duration
+
+    cached = r.get("layer_cache") and lookup(base_layer_key(r), ".mp4")
+    if cached:
+        final_video = VideoFileClip(cached, audio=False).set_duration(duration)
+    else:
+        final_video = build_base_layer(r, duration)
+    final_video = apply_atmosphere(final_video, r)
+
+    overlays = cached_overlay_clips(r) if r.get("layer_cache") else None
+    if overlays is None:
+        overlays = build_overlay_clips(r)
+    if overlays:
+        final_video = CompositeVideoClip([final_video] + overlays)
+
+    final_video = final_video.set_audio(build_soundtrack(r, master_voice))
+    return add_top_layers(final_video, r)
+
+
+_RENDER_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_RENDERS)
+_VOICE_ENGINE = None
+
+
+def set_render_slots(n: int) -> None:
+    global _RENDER_SLOTS
+    _RENDER_SLOTS = threading.BoundedSemaphore(max(1, n))
+
+
+def get_voice_engine() -> VoiceEngine:
+    """One TTS engine (and Gemini client) per process; outputs go to each run's workspace."""
+    global _VOICE_ENGINE
+    with _MODEL_LOCK:
+        if _VOICE_ENGINE is None:
+            _VOICE_ENGINE = VoiceEngine()
+        return _VOICE_ENGINE
+
+
+def split_at_cuts(duration: float, cut_times, parts: int, fps: float = VIDEO_FPS) -> list[tuple[float, float]]:
+    """Up to `parts` segments of similar length, each boundary a cut snapped to the frame grid."""
+    parts = max(1, min(parts, int(duration // MIN_SEGMENT_SECS)))
+    end   = frame_count(duration, fps) / fps
+    cuts  = sorted({frame_count(t, fps) / fps for t in cut_times
+                    if MIN_SEGMENT_SECS <= t <= end - MIN_SEGMENT_SECS})
+    bounds = [0.0]
+    for k in range(1, parts):
+        best = min(cuts, key=lambda t: abs(t - end * k / parts), default=None)
+        if best is not None and best - bounds[-1] >= MIN_SEGMENT_SECS:
+            bounds.append(best)
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def static_spans(timeline: dict, duration: float, fps: float = VIDEO_FPS) -> list[tuple[float, float]]:
+    """Frame-aligned stretches of the composed timeline whose pixels never change.
+
+    Mirrors compose_video: a static shot (fallback or flat placeholder) holds still
+    between the end of its fade-in and the start of the next shot, except where a
+    layer above it changes — a subtitle word, a flash, the pause-bait. Fades are
+    not shortcut: each is a per-frame ramp, and in the final pass the watermark and
+    subtitles sit above it unfaded.
+
+    The atmosphere moves on every frame, so a composed timeline that has one has no
+    static stretches. The base layer is rendered without it (see ensure_layers); that
+    is where stills still pay off when the layer cache is on.
+    """
+    if timeline["atmosphere"]:
+        return []
+    durations = timeline["voice"]["durations"]
+    lines     = timeline["voice"]["lines"]
+    cut_times = timeline["audio_mix"]["cut_times"]
+
+    busy, changes = [], set()       # intervals where something moves, and instants where a layer switches
+    if timeline["flash"]:
+        busy += [(max(0.0, ct - FLASH_DUR/2), max(0.0, ct - FLASH_DUR/2) + FLASH_DUR) for ct in cut_times]
+    if timeline["pause_bait"] and cut_times:
+        target = cut_times[len(cut_times) // 2]
+        changes |= {target, target + 0.35}
+    for w in timeline["subtitles"] or []:
+        changes |= {w["start"], w["start"] + max(w["end"] - w["start"], 0.05)}
+
+    spans, t = [], 0.0
+    for n, line_idx in enumerate(lines):
+        last     = n == len(lines) - 1
+        clip_dur = durations[n] + CROSSFADE_DUR if not last else max(durations[n], duration - t)
+        if shot_is_static(timeline["shot_images"][line_idx]):
+            fade  = min(CROSSFADE_DUR, max(0.1, clip_dur / 3.0))
+            start = t + fade
+            end   = t + clip_dur - fade if last else t + durations[n]
+            edges = changes | {x for interval in busy for x in interval}
+            cuts  = sorted({start, end} | {c for c in edges if start < c < end})
+            for a, b in zip(cuts, cuts[1:]):
+                if any(a < be and ba < b for ba, be in busy):
+                    continue
+                fa = math.ceil(a * fps - 1e-6)
+                fb = math.floor(b * fps + 1e-6)
+                if (fb - fa) / fps >= STILL_MIN_SECS:
+                    spans.append((fa / fps, fb / fps))
+        t += durations[n]
+    return spans
+
+
+def plan_render(timeline: dict, duration: float, cut_times, workers: int,
+                fps: float = VIDEO_FPS) -> list[list[tuple]]:
+    """Segments (one per worker) of (start, end, still) pieces; still pieces skip frame generation."""
+    stills = static_spans(timeline, duration, fps)
+    plan = []
+    for seg_start, seg_end in split_at_cuts(duration, cut_times, workers, fps):
+        pieces, t = [], seg_start
+        for a, b in stills:
+            a, b = max(a, seg_start), min(b, seg_end)
+            if b - a < STILL_MIN_SECS:
+                continue
+            if a > t:
+                pieces.append((t, a, False))
+            pieces.append((a, b, True))
+            t = b
+        if t < seg_end:
+            pieces.append((t, seg_end, False))
+        plan.append(pieces)
+    return plan
+
+
+def render_pieces(clip, pieces: list[tuple], prefix: str, settings: dict, key_times) -> list[str]:
+    """Encodes each (start, end, still) piece of a silent clip to its own file."""
+    paths = []
+    for k, (start, end, still) in enumerate(pieces):
+        path = f"{prefix}.{k:02d}.mp4"
+        if still:
+            encode_still(clip.get_frame(start), end - start, path, fps=settings["fps"], profile=settings)
+        else:
+            encode_clip(clip.subclip(start, end), path, fps=settings["fps"], profile=settings,
+                        key_times=[t - start for t in key_times if start < t < end])
+        paths.append(path)
+    return paths
+
+
+def layer_clip(timeline: dict, layer: str = "final"):
+    """The silent clip a render pass encodes: the whole timeline, or just its base layer."""
+    if layer == "base":
+        return build_base_layer(timeline, AudioFileClip(timeline["audio_mix"]["path"]).duration)
+    return compose_video(timeline).without_audio()
+
+
+def render_segment(timeline: dict, pieces: list[tuple], prefix: str,
+                   settings: dict, key_times, layer: str = "final") -> list[str]:
+    """Worker-process entry point: rebuilds the timeline and encodes only this segment's pieces.
+
+    The full timeline is composed lazily, so frames near the boundary (crossfades,
+    flashes, subtitles spanning the cut) come out exactly as in a single-pass render.
+    """
+    return render_pieces(layer_clip(timeline, layer), pieces, prefix, settings, key_times)
+
+
+def render_plan(timeline: dict, plan: list[list[tuple]], prefix: str, settings: dict, key_times,
+                layer: str = "final", clip=None) -> list[str]:
+    """Encodes every segment of a plan, in worker processes when there is more than one."""
+    settings = {**settings, "threads": max(1, (os.cpu_count() or 1) // len(plan))}
+    if len(plan) == 1:
+        clip = clip if clip is not None else layer_clip(timeline, layer)
+        return render_pieces(clip, plan[0], f"{prefix}.part00", settings, key_times)
+    # spawn, not fork: the parent is multi-threaded and may hold loaded models.
+    ctx = multiprocessing.get_context("spawn")
+    with cf.ProcessPoolExecutor(max_workers=len(plan), mp_context=ctx) as pool:
+        futures = [
+            pool.submit(render_segment, timeline, pieces, f"{prefix}.part{k:02d}", settings,
+                        list(key_times), layer)
+            for k, pieces in enumerate(plan)
+        ]
+        return [p for fut in futures for p in fut.result()]
+
+
+def soundtrack_pcm(timeline: dict, final_video) -> bytes | None:
+    """The mixed soundtrack as PCM, from the layer cache when the mix inputs are unchanged."""
+    if final_video.audio is None:
+        return None
+    if not timeline.get("layer_cache"):
+        return render_pcm(final_video.audio)
+    key    = audio_layer_key(timeline)
+    cached = lookup(key, ".pcm")
+    if cached:
+        with open(cached, "rb") as f:
+            return f.read()
+    pcm    = render_pcm(final_video.audio)
+    staged = staging_path(key, ".pcm")
+    with open(staged, "wb") as f:
+        f.write(pcm)
+    commit(staged, key, ".pcm")
+    return pcm
+
+
+def ensure_layers(timeline: dict, duration: float, cut_times, workers: int, fps: float) -> None:
+    """Renders whichever cached visual layers are missing for this timeline."""
+    settings = {**MEZZANINE_PROFILE, "fps": fps}
+
+    key = base_layer_key(timeline)
+    if not lookup(key, ".mp4"):
+        print("🧱 Rendering base layer...")
+        # Nothing above the base exists in this pass (the atmosphere included), so its
+        # static stretches run longer.
+        bare   = {**timeline, "atmosphere": None, "flash": [], "pause_bait": None, "subtitles": []}
+        plan   = plan_render(bare, duration, cut_times, workers, fps)
+        staged = staging_path(key, ".mp4")
+        paths  = render_plan(bare, plan, os.path.splitext(staged)[0], settings, cut_times, layer="base")
+        concat_segments(paths, staged, None, settings)
+        for path in paths:
+            os.remove(path)
+        commit(staged, key, ".mp4")
+
+    key = overlay_layer_key(timeline)
+    if read_index(key) is None:
+        overlays  = build_overlay_clips(timeline)
+        intervals = overlay_intervals(overlays, duration, fps)
+        if intervals:
+            print(f"🧱 Rendering overlay layer ({len(intervals)} span(s))...")
+            track  = CompositeVideoClip(
+                [ColorClip(frame_size(timeline), color=(0, 0, 0), duration=duration)] + overlays
+            )
+            staged = staging_path(key, ".mp4")
+            encode_clip(concatenate_videoclips([track.subclip(a, b) for a, b in intervals]),
+                        staged, fps=fps, profile=settings)
+            commit(staged, key, ".mp4")
+        write_index(key, {"intervals": intervals})
+
+
+def encode_best_effort(encode, output_file: str, renditions: dict | None, pcm: bytes | None,
+                       fps: float, key_times) -> None:
+    """Runs encode(renditions), the master plus its renditions in one ffmpeg pass.
+
+    Renditions are extras: when that pass fails the master is encoded alone, and the
+    renditions are then written from it one by one; any that still fail are skipped.
+    """
+    if not renditions:
+        encode(None)
+        return
     try:
-        for f in (glob.glob("temp_*.wav") + glob.glob("temp_*.jpg")
-                  + glob.glob("temp_*.mp4") + glob.glob("temp_*.mp3")):
-            if f != output_file:
-                os.remove(f)
-    except Exception: pass
+        encode(renditions)
+        return
+    except EncodeError as e:
+        print(f"⚠️  Encode with renditions failed ({e}) — retrying the master alone...")
+    for path in renditions.values():
+        if os.path.exists(path):
+            os.remove(path)
+    encode(None)
+    for name, path in renditions.items():
+        try:
+            encode_renditions(output_file, {name: path}, fps, pcm, key_times)
+        except EncodeError as e:
+            print(f"⚠️  Rendition '{name}' skipped: {e}")
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def render_timeline(final_video, timeline: dict, output_file: str = "final_video.mp4",
+                    cut_times=(), profile: str = RENDER_PROFILE, workers: int = RENDER_WORKERS,
+                    renditions: dict | None = None) -> str:
+    """Renders the timeline as segments split at cuts, one worker process each, with static
+    stretches encoded from a single frame; the pieces are then stream-copied together with
+    the soundtrack muxed in once.
+
+    With the layer cache on, missing layers are rendered first and the final pass only
+    composites them with the subtitles and watermark. `renditions` (see rendition_paths)
+    are written by the same final ffmpeg run as the master, best-effort (see encode_best_effort).
+    """
+    settings = ENCODE_PROFILES[profile]
+    fps      = settings["fps"]
+    # Renders are CPU-bound; in batch mode the next video's prep keeps running while this waits.
+    with _RENDER_SLOTS:
+        if timeline.get("layer_cache"):
+            ensure_layers(timeline, final_video.duration, cut_times, workers, fps)
+            final_video = compose_video(timeline)
+
+        with cf.ThreadPoolExecutor(max_workers=1, thread_name_prefix="pcm") as audio:
+            # The soundtrack is mixed down here while the frames render.
+            pcm  = audio.submit(soundtrack_pcm, timeline, final_video)
+            plan = plan_render(timeline, final_video.duration, cut_times, workers, fps)
+            if len(plan) < 2 and len(plan[0]) < 2 and not plan[0][0][2]:
+                encode_best_effort(
+                    lambda extra: encode_clip(final_video.without_audio(), output_file, fps=fps,
+                                              profile=profile, key_times=cut_times, pcm=pcm.result(),
+                                              renditions=extra),
+                    output_file, renditions, pcm.result(), fps, cut_times)
+                return output_file
+
+            stills = sum(still for pieces in plan for *_, still in pieces)
+            print(f"🧩 Rendering {len(plan)} segment(s), {stills} still piece(s)...")
+            paths = render_plan(timeline, plan, os.path.splitext(output_file)[0], settings, cut_times,
+                                clip=final_video.without_audio())
+            encode_best_effort(
+                lambda extra: concat_segments(paths, output_file, pcm.result(), profile, extra),
+                output_file, renditions, pcm.result(), fps, cut_times)
+    for path in paths:
+        os.remove(path)
+    return output_file
+
+
+WARM_UP_HOSTS = (
+    "https://openrouter.ai/", "https://generativelanguage.googleapis.com/",
+    "https://api.pexels.com/", "https://pixabay.com/", "https://api.cloudflare.com/",
+    "https://en.wikipedia.org/", "https://archive.org/", "https://www.googleapis.com/",
+)
+
+
+def warm_up(ws: RunWorkspace) -> None:
+    """Loads models and prefetches read-only inputs while the anti-ban sleep runs.
+
+    Nothing here is externally visible: no LLM calls, no TTS, no uploads. The stock
+    prefetches and the model scout are checkpointed into the workspace under their
+    stage names, so the stage graph restores them instead of fetching again. A run
+    whose render is already checkpointed (a queued publish) never reads the stock,
+    so it is not prefetched.
+    """
+    store    = get_run_history()
+    rendered = ws.is_done("render")
+
+    def _prefetch(stage, fn):
+        if not ws.is_done(stage):
+            ws.mark_done(stage, fn())
+
+    tasks = {
+        "depth_model":   get_depth_estimator,
+        "whisper_model": get_whisper_model,
+        "voice_engine":  get_voice_engine,
+        "sfx_bank":      warm_sfx_bank,
+        "models":        lambda: _prefetch("models", get_top_free_openrouter_models),
+    }
+    if not rendered:
+        tasks["flash"]      = lambda: _prefetch("flash", lambda: fetch_flash_pool(workdir=ws.dir))
+        tasks["atmosphere"] = lambda: _prefetch("atmosphere", lambda: fetch_atmosphere(ws.dir))
+
+    def _run(name, fn):
+        started = time.time()
+        status  = "ok"
+        try:
+            fn()
+        except Exception as e:
+            status = "failed"
+            print(f"⚠️  Warm-up '{name}' failed: {e}")
+        if store:
+            store.record_stage(ws.run_id, f"warmup:{name}", started, time.time() - started, status)
+
+    print("🔥 Warming models, SFX and stock during the sleep window...")
+    started = time.time()
+    with cf.ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="warmup") as pool:
+        list(pool.map(in_run(ws.run_id, lambda kv: _run(*kv)), tasks.items()))
+    print(f"🔥 Warm-up finished in {time.time() - started:.1f}s")
+
+
+def build_stage_graph(fmt: dict, ws: RunWorkspace, profile: str = RENDER_PROFILE) -> StageGraph:
+    """The production pipeline as a dependency graph; see stage_graph.py for the scheduling rules.
+
+    Renders with a non-publishing profile (preview) go to their own file and are not checkpointed,
+    so they never stand in for the real render of a resumed run.
+    """
+    def _record_stage_timing(stage, started_at, duration, status):
+        store = get_run_history()
+        if store:
+            store.record_stage(ws.run_id, stage, started_at, duration, status)
+
+    g = StageGraph(max_workers=8, on_timing=_record_stage_timing, workspace=ws)
+
+    # Independent of everything — start immediately.
+    g.add("models",       lambda r: get_top_free_openrouter_models(), checkpoint=True)
+    g.add("voice_engine", lambda r: get_voice_engine())
+    g.add("flash",        lambda r: fetch_flash_pool(workdir=ws.dir), required=False, fallback=[],
+          checkpoint=True)
+    g.add("atmosphere",   lambda r: fetch_atmosphere(ws.dir),
+          required=False, checkpoint=True)
+
+    def _script(r):
+        script = generate_viral_script(r["models"])
+        if not script:
+            raise RuntimeError("no script produced")
+        return prepare_script(script, fmt)
+
+    g.add("script", _script, deps=("models",), checkpoint=True)
+
+    # Everything below only needs the script text.
+    g.add("marketing",
+          lambda r: build_marketing_package(r["script"][1], r["models"], r["script"][0].get("case_name", "")),
+          deps=("script", "models"), required=False, checkpoint=True)
+    g.add("visual_prompts",
+          lambda r: generate_cinematographer_prompts(
+              r["script"][1], len(r["script"][0]["lines"]), r["models"],
+              era=r["script"][0].get("era", "unknown")),
+          deps=("script", "models"), checkpoint=True)
+    g.add("pause_bait",
+          lambda r: fetch_pause_bait(r["script"][0].get("case_name", "Unknown Case"),
+                                     ws.path("temp_pause_bait.jpg")),
+          deps=("script",), required=False, checkpoint=True)
+    g.add("music",
+          lambda r: ws.path("temp_bg_music.mp3")
+          if fetch_pixabay_audio(r["script"][1], r["models"], ws.path("temp_bg_music.mp3")) else None,
+          deps=("script", "models"), required=False, checkpoint=True)
+    g.add("voice", lambda r: synthesize_voice_lines(r["voice_engine"], r["script"][0], ws.dir),
+          deps=("script", "voice_engine"), checkpoint=True)
+
+    # Shots are prepared for every line while TTS runs; compose maps them onto the voiced lines.
+    g.add("shot_images", lambda r: prepare_shot_images(r["visual_prompts"], ws.dir),
+          deps=("visual_prompts",), checkpoint=True)
+    g.add("depth", lambda r: estimate_shot_depths(r["shot_images"]), deps=("shot_images",),
+          required=False, fallback=None, checkpoint=True)
+    g.add("audio_mix", lambda r: mix_voice_track(r["voice"], r["script"][0], ws.path("temp_master_voice.wav")),
+          deps=("voice", "script"), checkpoint=True)
+    g.add("subtitles", lambda r: transcribe_words(r["audio_mix"]["path"]), deps=("audio_mix",),
+          required=False, fallback=[], checkpoint=True)
+
+    g.add("compose", lambda r: compose_video(timeline_of(r, ws.run_id, profile)), deps=COMPOSE_INPUTS)
+
+    publish = ENCODE_PROFILES[profile].get("publish", True)
+
+    def _render(r):
+        out  = ws.path("final_video.mp4" if publish else f"{profile}_video.mp4")
+        cuts = r["audio_mix"]["cut_times"]
+        # Published renders also get the Meta upload and a preview loop from the same encode.
+        renditions = rendition_paths(out) if publish else None
+        return render_timeline(r["compose"], timeline_of(r, ws.run_id, profile), out, cuts, profile,
+                               renditions=renditions)
+
+    # compose already waited for every timeline input, so they are all in r here.
+    g.add("render", _render, deps=("compose", "audio_mix"), checkpoint=publish)
+
+    def _thumbnail(r):
+        first_image = next((p for p in r["shot_images"] if p), None)
+        if not first_image or not os.path.exists(first_image):
+            return None
+        return generate_thumbnail(r["script"][0].get("case_name", "Unknown Case"),
+                                  first_image, ws.path("thumbnail.jpg"))
+
+    g.add("thumbnail", _thumbnail, deps=("script", "shot_images"), required=False, checkpoint=True)
 
-    return output_file, script, full_script_txt, sota_models, thumbnail_path
+    # Provider outcomes recorded from a stage thread belong to this run, not the process's first one.
+    for st in g.stages.values():
+        st.fn = in_run(ws.run_id, st.fn)
+    return g
+
+
+def main_pipeline(resume: str | None = None, run_id: str | None = None, sleep: bool = True,
+                  profile: str = RENDER_PROFILE) -> tuple:
+    """Produces one video. Returns (video, script, script text, models, thumbnail, marketing, workspace)."""
+    global RUN_ID
+    if resume:
+        try:
+            ws = RunWorkspace.open_existing(resume)
+        except FileNotFoundError as e:
+            print(f"❌ Cannot resume: {e}")
+            return None, None, None, None, None, None, None
+        RUN_ID = ws.run_id
+        fmt    = ws.get_meta("format")
+        print(f"♻️  Resuming run {RUN_ID}")
+    else:
+        run_id = run_id or RUN_ID
+        prune_workspaces(keep=run_id)
+        prune_layers()
+        ws  = RunWorkspace(run_id)
+        fmt = random.choices(VIDEO_FORMATS, weights=[20, 60, 20], k=1)[0]
+        ws.set_meta("format", fmt)
+        print(f"🆔 Run {run_id} — resume with: python main.py --resume {run_id}")
+
+    if sleep:
+        anti_ban_sleep(warm_up=lambda: warm_up(ws))
+    print(f"📐 Format: {fmt['description']} | Render profile: {profile}")
+
+    graph = build_stage_graph(fmt, ws, profile)
+    try:
+        results = graph.run()
+    except StageError as e:
+        print(f"❌ Pipeline failed: {e}")
+        return None, None, None, None, None, None, ws
+
+    script, full_script_txt = results["script"]
+    return (results["render"], script, full_script_txt, results["models"],
+            results["thumbnail"], results["marketing"], ws)
+
+
+def run_batch(count: int, in_flight: int = BATCH_IN_FLIGHT, max_renders: int = MAX_CONCURRENT_RENDERS,
+              profile: str = RENDER_PROFILE) -> list[str]:
+    """Produces `count` videos in one process and queues them for publishing.
+
+    Models, the SFX bank, fonts, the TTS engine and HTTP pools are loaded once and
+    shared. Up to `in_flight` videos are in progress at a time, so scripting and asset
+    fetching for the next video overlap the current render; renders themselves are
+    capped at `max_renders`. Videos rendered with a preview profile are not queued.
+    """
+    set_render_slots(max_renders)
+    publish = ENCODE_PROFILES[profile].get("publish", True)
+    print(f"📦 Batch: {count} videos | {in_flight} in flight | {max_renders} concurrent render(s) | {profile}")
+
+    def _produce(k: int) -> str | None:
+        video, *_, ws = main_pipeline(run_id=new_run_id(), sleep=False, profile=profile)
+        if not video:
+            print(f"❌ Batch video {k + 1}/{count} failed.")
+            return None
+        if not publish:
+            print(f"👀 Batch preview {k + 1}/{count}: {video}")
+            return ws.run_id
+        ws.set_meta("queued", True)
+        ws.set_meta("queued_at", time.time())
+        print(f"📥 Batch video {k + 1}/{count} queued as {ws.run_id}")
+        return ws.run_id
+
+    with cf.ThreadPoolExecutor(max_workers=max(1, in_flight), thread_name_prefix="batch") as pool:
+        produced = [rid for rid in pool.map(_produce, range(count)) if rid]
+    print(f"📦 Batch finished: {len(produced)}/{count} videos {'queued' if publish else 'rendered'}.")
+    return produced
+
+
+def publish_run(video_path: str, script_data: dict, script_text: str, sota_models: list[str],
+                thumbnail_path: str | None, marketing: dict | None, ws: RunWorkspace) -> None:
+    """Uploads a finished run to YouTube and Meta, checkpointing each platform in the workspace."""
+    case_name = script_data.get("case_name", "")
+    if not marketing:
+        print("⚠️  Marketing stage produced nothing — regenerating inline...")
+        marketing = build_marketing_package(script_text, sota_models, case_name)
+
+    yt_metadata = marketing["youtube"]
+    done, published = ws.load("upload_youtube")
+    if done:
+        success, video_id = True, published["video_id"]
+        print(f"♻️  Already on YouTube as {video_id} — not re-uploading.")
+    else:
+        success, video_id = upload_to_youtube(video_path, yt_metadata, thumbnail_path)
+        if success:
+            ws.mark_done("upload_youtube", {"video_id": video_id})
+
+    if not success:
+        return
+    # Published: a batch-queued video leaves the queue even if a Meta upload still needs a --resume.
+    ws.set_meta("queued", False)
+    if not done:
+        record_run_memory({
+            "run_id": ws.run_id,
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "case_name": script_data.get("case_name", "Unknown Case"),
+            "title": yt_metadata.get("title", ""),
+            "format_label": script_data.get("format_label", ""),
+            "era": script_data.get("era", ""),
+            "video_id": video_id,
+        })
+        save_new_topic(script_data.get("case_name", "Unknown Case"))
+    # The size-capped Meta rendition when the render wrote one; older runs only have the master.
+    meta_path = rendition_paths(video_path, ("meta",))["meta"]
+    if not os.path.exists(meta_path):
+        meta_path = video_path
+    if not ws.is_done("upload_facebook") and meta_upload.upload_to_facebook(meta_path, marketing["facebook"]):
+        ws.mark_done("upload_facebook", {})
+    if not ws.is_done("upload_instagram"):
+        temp_url = meta_upload.get_temp_public_url(meta_path)
+        if temp_url and meta_upload.upload_to_instagram(temp_url, marketing["instagram"]):
+            ws.mark_done("upload_instagram", {})
+    # The workspace is kept for a resume until every configured platform has the video.
+    targets = ["upload_youtube"]
+    if meta_upload.ACCESS_TOKEN and meta_upload.FB_PAGE_ID:
+        targets.append("upload_facebook")
+    if meta_upload.ACCESS_TOKEN and meta_upload.IG_USER_ID:
+        targets.append("upload_instagram")
+    if all(ws.is_done(t) for t in targets):
+        ws.remove()
 
 
 # ═══════════════════════════════════════════════════════════
 #  ENTRY POINT
 # ═══════════════════════════════════════════════════════════
 if __name__ == "__main__":
-    video_path, script_data, script_text, sota_models, thumbnail_path = main_pipeline()
-
-    if video_path and script_data and sota_models:
-        yt_metadata = generate_youtube_metadata(
-            script_text, sota_models, case_name=script_data.get("case_name", "")
-        )
-        success, video_id = upload_to_youtube(video_path, yt_metadata, thumbnail_path)
-
-        if success:
-            record_run_memory({
-                "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "case_name": script_data.get("case_name", "Unknown Case"),
-                "title": yt_metadata.get("title", ""),
-                "format_label": script_data.get("format_label", ""),
-                "era": script_data.get("era", ""),
-                "video_id": video_id,
-            })
-            save_new_topic(script_data.get("case_name", "Unknown Case"))
-            fb_caption = generate_platform_captions(yt_metadata, "Facebook",  sota_models)
-            ig_caption = generate_platform_captions(yt_metadata, "Instagram", sota_models)
-            meta_upload.upload_to_facebook(video_path, fb_caption)
-            temp_url = meta_upload.get_temp_public_url(video_path)
-            if temp_url:
-                meta_upload.upload_to_instagram(temp_url, ig_caption)
+    parser = argparse.ArgumentParser(description="GhostBot — produce and publish one Short.")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="resume a run from its first incomplete stage ('latest' for the most recent)")
+    parser.add_argument("--batch", type=int, metavar="N",
+                        help="produce N videos in one process and queue them; scheduled runs publish the queue")
+    parser.add_argument("--max-renders", type=int, default=MAX_CONCURRENT_RENDERS,
+                        help="concurrent renders allowed in --batch (default: %(default)s)")
+    parser.add_argument("--profile", choices=sorted(ENCODE_PROFILES), default=RENDER_PROFILE,
+                        help="render profile; 'preview' renders 360x640 at 12 fps and never publishes "
+                             "(default: %(default)s)")
+    parser.add_argument("--self-check", action="store_true",
+                        help="fail if `import main` exceeds the startup budget or loads heavy modules eagerly")
+    args = parser.parse_args()
+
+    if args.self_check:
+        sys.exit(0 if check_import_budget() else 1)
+
+    publish = ENCODE_PROFILES[args.profile].get("publish", True)
+    if args.batch:
+        run_batch(args.batch, max_renders=args.max_renders, profile=args.profile)
     else:
-        print("❌ Pipeline produced no output.")
+        resume = args.resume
+        if not resume and publish:
+            queued = list_queued_workspaces()
+            if queued:
+                resume = queued[0].run_id
+                print(f"📤 Publishing queued video {resume} ({len(queued) - 1} more in queue)")
+        (video_path, script_data, script_text, sota_models,
+         thumbnail_path, marketing, ws) = main_pipeline(resume, sleep=publish, profile=args.profile)
+
+        if video_path and not publish:
+            print(f"👀 Preview rendered: {video_path}")
+        elif video_path and script_data and sota_models:
+            publish_run(video_path, script_data, script_text, sota_models, thumbnail_path, marketing, ws)
+        else:
+            print("❌ Pipeline produced no output.")
+
+    http_client.print_metrics()
@@ -8,7 +8,7 @@ for Instagram's URL-only upload requirement.
 
 import os
 import time
-import requests
+import http_client
 
 ACCESS_TOKEN = os.environ.get("META_ACCESS_TOKEN")
 FB_PAGE_ID   = os.environ.get("FB_PAGE_ID")
@@ -35,7 +35,7 @@ def upload_to_facebook(video_path: str, caption: str) -> bool:
 
     try:
         with open(video_path, "rb") as vf:
-            rsp = requests.post(url, data=payload, files={"source": vf}, timeout=120)
+            rsp = http_client.post(url, data=payload, files={"source": vf}, timeout=120)
 
         result = rsp.json()
         if "id" in result:
@@ -64,7 +64,7 @@ def get_temp_public_url(file_path: str) -> str | None:
     # ── Method 1: file.io (Bot-friendly, single-use) ──
     try:
         with open(file_path, "rb") as f:
-            rsp = requests.post(
+            rsp = http_client.post(
                 "https://file.io",
                 files={"file": f},
                 headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"},
@@ -84,7 +84,7 @@ def get_temp_public_url(file_path: str) -> str | None:
     print("☁️  Falling back to Catbox...")
     try:
         with open(file_path, "rb") as f:
-            rsp = requests.post(
+            rsp = http_client.post(
                 "https://catbox.moe/user/api.php",
                 data={"reqtype": "fileupload"},
                 files={"fileToUpload": f},
@@ -109,7 +109,7 @@ def get_temp_public_url(file_path: str) -> str | None:
     print("☁️  Engaging ultimate fallback to tmpfiles.org...")
     try:
         with open(file_path, "rb") as f:
-            rsp = requests.post(
+            rsp = http_client.post(
                 "https://tmpfiles.org/api/v1/upload",
                 files={"file": f},
                 timeout=90
@@ -140,7 +140,7 @@ def upload_to_instagram(video_url: str, caption: str) -> bool:
         return False
 
     # ── Stage 1: Create media container ──
-    container_rsp = requests.post(
+    container_rsp = http_client.post(
         f"https://graph.facebook.com/{GRAPH_VERSION}/{IG_USER_ID}/media",
         data={
             "media_type":  "REELS",
@@ -166,7 +166,7 @@ def upload_to_instagram(video_url: str, caption: str) -> bool:
     attempts      = 0
 
     while attempts < max_attempts:
-        status_rsp  = requests.get(status_url, params=status_params, timeout=15)
+        status_rsp  = http_client.get(status_url, params=status_params, timeout=15)
         status_data = status_rsp.json()
         status      = status_data.get("status_code")
 
@@ -185,7 +185,7 @@ def upload_to_instagram(video_url: str, caption: str) -> bool:
         return False
 
     # ── Stage 3: Publish ──
-    publish_rsp  = requests.post(
+    publish_rsp  = http_client.post(
         f"https://graph.facebook.com/{GRAPH_VERSION}/{IG_USER_ID}/media_publish",
         data={"creation_id": creation_id, "access_token": ACCESS_TOKEN},
         timeout=30,
@@ -0,0 +1,166 @@
+"""
+model_scoreboard.py — Measured Model Ranking
+=============================================
+Persists how every LLM actually behaved for us (success rate, p50/p95
+latency, JSON validity, last 429) and ranks the OpenRouter free cascade
+from those measurements instead of a fixed reward table. The OpenRouter
+model catalogue is cached on disk with a TTL so it is not downloaded
+on every run.
+"""
+
+import os
+import json
+import time
+import threading
+
+SCOREBOARD_FILE     = os.environ.get("MODEL_SCOREBOARD_PATH", "model_scoreboard.json")
+CATALOGUE_FILE      = os.environ.get("OPENROUTER_CATALOGUE_PATH", "openrouter_catalogue.json")
+CATALOGUE_TTL_SECS  = int(os.environ.get("OPENROUTER_CATALOGUE_TTL", 24 * 3600))
+LATENCY_WINDOW      = 50          # most recent latencies kept per model
+CONFIDENT_SAMPLES   = 10          # attempts before measurements fully override the prior
+RATE_LIMIT_COOLDOWN = 15 * 60     # seconds a 429 keeps a model demoted
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class ModelScoreboard:
+    def __init__(self, path: str = SCOREBOARD_FILE):
+        self.path   = path
+        self._lock  = threading.Lock()
+        self.models = {}
+        self.listeners = []        # fn(model, ok, latency, status) — e.g. the run history store
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.models = data
+            except Exception:
+                self.models = {}
+
+    def _entry(self, model: str) -> dict:
+        return self.models.setdefault(model, {
+            "attempts": 0, "successes": 0, "latencies": [],
+            "json_attempts": 0, "json_valid": 0, "last_429": None,
+        })
+
+    # ----------------------------------------------------------
+    # RECORDING
+    # ----------------------------------------------------------
+    def record_call(self, model: str, ok: bool, latency: float, status: int | None = None) -> None:
+        with self._lock:
+            e = self._entry(model)
+            e["attempts"] += 1
+            if ok:
+                e["successes"] += 1
+                e["latencies"] = (e["latencies"] + [round(latency, 3)])[-LATENCY_WINDOW:]
+            if status == 429:
+                e["last_429"] = time.time()
+            self._save_locked()
+        for listener in self.listeners:
+            try:
+                listener(model, ok, latency, status)
+            except Exception:
+                pass
+
+    def record_json(self, model: str, valid: bool) -> None:
+        with self._lock:
+            e = self._entry(model)
+            e["json_attempts"] += 1
+            if valid:
+                e["json_valid"] += 1
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.models, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"⚠️  Could not save model scoreboard: {e}")
+
+    # ----------------------------------------------------------
+    # STATS & RANKING
+    # ----------------------------------------------------------
+    def stats(self, model: str) -> dict:
+        with self._lock:
+            e = dict(self.models.get(model) or {})
+        attempts = e.get("attempts", 0)
+        lat      = e.get("latencies", [])
+        return {
+            "attempts":     attempts,
+            "success_rate": (e.get("successes", 0) / attempts) if attempts else None,
+            "p50":          _percentile(lat, 50),
+            "p95":          _percentile(lat, 95),
+            "json_rate":    (e.get("json_valid", 0) / e["json_attempts"]) if e.get("json_attempts") else None,
+            "last_429":     e.get("last_429"),
+        }
+
+    def score(self, model: str, prior: float = 0.5) -> float:
+        with self._lock:
+            e = dict(self.models.get(model) or {})
+        attempts = e.get("attempts", 0)
+
+        # Laplace-smoothed rates so one lucky call does not dominate.
+        reliability = (e.get("successes", 0) + 1) / (attempts + 2)
+        json_rate   = (e.get("json_valid", 0) + 1) / (e.get("json_attempts", 0) + 2)
+        p95         = _percentile(e.get("latencies", []), 95)
+        speed       = 1.0 / (1.0 + (p95 if p95 is not None else 30.0) / 30.0)
+
+        measured = 0.5 * reliability + 0.2 * json_rate + 0.3 * speed
+        weight   = min(1.0, attempts / CONFIDENT_SAMPLES)
+        value    = (1.0 - weight) * prior + weight * measured
+
+        last_429 = e.get("last_429")
+        if last_429 and time.time() - last_429 < RATE_LIMIT_COOLDOWN:
+            value *= 0.2
+        return value
+
+    def rank(self, models: list[str], prior=None, limit: int | None = None) -> list[str]:
+        prior = prior or (lambda m: 0.5)
+        ranked = sorted(models, key=lambda m: self.score(m, prior(m)), reverse=True)
+        return ranked[:limit] if limit else ranked
+
+
+# ═══════════════════════════════════════════════════════════
+#  TTL-CACHED OPENROUTER CATALOGUE
+# ═══════════════════════════════════════════════════════════
+def load_cached_catalogue(path: str = CATALOGUE_FILE, ttl: int = CATALOGUE_TTL_SECS) -> list[str] | None:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if time.time() - data.get("fetched_at", 0) > ttl:
+            return None
+        ids = data.get("free_ids", [])
+        return ids if ids else None
+    except Exception:
+        return None
+
+
+def save_catalogue(free_ids: list[str], path: str = CATALOGUE_FILE) -> None:
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": time.time(), "free_ids": free_ids}, f)
+    except Exception as e:
+        print(f"⚠️  Could not cache OpenRouter catalogue: {e}")
+
+
+_SCOREBOARD: ModelScoreboard | None = None
+_SCOREBOARD_LOCK = threading.Lock()
+
+
+def get_scoreboard() -> ModelScoreboard:
+    global _SCOREBOARD
+    with _SCOREBOARD_LOCK:
+        if _SCOREBOARD is None:
+            _SCOREBOARD = ModelScoreboard()
+        return _SCOREBOARD
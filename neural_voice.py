@@ -1,7 +1,7 @@
 import os
 import time
 import wave
-import requests
+import http_client
 from google import genai
 from google.genai import types
 from pydub import AudioSegment
@@ -132,12 +132,12 @@ class VoiceEngine:
     # ----------------------------------------------------------
     # SECONDARY ENGINE: ELEVENLABS ROTATION (OPTIONAL)
     # ----------------------------------------------------------
-    def _generate_via_elevenlabs(self, clean_text: str, role: str, index: int) -> str | None:
+    def _generate_via_elevenlabs(self, clean_text: str, role: str, index: int, out_dir: str = ".") -> str | None:
         if not self.eleven_keys:
             return None
 
         eleven_id = ELEVENLABS_VOICES.get(role, ELEVENLABS_VOICES["narrator"])
-        temp_raw = f"temp_raw_eleven_{index}.mp3"
+        temp_raw = os.path.join(out_dir, f"temp_raw_eleven_{index}.mp3")
         url = f"https://api.elevenlabs.io/v1/text-to-speech/{eleven_id}"
 
         # Dynamic parameter tuning based on role
@@ -166,7 +166,7 @@ class VoiceEngine:
             }
 
             try:
-                response = requests.post(url, json=payload, headers=headers, timeout=30)
+                response = http_client.post(url, json=payload, headers=headers, timeout=30)
 
                 if response.status_code == 200:
                     with open(temp_raw, 'wb') as f:
@@ -191,9 +191,9 @@ class VoiceEngine:
     # ----------------------------------------------------------
     # PRIMARY ENGINE: GOOGLE STUDIO TTS (GEMINI 2.5 FLASH AUDIO)
     # ----------------------------------------------------------
-    def _generate_via_gemini(self, acting_text: str, clean_text: str, style_instruction: str, index: int, role: str) -> str | None:
+    def _generate_via_gemini(self, acting_text: str, clean_text: str, style_instruction: str, index: int, role: str, out_dir: str = ".") -> str | None:
         voice_name = GEMINI_VOICES.get(role, "Enceladus")
-        temp_raw = f"temp_raw_gemini_{index}.wav"
+        temp_raw = os.path.join(out_dir, f"temp_raw_gemini_{index}.wav")
         print(f"   ↳ 🎙️ Google Studio TTS Rendering [{voice_name} | Role: {role}]")
 
         config = types.GenerateContentConfig(
@@ -248,22 +248,22 @@ SCRIPT: {acting_text}'''
     # ----------------------------------------------------------
     # MASTER ROUTER
     # ----------------------------------------------------------
-    def generate_acting_line(self, acting_text: str, clean_text: str, style_instruction: str, index: int, voice_name: str = "Charon") -> str | None:
+    def generate_acting_line(self, acting_text: str, clean_text: str, style_instruction: str, index: int, voice_name: str = "Charon", out_dir: str = ".") -> str | None:
         role = LEGACY_VOICE_MAP.get(voice_name, "narrator")
         text_payload = clean_text.strip()
         
         if not text_payload:
             return None
 
-        final_filename = f"temp_voice_{index}.wav"
+        final_filename = os.path.join(out_dir, f"temp_voice_{index}.wav")
         print(f"🎙️ Line {index} | Role: {role} | Style: {style_instruction[:35]}...")
 
         # Step 1: Try Native ElevenLabs API if keys exist
-        temp_raw = self._generate_via_elevenlabs(text_payload, role, index)
+        temp_raw = self._generate_via_elevenlabs(text_payload, role, index, out_dir)
 
         # Step 2: Google Studio TTS Engine (Primary or Seamless Failover)
         if not temp_raw or not os.path.exists(temp_raw):
-            temp_raw = self._generate_via_gemini(acting_text, clean_text, style_instruction, index, role)
+            temp_raw = self._generate_via_gemini(acting_text, clean_text, style_instruction, index, role, out_dir)
 
         # Step 3: Master the resulting audio stream
         if temp_raw and os.path.exists(temp_raw):
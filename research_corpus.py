@@ -0,0 +1,102 @@
+"""
+research_corpus.py — Cached Research Corpus
+============================================
+Local, zlib-compressed SQLite store for everything the research engine
+pulls from the web: Wikipedia search hits and article extracts, and
+Google News RSS digests. Entries are keyed by source plus a normalized
+case name or page title and expire on a per-source TTL, so re-researching
+a case (or a neighbouring case that resolves to the same article) is a
+local lookup.
+"""
+
+import os
+import re
+import time
+import zlib
+import sqlite3
+import threading
+
+CORPUS_DB_PATH = os.environ.get("RESEARCH_CORPUS_PATH", "research_corpus.db")
+
+SOURCE_TTLS = {
+    "wiki_title":   30 * 24 * 3600,   # search term → article title
+    "wiki_extract": 30 * 24 * 3600,   # article title → plain-text extract
+    "news":         12 * 3600,        # case → RSS digest (news goes stale fast)
+}
+
+
+def normalize_key(text: str) -> str:
+    t = (text or "").lower()
+    t = re.sub(r"[\"'’`]", "", t)
+    t = re.sub(r"[^a-z0-9]+", " ", t).strip()
+    t = re.sub(r"^the ", "", t)
+    return t
+
+
+class ResearchCorpus:
+    def __init__(self, path: str = CORPUS_DB_PATH):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._db   = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                source     TEXT NOT NULL,
+                key        TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                value      BLOB NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+        """)
+        self._db.commit()
+
+    def get(self, source: str, key: str) -> str | None:
+        nkey = normalize_key(key)
+        if not nkey:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at, value FROM documents WHERE source = ? AND key = ?",
+                (source, nkey)
+            ).fetchone()
+        if not row or time.time() - row[0] > SOURCE_TTLS.get(source, 24 * 3600):
+            return None
+        return zlib.decompress(row[1]).decode("utf-8")
+
+    def put(self, source: str, key: str, value: str) -> None:
+        nkey = normalize_key(key)
+        if not nkey or value is None:
+            return
+        blob = zlib.compress(value.encode("utf-8"), 9)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (source, key, fetched_at, value) VALUES (?, ?, ?, ?)",
+                (source, nkey, time.time(), blob)
+            )
+            self._db.commit()
+
+    def purge_expired(self) -> None:
+        now = time.time()
+        with self._lock:
+            for source, ttl in SOURCE_TTLS.items():
+                self._db.execute(
+                    "DELETE FROM documents WHERE source = ? AND fetched_at < ?", (source, now - ttl)
+                )
+            self._db.commit()
+
+
+_CORPUS: ResearchCorpus | None = None
+_CORPUS_LOCK = threading.Lock()
+
+
+def get_research_corpus() -> ResearchCorpus | None:
+    global _CORPUS
+    with _CORPUS_LOCK:
+        if _CORPUS is None:
+            try:
+                _CORPUS = ResearchCorpus()
+                _CORPUS.purge_expired()
+            except Exception as e:
+                print(f"⚠️  Research corpus unavailable: {e}")
+                return None
+        return _CORPUS
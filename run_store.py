@@ -0,0 +1,260 @@
+"""
+run_store.py — Run History Store
+=================================
+Small embedded SQLite store for the channel's full history: published
+runs, covered topics, per-stage timings and per-call provider outcomes.
+Every table is append-only with indexes for the lookups analytics needs
+(by case, era, format and date), so recording a run is a single INSERT
+instead of rewriting a truncated JSON file.
+
+The legacy channel_memory.json and topics.txt are imported once, the
+first time an empty store is opened. Stage timings and provider outcomes
+are telemetry and are pruned by age; runs and topics are kept forever.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+from topic_index import canonical
+
+HISTORY_DB_PATH = os.environ.get("RUN_HISTORY_PATH", "ghostbot_history.db")
+TELEMETRY_MAX_AGE = 30 * 24 * 3600      # stage timings and provider outcomes older than this are pruned
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id       TEXT,
+    ts           TEXT NOT NULL,
+    case_name    TEXT,
+    case_key     TEXT,
+    title        TEXT,
+    format_label TEXT,
+    era          TEXT,
+    video_id     TEXT,
+    extra        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_case   ON runs(case_key);
+CREATE INDEX IF NOT EXISTS idx_runs_era    ON runs(era);
+CREATE INDEX IF NOT EXISTS idx_runs_format ON runs(format_label);
+CREATE INDEX IF NOT EXISTS idx_runs_ts     ON runs(ts);
+
+CREATE TABLE IF NOT EXISTS topics (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    case_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_topics_case ON topics(case_key);
+
+CREATE TABLE IF NOT EXISTS stage_timings (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id     TEXT NOT NULL,
+    stage      TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration   REAL NOT NULL,
+    status     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stage_run   ON stage_timings(run_id);
+CREATE INDEX IF NOT EXISTS idx_stage_stage ON stage_timings(stage, started_at);
+
+CREATE TABLE IF NOT EXISTS provider_outcomes (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id  TEXT,
+    ts      REAL NOT NULL,
+    model   TEXT NOT NULL,
+    ok      INTEGER NOT NULL,
+    latency REAL,
+    status  INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_provider_model ON provider_outcomes(model, ts);
+"""
+
+RUN_COLUMNS = ("run_id", "ts", "case_name", "title", "format_label", "era", "video_id")
+
+
+def new_run_id() -> str:
+    return time.strftime("%Y%m%d-%H%M%S", time.gmtime()) + "-" + uuid.uuid4().hex[:6]
+
+
+def _utc_now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class RunStore:
+    def __init__(self, path: str = HISTORY_DB_PATH):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._db   = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    # ----------------------------------------------------------
+    # ONE-TIME IMPORT OF LEGACY FILES
+    # ----------------------------------------------------------
+    def import_legacy(self, memory_file: str, topics_file: str) -> None:
+        with self._lock:
+            has_runs   = self._db.execute("SELECT 1 FROM runs LIMIT 1").fetchone()
+            has_topics = self._db.execute("SELECT 1 FROM topics LIMIT 1").fetchone()
+        if not has_runs and os.path.exists(memory_file):
+            try:
+                with open(memory_file, "r", encoding="utf-8") as f:
+                    memory = json.load(f)
+                for entry in memory if isinstance(memory, list) else []:
+                    self.record_run(entry)
+                print(f"📦 Imported {len(memory)} runs from {memory_file}")
+            except Exception as e:
+                print(f"⚠️  Could not import {memory_file}: {e}")
+        if not has_topics and os.path.exists(topics_file):
+            with open(topics_file, "r", encoding="utf-8") as f:
+                names = [l.strip() for l in f if l.strip()]
+            with self._lock:
+                self._db.executemany(
+                    "INSERT INTO topics (ts, name, case_key) VALUES (?, ?, ?)",
+                    [("", n, canonical(n)) for n in names]
+                )
+                self._db.commit()
+            print(f"📦 Imported {len(names)} topics from {topics_file}")
+
+    # ----------------------------------------------------------
+    # WRITES
+    # ----------------------------------------------------------
+    def record_run(self, entry: dict) -> None:
+        extra = {k: v for k, v in entry.items() if k not in RUN_COLUMNS}
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO runs (run_id, ts, case_name, case_key, title, format_label, era, video_id, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.get("run_id"), entry.get("ts") or _utc_now(), entry.get("case_name"),
+                 canonical(entry.get("case_name", "")), entry.get("title"), entry.get("format_label"),
+                 entry.get("era"), entry.get("video_id"),
+                 json.dumps(extra, ensure_ascii=False) if extra else None)
+            )
+            self._db.commit()
+
+    def record_topic(self, name: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO topics (ts, name, case_key) VALUES (?, ?, ?)",
+                (_utc_now(), name, canonical(name))
+            )
+            self._db.commit()
+
+    def record_stage(self, run_id: str, stage: str, started_at: float,
+                     duration: float, status: str = "ok") -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO stage_timings (run_id, stage, started_at, duration, status) VALUES (?, ?, ?, ?, ?)",
+                (run_id, stage, started_at, round(duration, 3), status)
+            )
+            self._db.commit()
+
+    def record_provider_outcome(self, model: str, ok: bool, latency: float | None,
+                                status: int | None = None, run_id: str | None = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO provider_outcomes (run_id, ts, model, ok, latency, status) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, time.time(), model, int(bool(ok)),
+                 round(latency, 3) if latency is not None else None, status)
+            )
+            self._db.commit()
+
+    def prune_telemetry(self, max_age: float = TELEMETRY_MAX_AGE) -> int:
+        """Deletes stage timings and provider outcomes older than max_age; returns the rows removed."""
+        cutoff = time.time() - max_age
+        with self._lock:
+            removed  = self._db.execute("DELETE FROM provider_outcomes WHERE ts < ?", (cutoff,)).rowcount
+            removed += self._db.execute("DELETE FROM stage_timings WHERE started_at < ?", (cutoff,)).rowcount
+            self._db.commit()
+        return removed
+
+    # ----------------------------------------------------------
+    # INDEXED LOOKUPS
+    # ----------------------------------------------------------
+    def find_runs(self, case: str | None = None, era: str | None = None,
+                  format_label: str | None = None, since: str | None = None,
+                  until: str | None = None, limit: int | None = None) -> list[dict]:
+        where, args = [], []
+        if case:
+            where.append("case_key = ?");     args.append(canonical(case))
+        if era:
+            where.append("era = ?");          args.append(era)
+        if format_label:
+            where.append("format_label = ?"); args.append(format_label)
+        if since:
+            where.append("ts >= ?");          args.append(since)
+        if until:
+            where.append("ts < ?");           args.append(until)
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if limit:
+            # Most recent N, returned oldest first like the full history.
+            sql = f"SELECT * FROM ({sql} ORDER BY id DESC LIMIT ?) ORDER BY id ASC"
+            args.append(int(limit))
+        else:
+            sql += " ORDER BY id ASC"
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        out = []
+        for row in rows:
+            entry = {k: row[k] for k in RUN_COLUMNS if row[k] is not None}
+            if row["extra"]:
+                entry.update(json.loads(row["extra"]))
+            out.append(entry)
+        return out
+
+    def recent_topics(self, limit: int = 100) -> list[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name FROM topics ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [r["name"] for r in reversed(rows)]
+
+    def all_topics(self) -> list[str]:
+        with self._lock:
+            return [r["name"] for r in self._db.execute("SELECT name FROM topics ORDER BY id")]
+
+    def has_case(self, name: str) -> bool:
+        key = canonical(name)
+        with self._lock:
+            return bool(
+                self._db.execute("SELECT 1 FROM topics WHERE case_key = ? LIMIT 1", (key,)).fetchone()
+                or self._db.execute("SELECT 1 FROM runs WHERE case_key = ? LIMIT 1", (key,)).fetchone()
+            )
+
+    def stage_summary(self, stage: str | None = None, limit_runs: int = 30) -> list[dict]:
+        sql  = ("SELECT stage, COUNT(*) AS n, AVG(duration) AS avg, MAX(duration) AS max, "
+                "SUM(status != 'ok') AS failures FROM stage_timings "
+                "WHERE run_id IN (SELECT DISTINCT run_id FROM stage_timings ORDER BY started_at DESC LIMIT ?)")
+        args = [limit_runs]
+        if stage:
+            sql += " AND stage = ?"
+            args.append(stage)
+        sql += " GROUP BY stage ORDER BY avg DESC"
+        with self._lock:
+            return [dict(r) for r in self._db.execute(sql, args).fetchall()]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_STORE: RunStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_run_store() -> RunStore | None:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            try:
+                _STORE = RunStore()
+            except Exception as e:
+                print(f"⚠️  Run history store unavailable: {e}")
+                return None
+        return _STORE
@@ -0,0 +1,169 @@
+"""
+stage_graph.py — Pipeline Stage Scheduler
+==========================================
+Expresses a run as a dependency graph of named stages and executes every
+stage whose dependencies are satisfied concurrently on a thread pool.
+Most of the pipeline waits on the network (LLMs, TTS, stock APIs), so
+independent stages overlap instead of queueing behind each other.
+
+Each stage is either required or optional:
+  • a failed optional stage degrades to its fallback value and the run goes on,
+  • a failed required stage skips everything downstream of it.
+
+Per-stage wall times and outcomes are reported through on_timing.
+
+With a workspace attached, checkpointed stages persist their (JSON) result
+to the run manifest, and a resumed run restores them instead of re-running
+them; stages whose every dependant was restored are not run at all.
+"""
+
+import time
+import threading
+import concurrent.futures as cf
+
+OK       = "ok"
+DEGRADED = "degraded"
+FAILED   = "failed"
+SKIPPED  = "skipped"
+RESUMED  = "resumed"
+
+
+class StageError(Exception):
+    """Raised by run() when a required stage failed or was skipped."""
+
+
+class Stage:
+    def __init__(self, name: str, fn, deps: tuple = (), required: bool = True, fallback=None,
+                 checkpoint: bool = False):
+        self.name       = name
+        self.fn         = fn
+        self.deps       = tuple(deps)
+        self.required   = required
+        self.fallback   = fallback
+        self.checkpoint = checkpoint
+
+
+class StageGraph:
+    def __init__(self, max_workers: int = 6, on_timing=None, workspace=None):
+        self.stages      = {}
+        self.max_workers = max_workers
+        self.on_timing   = on_timing      # fn(stage, started_at, duration, status)
+        self.workspace   = workspace      # workspace.RunWorkspace for checkpoints, optional
+        self.results     = {}
+        self.status      = {}
+        self.timings     = {}
+        self._lock       = threading.Lock()
+
+    def add(self, name: str, fn, deps: tuple = (), required: bool = True, fallback=None,
+            checkpoint: bool = False) -> None:
+        """fn receives the results dict of all finished stages and returns this stage's result."""
+        if name in self.stages:
+            raise ValueError(f"duplicate stage: {name}")
+        self.stages[name] = Stage(name, fn, deps, required, fallback, checkpoint)
+
+    def _check(self) -> list[str]:
+        """Validates the graph and returns its stages in dependency order."""
+        for st in self.stages.values():
+            for dep in st.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"stage '{st.name}' depends on unknown stage '{dep}'")
+        # Kahn's algorithm: anything left over sits on a cycle.
+        indeg = {n: len(s.deps) for n, s in self.stages.items()}
+        ready = [n for n, d in indeg.items() if d == 0]
+        order = []
+        while ready:
+            n = ready.pop()
+            order.append(n)
+            for m, s in self.stages.items():
+                if n in s.deps:
+                    indeg[m] -= 1
+                    if indeg[m] == 0:
+                        ready.append(m)
+        if len(order) != len(self.stages):
+            raise ValueError("stage graph has a cycle")
+        return order
+
+    def _restore(self, order: list[str]) -> None:
+        """Marks stages satisfied by the workspace checkpoints as resumed."""
+        restored = {}
+        for name in order:
+            st = self.stages[name]
+            if not st.checkpoint:
+                continue
+            # A checkpoint is only trusted if everything upstream of it was restored too.
+            if any(self.stages[d].checkpoint and d not in restored for d in st.deps):
+                continue
+            ok, value = self.workspace.load(name)
+            if ok:
+                restored[name] = value
+        # Whatever feeds only restored stages is not needed, checkpointed or not: a checkpoint
+        # that fails to load (e.g. its frame buffers were not cached) is not worth rebuilding.
+        for name in reversed(order):
+            dependants = [n for n, s in self.stages.items() if name in s.deps]
+            if name not in restored and dependants and all(d in restored for d in dependants):
+                restored[name] = None
+        for name in order:
+            if name in restored:
+                self._finish(name, RESUMED, restored[name], time.time())
+
+    def _finish(self, name: str, status: str, result, started: float) -> None:
+        duration = time.time() - started
+        with self._lock:
+            self.results[name] = result
+            self.status[name]  = status
+            self.timings[name] = duration
+        icon = {OK: "✅", DEGRADED: "⚠️ ", FAILED: "❌", SKIPPED: "⏭️ ", RESUMED: "♻️ "}[status]
+        print(f"{icon} Stage '{name}' {status} in {duration:.1f}s")
+        if status == OK and self.workspace and self.stages[name].checkpoint:
+            try:
+                self.workspace.mark_done(name, result)
+            except Exception as e:
+                print(f"⚠️  Could not checkpoint stage '{name}': {e}")
+        if self.on_timing:
+            try:
+                self.on_timing(name, started, duration, status)
+            except Exception:
+                pass
+
+    def _execute(self, stage: Stage):
+        with self._lock:
+            view = dict(self.results)
+        return stage.fn(view)
+
+    def run(self) -> dict:
+        """Runs the graph to completion. Returns results; raises StageError if a required stage did not finish."""
+        order = self._check()
+        if self.workspace:
+            self._restore(order)
+        pending = {n: s for n, s in self.stages.items() if n not in self.status}
+        running = {}
+        doomed  = False       # a required stage failed: start nothing new, let running stages finish
+        with cf.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as pool:
+            while pending or running:
+                for name, st in list(pending.items()):
+                    dep_status = [self.status.get(d) for d in st.deps]
+                    if doomed or any(s in (FAILED, SKIPPED) for s in dep_status):
+                        del pending[name]
+                        self._finish(name, SKIPPED, st.fallback, time.time())
+                    elif all(s is not None for s in dep_status):
+                        del pending[name]
+                        running[pool.submit(self._execute, st)] = (st, time.time())
+                if not running:
+                    continue
+                done, _ = cf.wait(running, return_when=cf.FIRST_COMPLETED)
+                for fut in done:
+                    st, started = running.pop(fut)
+                    try:
+                        self._finish(st.name, OK, fut.result(), started)
+                    except Exception as e:
+                        print(f"⚠️  Stage '{st.name}' raised: {e}")
+                        if st.required:
+                            self._finish(st.name, FAILED, None, started)
+                            doomed = True
+                        else:
+                            self._finish(st.name, DEGRADED, st.fallback, started)
+
+        broken = [n for n, s in self.stages.items() if s.required and self.status.get(n) in (FAILED, SKIPPED)]
+        if broken:
+            raise StageError(f"required stages did not finish: {', '.join(broken)}")
+        return self.results
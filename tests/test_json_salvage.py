@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from json_salvage import SCRIPT_SCHEMA, VISUALS_SCHEMA, load_validated, salvage_json, viable_prefix
+
+
+def _script(n: int = 3) -> dict:
+    return {"lines": [{"clean_text": f"Line number {i}."} for i in range(n)]}
+
+
+def test_plain_json_passes_through():
+    assert salvage_json(json.dumps(_script())) == _script()
+
+
+def test_fenced_json_inside_prose():
+    text = "Sure! Here you go:\n```json\n" + json.dumps(_script()) + "\n```\nEnjoy."
+    assert salvage_json(text) == _script()
+
+
+def test_trailing_commas_and_python_literals():
+    assert salvage_json('{"a": [1, 2,], "b": True, "c": None,}') == {"a": [1, 2], "b": True, "c": None}
+
+
+def test_literals_and_commas_inside_strings_are_kept():
+    text = '{"text": "True story, None survived,}", "ok": False,}'
+    assert salvage_json(text) == {"text": "True story, None survived,}", "ok": False}
+
+
+def test_smart_quote_delimiters():
+    assert salvage_json("{“title”: “The Vanishing”}") == {"title": "The Vanishing"}
+
+
+def test_truncated_array_keeps_complete_elements():
+    text = '{"lines": [{"clean_text": "One."}, {"clean_text": "Two."}, {"clean_text": "Thr'
+    assert salvage_json(text) == {"lines": [{"clean_text": "One."}, {"clean_text": "Two."}]}
+
+
+def test_garbage_is_none():
+    assert salvage_json("no json here") is None
+    assert salvage_json("") is None
+
+
+def test_load_validated_wraps_bare_visuals_list():
+    assert load_validated('[{"asset_type": "ai"}]', VISUALS_SCHEMA) == {"visuals": [{"asset_type": "ai"}]}
+
+
+def test_load_validated_backfills_clean_text_from_acting_text():
+    text = json.dumps({"lines": [{"acting_text": "<whisper>Line one.</whisper>"},
+                                 {"clean_text": "Line two."}, {"clean_text": "Line three."}]})
+    assert load_validated(text, SCRIPT_SCHEMA)["lines"][0]["clean_text"] == "Line one."
+
+
+def test_load_validated_reports_schema_errors():
+    with pytest.raises(ValueError, match="at least 3"):
+        load_validated(json.dumps(_script(2)), SCRIPT_SCHEMA)
+
+
+def test_viable_prefix_accepts_a_growing_document():
+    full = json.dumps(_script(5))
+    for cut in range(1, len(full), 7):
+        assert viable_prefix(full[:cut], SCRIPT_SCHEMA)
+
+
+def test_viable_prefix_rejects_wrong_shapes():
+    assert not viable_prefix('{"lines": "just a string", ', SCRIPT_SCHEMA)
+    assert not viable_prefix('{"lines": [42, ', SCRIPT_SCHEMA)
+
+
+def test_viable_prefix_rejects_long_prose():
+    assert viable_prefix("Here is the script:", SCRIPT_SCHEMA)
+    assert not viable_prefix("I cannot help with that. " * 40, SCRIPT_SCHEMA)
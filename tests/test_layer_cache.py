@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+import layer_cache
+from layer_cache import commit, layer_key, lookup, prune_layers, read_index, staging_path, write_index
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(layer_cache, "LAYER_CACHE_DIR", str(tmp_path / "_layers"))
+    return tmp_path / "_layers"
+
+
+def _write(path, data: bytes, mtime: float | None = None) -> str:
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_key_is_stable_and_ignores_param_order():
+    a = layer_key("base", {"fps": 24, "size": (720, 1280)})
+    b = layer_key("base", {"size": (720, 1280), "fps": 24})
+    assert a == b and a.startswith("base-")
+
+
+def test_key_changes_with_params_and_kind():
+    base = layer_key("base", {"fps": 24})
+    assert layer_key("base", {"fps": 12}) != base
+    assert layer_key("overlay", {"fps": 24}) != base
+
+
+def test_key_follows_file_content_not_name(tmp_path):
+    shot = tmp_path / "shot.jpg"
+    first = layer_key("base", {}, [_write(shot, b"one", mtime=1_000_000)])
+    # Same name refetched with other content: the layer must be rebuilt.
+    second = layer_key("base", {}, [_write(shot, b"two", mtime=2_000_000)])
+    assert first != second
+
+    other = tmp_path / "copy.jpg"
+    assert layer_key("base", {}, [_write(other, b"two")]) == second
+
+
+def test_missing_file_has_its_own_key(tmp_path):
+    present = layer_key("base", {}, [_write(tmp_path / "a.jpg", b"x")])
+    assert layer_key("base", {}, [None]) == layer_key("base", {}, [str(tmp_path / "gone.jpg")])
+    assert layer_key("base", {}, [None]) != present
+
+
+def test_commit_then_lookup(cache_dir):
+    key = layer_key("audio", {"duration": 1.0})
+    assert lookup(key, ".pcm") is None
+    staged = staging_path(key, ".pcm")
+    assert staged.endswith(".pcm")
+    with open(staged, "wb") as f:
+        f.write(b"\0" * 8)
+    path = commit(staged, key, ".pcm")
+    assert lookup(key, ".pcm") == path and not os.path.exists(staged)
+
+
+def test_index_round_trip(cache_dir):
+    key = layer_key("overlay", {})
+    assert read_index(key) is None
+    write_index(key, {"intervals": [[1.0, 1.5]]})
+    assert read_index(key) == {"intervals": [[1.0, 1.5]]}
+
+
+def test_prune_drops_only_stale_layers(cache_dir):
+    cache_dir.mkdir()
+    old   = _write(cache_dir / "base-old.mp4", b"x", mtime=time.time() - 10 * 24 * 3600)
+    fresh = _write(cache_dir / "base-new.mp4", b"x")
+    prune_layers()
+    assert not os.path.exists(old) and os.path.exists(fresh)
@@ -0,0 +1,77 @@
+import os
+
+import main
+from encoder import RENDITIONS, EncodeError, _bits, _rendition_args, _size_capped, rendition_paths
+
+
+def test_rendition_paths_follow_the_master():
+    assert rendition_paths("runs/x/final_video.mp4") == {
+        "meta": "runs/x/final_video_meta.mp4",
+        "webp": "runs/x/final_video_preview.webp",
+    }
+    assert rendition_paths("final.mp4", ("meta",)) == {"meta": "final_meta.mp4"}
+
+
+def test_no_renditions_add_no_args():
+    assert _rendition_args(None, 24, 60.0, None) == ([], [])
+    assert _rendition_args({}, 24, 60.0, 3) == ([], [])
+
+
+def test_split_graph_has_one_branch_per_rendition():
+    graph, outputs = _rendition_args({"meta": "m.mp4", "webp": "p.webp"}, 24, 60.0, None)
+    assert graph[0] == "-filter_complex"
+    chains = graph[1].split(";")
+    assert chains[0] == "[0:v]split=2[r0][r1]"
+    assert chains[1] == "[r0]null[o0]"
+    webp = RENDITIONS["webp"]
+    assert chains[2] == f"[r1]trim=duration={webp['secs']},fps={webp['fps']},scale={webp['width']}:-2[o1]"
+    assert outputs.index("[o0]") < outputs.index("m.mp4") < outputs.index("[o1]")
+    assert outputs[-1] == "p.webp" and "libwebp" in outputs
+
+
+def test_meta_gets_audio_and_cut_keyframes_webp_stays_silent():
+    _, outputs = _rendition_args({"meta": "m.mp4", "webp": "p.webp"}, 24, 60.0, 5, key_times=[0, 2.5])
+    meta, webp = outputs[:outputs.index("m.mp4") + 1], outputs[outputs.index("m.mp4") + 1:]
+    assert "1:a" in meta and "-force_key_frames" in meta
+    assert meta[meta.index("-force_key_frames") + 1] == "2.500"
+    assert "1:a" not in webp and "-an" in webp
+
+
+def test_meta_bitrate_is_capped_to_fit_the_upload_limit():
+    spec = RENDITIONS["meta"]
+    long = _size_capped(spec, 600.0)
+    assert _bits(long["maxrate"]) < _bits(spec["maxrate"])
+    total_bits = (_bits(long["maxrate"]) + _bits(spec["audio_bitrate"])) * 600.0
+    assert total_bits / 8_000_000 <= spec["max_mb"]
+    assert _size_capped(spec, 30.0)["maxrate"] == str(_bits(spec["maxrate"]))
+    assert _size_capped(spec, None) is spec
+
+
+def test_best_effort_encodes_renditions_in_one_pass():
+    calls = []
+    main.encode_best_effort(calls.append, "out.mp4", {"meta": "out_meta.mp4"}, None, 24, ())
+    assert calls == [{"meta": "out_meta.mp4"}]
+
+
+def test_best_effort_falls_back_to_master_then_second_pass(tmp_path, monkeypatch):
+    meta, webp = str(tmp_path / "out_meta.mp4"), str(tmp_path / "out_preview.webp")
+    renditions = {"meta": meta, "webp": webp}
+    calls, second = [], []
+
+    def encode(extra):
+        calls.append(extra)
+        if extra:
+            open(meta, "wb").close()       # a partial file left by the failed run
+            raise EncodeError("libwebp missing")
+
+    def encode_renditions(master, wanted, fps, pcm, key_times):
+        second.append(dict(wanted))
+        if "webp" in wanted:
+            raise EncodeError("libwebp missing")
+        open(wanted["meta"], "wb").close()
+
+    monkeypatch.setattr(main, "encode_renditions", encode_renditions)
+    main.encode_best_effort(encode, "out.mp4", renditions, b"", 24, ())
+    assert calls == [renditions, None]
+    assert second == [{"meta": meta}, {"webp": webp}]
+    assert os.path.exists(meta) and not os.path.exists(webp)
@@ -0,0 +1,102 @@
+import pytest
+
+from stage_graph import DEGRADED, FAILED, OK, RESUMED, SKIPPED, StageError, StageGraph
+from workspace import RunWorkspace
+
+
+def _graph(calls: list, workspace=None, fail=()) -> StageGraph:
+    """script -> voice -> render, with stock feeding render only; every stage logs its call."""
+    def stage(name, value):
+        def fn(results):
+            calls.append(name)
+            if name in fail:
+                raise RuntimeError(f"{name} broke")
+            return value
+        return fn
+
+    g = StageGraph(max_workers=2, workspace=workspace)
+    g.add("script", stage("script", {"lines": 3}), checkpoint=True)
+    g.add("voice",  stage("voice", "voice.wav"), deps=("script",), checkpoint=True)
+    g.add("stock",  stage("stock", "stock.mp4"), required=False, fallback=None)
+    g.add("render", stage("render", "final.mp4"), deps=("voice", "stock"), checkpoint=True)
+    return g
+
+
+def test_runs_every_stage_in_dependency_order():
+    calls = []
+    results = _graph(calls).run()
+    assert results["render"] == "final.mp4"
+    assert calls.index("script") < calls.index("voice") < calls.index("render")
+
+
+def test_optional_failure_degrades_to_fallback():
+    calls = []
+    g = _graph(calls, fail=("stock",))
+    results = g.run()
+    assert g.status["stock"] == DEGRADED and results["stock"] is None
+    assert g.status["render"] == OK
+
+
+def test_required_failure_skips_downstream():
+    calls = []
+    g = _graph(calls, fail=("voice",))
+    with pytest.raises(StageError, match="voice"):
+        g.run()
+    assert g.status["voice"] == FAILED
+    assert g.status["render"] == SKIPPED
+    assert "render" not in calls
+
+
+def test_resume_restores_checkpoints_and_skips_unneeded_inputs(tmp_path):
+    _graph([], RunWorkspace("run1", root=str(tmp_path))).run()
+
+    calls = []
+    g = _graph(calls, RunWorkspace("run1", root=str(tmp_path)))
+    results = g.run()
+    assert calls == []
+    assert results["render"] == "final.mp4"
+    # stock is not checkpointed, but everything that needs it was restored.
+    assert all(status == RESUMED for status in g.status.values())
+
+
+def test_resume_reruns_from_first_missing_checkpoint(tmp_path):
+    ws = RunWorkspace("run1", root=str(tmp_path))
+    ws.mark_done("script", {"lines": 3})
+
+    calls = []
+    g = _graph(calls, RunWorkspace("run1", root=str(tmp_path)))
+    results = g.run()
+    assert g.status["script"] == RESUMED and results["script"] == {"lines": 3}
+    assert sorted(calls) == ["render", "stock", "voice"]
+
+
+def test_checkpoint_downstream_of_a_rerun_stage_is_not_trusted(tmp_path):
+    ws = RunWorkspace("run1", root=str(tmp_path))
+    ws.mark_done("voice", "stale.wav")
+
+    calls = []
+    results = _graph(calls, RunWorkspace("run1", root=str(tmp_path))).run()
+    assert "voice" in calls and results["voice"] == "voice.wav"
+
+
+def test_checkpoint_with_missing_file_is_rerun(tmp_path):
+    ws = RunWorkspace("run1", root=str(tmp_path))
+    ws.mark_done("script", {"lines": 3})
+    ws.mark_done("voice", ws.path("voice.wav"))      # recorded, but never written
+
+    calls = []
+    _graph(calls, RunWorkspace("run1", root=str(tmp_path))).run()
+    assert "voice" in calls and "script" not in calls
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    g = StageGraph()
+    g.add("a", lambda r: 1, deps=("missing",))
+    with pytest.raises(ValueError, match="unknown"):
+        g.run()
+
+    g = StageGraph()
+    g.add("a", lambda r: 1, deps=("b",))
+    g.add("b", lambda r: 2, deps=("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        g.run()
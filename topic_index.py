@@ -0,0 +1,164 @@
+"""
+topic_index.py — Near-Duplicate Case Detection
+===============================================
+Local index over every case the channel has already covered (the full
+topics.txt history plus channel_memory.json). Names are normalized, known
+aliases are folded together, and candidates are retrieved with character
+n-gram MinHash + LSH banding before an exact Jaccard / token-containment
+check. A proposal that matches is rejected before any research, script,
+TTS or render work is spent on it.
+"""
+
+import os
+import re
+import json
+import hashlib
+
+NGRAM          = 3
+NUM_HASHES     = 64
+BANDS          = 16                  # 16 bands × 4 rows
+ROWS           = NUM_HASHES // BANDS
+JACCARD_MATCH  = 0.5                 # char n-gram similarity that counts as the same case
+CONTAINMENT    = 0.8                 # share of the shorter name's tokens found in the longer one
+PLACEHOLDER_PREFIX = "obscure unsolved"   # the writer's no-proposal fallback, not a real case
+
+GENERIC_WORDS = {
+    "the", "a", "an", "of", "in", "on", "at", "and", "to", "for", "with", "who", "what", "was",
+    "case", "mystery", "mysterious", "story", "unsolved", "strange", "bizarre", "creepy",
+    "shorts", "incident", "affair", "file", "files", "his", "her", "their", "behind",
+    "disappearance", "vanishing", "death", "murder", "murders",
+}
+
+# Alternate names the same case is widely known by. Keys and values are normalized forms.
+ALIASES = {
+    "tamam shud":        "somerton man",
+    "taman shud":        "somerton man",
+    "somerton beach":    "somerton man",
+    "isdal woman":       "isdal woman",
+    "ice lady":          "isdal woman",
+    "max headroom":      "max headroom signal hijacking",
+    "buzzer":            "uvb 76",
+    "uvb76":             "uvb 76",
+    "d b cooper":        "dan cooper",
+    "db cooper":         "dan cooper",
+    "boy in box":        "americas unknown child",
+    "taured":            "man from taured",
+}
+
+
+def normalize(name: str) -> str:
+    t = (name or "").lower()
+    t = re.sub(r"#\w+", " ", t)
+    t = re.sub(r"[\"'’`]", "", t)
+    t = re.sub(r"[^a-z0-9]+", " ", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def core_tokens(name: str) -> list[str]:
+    return [w for w in normalize(name).split() if w not in GENERIC_WORDS]
+
+
+def canonical(name: str) -> str:
+    core = " ".join(core_tokens(name))
+    for alias, target in ALIASES.items():
+        if re.search(rf"\b{re.escape(alias)}\b", core):
+            return target
+    return core
+
+
+def _shingles(text: str) -> set[str]:
+    padded = f" {text} "
+    if len(padded) <= NGRAM:
+        return {padded}
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+def _minhash(shingles: set[str]) -> list[int]:
+    sig = []
+    for seed in range(NUM_HASHES):
+        salt = seed.to_bytes(2, "little")
+        sig.append(min(
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8, salt=salt).digest(), "little")
+            for s in shingles
+        ))
+    return sig
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / max(1, len(a | b))
+
+
+class TopicIndex:
+    def __init__(self):
+        self.entries = []          # (original name, canonical, shingles, token set)
+        self.buckets = {}          # (band, band hash) → entry ids
+        self._seen   = set()
+
+    def add(self, name: str) -> None:
+        name = (name or "").strip()
+        if normalize(name).startswith(PLACEHOLDER_PREFIX):
+            return
+        canon = canonical(name)
+        if not canon or canon in self._seen:
+            return
+        self._seen.add(canon)
+        sh  = _shingles(canon)
+        idx = len(self.entries)
+        self.entries.append((name, canon, sh, set(canon.split())))
+        sig = _minhash(sh)
+        for b in range(BANDS):
+            key = (b, tuple(sig[b * ROWS:(b + 1) * ROWS]))
+            self.buckets.setdefault(key, []).append(idx)
+
+    def find_near_duplicate(self, name: str) -> tuple[str, float] | None:
+        """Returns (already-covered topic, similarity) for a near-match, else None."""
+        canon = canonical(name)
+        if not canon:
+            return None
+        sh     = _shingles(canon)
+        tokens = set(canon.split())
+        sig    = _minhash(sh)
+
+        candidates = set()
+        for b in range(BANDS):
+            candidates.update(self.buckets.get((b, tuple(sig[b * ROWS:(b + 1) * ROWS])), []))
+        # Token containment ("Tamam Shud" inside "The Tamam Shud Code") needs no LSH hit.
+        candidates.update(
+            i for i, e in enumerate(self.entries) if tokens & e[3]
+        )
+
+        best = None
+        for i in candidates:
+            orig, ecanon, esh, etok = self.entries[i]
+            if ecanon == canon:
+                return orig, 1.0
+            sim = _jaccard(sh, esh)
+            small, large = (tokens, etok) if len(tokens) <= len(etok) else (etok, tokens)
+            if len(small) >= 2 and len(small & large) / len(small) >= CONTAINMENT:
+                sim = max(sim, CONTAINMENT)
+            if sim >= JACCARD_MATCH and (best is None or sim > best[1]):
+                best = (orig, round(sim, 3))
+        return best
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def build_topic_index(topics_file: str, memory_file: str, extra: list[str] | None = None) -> TopicIndex:
+    index = TopicIndex()
+    if os.path.exists(topics_file):
+        with open(topics_file, "r", encoding="utf-8") as f:
+            for line in f:
+                index.add(line)
+    if os.path.exists(memory_file):
+        try:
+            with open(memory_file, "r", encoding="utf-8") as f:
+                memory = json.load(f)
+            for entry in memory if isinstance(memory, list) else []:
+                index.add(entry.get("case_name", ""))
+                index.add(entry.get("title", ""))
+        except Exception:
+            pass
+    for name in extra or []:
+        index.add(name)
+    return index
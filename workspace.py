@@ -0,0 +1,139 @@
+"""
+workspace.py — Per-Run Workspace & Checkpoints
+===============================================
+Every run writes its intermediates (script JSON, per-line audio, visual
+directives, shot images, depth maps, word alignment, the rendered file)
+into its own directory under runs/<run_id>/ instead of temp_* files in
+the repo root. A manifest.json beside them records each completed stage
+and its outputs, so a run that dies late (render, subtitles, upload) can
+be resumed from the first incomplete stage rather than started over.
+
+Batch mode marks finished workspaces as queued; scheduled runs publish the
+oldest queued video instead of producing a new one.
+"""
+
+import os
+import json
+import time
+import shutil
+import threading
+
+WORKSPACE_ROOT    = os.environ.get("RUN_WORKSPACE_ROOT", "runs")
+WORKSPACE_MAX_AGE = 3 * 24 * 3600     # abandoned workspaces are pruned after this
+MANIFEST_NAME     = "manifest.json"
+
+
+class RunWorkspace:
+    def __init__(self, run_id: str, root: str = WORKSPACE_ROOT):
+        self.run_id = run_id
+        self.dir    = os.path.join(root, run_id)
+        self._lock  = threading.Lock()
+        self._path  = os.path.join(self.dir, MANIFEST_NAME)
+        os.makedirs(self.dir, exist_ok=True)
+        self.manifest = {"run_id": run_id, "created": time.time(), "meta": {}, "stages": {}}
+        if os.path.exists(self._path):
+            with open(self._path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    @classmethod
+    def open_existing(cls, run_id: str, root: str = WORKSPACE_ROOT) -> "RunWorkspace":
+        if run_id == "latest":
+            run_id = latest_run_id(root)
+            if not run_id:
+                raise FileNotFoundError(f"no run workspaces under {root}/")
+        if not os.path.exists(os.path.join(root, run_id, MANIFEST_NAME)):
+            raise FileNotFoundError(f"no manifest for run {run_id}")
+        return cls(run_id, root)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    # ----------------------------------------------------------
+    # MANIFEST
+    # ----------------------------------------------------------
+    def _save_locked(self) -> None:
+        tmp = self._path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self._path)
+
+    def set_meta(self, key: str, value) -> None:
+        with self._lock:
+            self.manifest["meta"][key] = value
+            self._save_locked()
+
+    def get_meta(self, key: str, default=None):
+        with self._lock:
+            return self.manifest["meta"].get(key, default)
+
+    def _files_in(self, value) -> list[str]:
+        # Paths inside this workspace that a checkpoint depends on.
+        if isinstance(value, str):
+            return [value] if value.startswith(self.dir + os.sep) else []
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, (list, tuple)):
+            return [p for v in value for p in self._files_in(v)]
+        return []
+
+    def mark_done(self, stage: str, outputs) -> None:
+        with self._lock:
+            self.manifest["stages"][stage] = {
+                "finished_at": time.time(),
+                "outputs":     outputs,
+                "files":       self._files_in(outputs),
+            }
+            self._save_locked()
+
+    def load(self, stage: str):
+        """(True, outputs) for a completed stage whose files are all still on disk, else (False, None)."""
+        with self._lock:
+            entry = self.manifest["stages"].get(stage)
+        if not entry or not all(os.path.exists(p) for p in entry.get("files", [])):
+            return False, None
+        return True, entry["outputs"]
+
+    def is_done(self, stage: str) -> bool:
+        return self.load(stage)[0]
+
+    def first_incomplete(self, stages: list[str]) -> str | None:
+        return next((s for s in stages if not self.is_done(s)), None)
+
+    def remove(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def latest_run_id(root: str = WORKSPACE_ROOT) -> str | None:
+    if not os.path.isdir(root):
+        return None
+    runs = [d for d in os.listdir(root) if os.path.exists(os.path.join(root, d, MANIFEST_NAME))]
+    return max(runs, key=lambda d: os.path.getmtime(os.path.join(root, d, MANIFEST_NAME)), default=None)
+
+
+def list_queued_workspaces(root: str = WORKSPACE_ROOT) -> list[RunWorkspace]:
+    """Produced-but-unpublished runs, oldest first."""
+    if not os.path.isdir(root):
+        return []
+    queued = []
+    for d in sorted(os.listdir(root)):
+        if not os.path.exists(os.path.join(root, d, MANIFEST_NAME)):
+            continue
+        try:
+            ws = RunWorkspace(d, root)
+        except Exception:
+            continue
+        if ws.get_meta("queued"):
+            queued.append(ws)
+    return sorted(queued, key=lambda w: w.get_meta("queued_at", 0))
+
+
+def prune_workspaces(root: str = WORKSPACE_ROOT, max_age: float = WORKSPACE_MAX_AGE, keep: str | None = None) -> None:
+    """Removes abandoned workspaces; queued ones wait for publishing however old they are."""
+    if not os.path.isdir(root):
+        return
+    queued = {w.run_id for w in list_queued_workspaces(root)}
+    cutoff = time.time() - max_age
+    for d in os.listdir(root):
+        full = os.path.join(root, d)
+        if d != keep and d not in queued and os.path.isdir(full) and os.path.getmtime(full) < cutoff:
+            shutil.rmtree(full, ignore_errors=True)